@@ -1,22 +1,379 @@
 #Copyright 2025 yo525
 #SPDX-License-Identifier: Apache-2.0
 
+#Import necessary modules
+from array import array
+from bisect import bisect_left
+from collections import Counter, OrderedDict, deque
+from itertools import accumulate
+from operator import itemgetter
+from hashlib import blake2b
+from hmac import compare_digest as hmac_compare
+from os import urandom, environ
+from threading import Lock, local
+from time import perf_counter, time
+import json
+import marshal
+
+try:
+    import numpy as np  # Optional, enables the vectorized key schedule backend
+except ImportError:
+    np = None
+
+# Public API, what `from SME import *` exports
+__all__ = [
+    'CHUNK_SIZE', 'is_dependent', 'pack_messages', 'unpack_messages',
+    'KeyScheduleCache', 'PrefixScheduleCache', 'key_cache', 'prefix_cache',
+    'SME256', 'SME256BF', 'SME256dBF', 'CompactKey', 'SME256BFKey', 'SME256dBFKey',
+    'DependentByteFlow', 'DependentByteFlowContext',
+    'ScheduleTables', 'NumpyScheduleTables', 'schedule_tables', 'numpy_schedule_tables', 'derive_matrices',
+    'KeyScheduleBackend', 'DifferentialBackend', 'register_backend', 'available_backends', 'get_backend',
+    'select_backend', 'set_backend',
+    'ScheduleHook', 'ScheduleProfiler', 'ScheduleTrace',
+    'MetricsRegistry', 'enable_metrics', 'disable_metrics',
+]
+
+# Size of the slices used by the buffer APIs, bounds the temporary memory of each call
+CHUNK_SIZE = 1 << 16
+
+
+def _buffer_views(src, dst) -> tuple:
+    """
+    Wraps a source and a destination buffer into flat byte memoryviews.
+
+    Args:
+        src: Any object supporting the buffer protocol (bytes, bytearray, memoryview, mmap...).
+        dst: A writable buffer at least as long as src.
+
+    Returns:
+        tuple: The (source, destination) memoryviews, destination trimmed to the source length.
+
+    Raises:
+        TypeError: If the destination buffer is read-only.
+        ValueError: If the destination buffer is smaller than the source.
+    """
+    source = memoryview(src).cast('B')
+    destination = memoryview(dst).cast('B')
+
+    if destination.readonly:
+        print("Error19: Destination buffer is read-only.")
+        raise TypeError("destination buffer is read-only")
+    if len(destination) < len(source):
+        print("Error20: Destination buffer is smaller than the source buffer.")
+        raise ValueError("destination buffer is smaller than the source buffer")
+
+    return source, destination[:len(source)]
+
+
+def is_dependent(sme) -> bool:
+    """
+    Tells whether a key chains its bytes like SME256dBF, full or compact (SME256dBFKey).
+
+    Such a stream has to go through one incremental context from start to end,
+    while SME256BF keys can process every piece on its own.
+
+    Args:
+        sme: A SME256BF, SME256dBF, SME256BFKey or SME256dBFKey.
+
+    Returns:
+        bool: True for dBF keys.
+    """
+    return hasattr(sme, 'encryptor')
+
+
+def pack_messages(messages) -> tuple:
+    """
+    Concatenates a sequence of messages into a single buffer plus an offsets array.
+
+    Args:
+        messages: A sequence of bytes-like objects or str.
+
+    Returns:
+        tuple: (buffer, offsets), message k is buffer[offsets[k]:offsets[k + 1]],
+            offsets has one entry more than messages.
+    """
+    encoded = [message.encode() if isinstance(message, str) else message for message in messages]
+    offsets = array('Q', [0])
+    offsets.extend(accumulate(len(message) for message in encoded))
+    return b''.join(encoded), offsets
+
+
+def unpack_messages(buffer, offsets) -> list:
+    """
+    Splits a packed buffer back into its messages.
+
+    Args:
+        buffer: The packed buffer.
+        offsets: The boundaries returned by pack_messages.
+
+    Returns:
+        list: One bytes object per message.
+    """
+    if not isinstance(buffer, bytes):
+        buffer = bytes(buffer)
+    return [buffer[offsets[k]:offsets[k + 1]] for k in range(0, len(offsets) - 1)]
+
+
+class KeyScheduleCache:
+    """
+    Process-wide, size-bounded LRU cache of derived SME256 matrices.
+
+    Entries are keyed by a BLAKE2b digest of the password, keyed with a random
+    per-process salt, so neither the raw password nor a reusable hash of it is kept.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            maxsize (int): Maximum number of matrices kept, 0 disables the cache (default 128).
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self._salt = urandom(16)
+
+    def digest(self, password: bytes) -> bytes | None:
+        """
+        Computes the cache key of a password.
+
+        Args:
+            password (bytes): The password.
+
+        Returns:
+            bytes | None: The digest, or None if the password is not bytes-like and can not be cached.
+        """
+        if not isinstance(password, (bytes, bytearray, memoryview)):
+            return None
+        return blake2b(password, digest_size=32, key=self._salt).digest()
+
+    def get(self, password: bytes) -> bytes | None:
+        """
+        Looks up the derived matrix of a password.
+
+        Args:
+            password (bytes): The password.
+
+        Returns:
+            bytes | None: The 256-byte derived matrix, or None on a miss.
+        """
+        key = self.digest(password)
+        if key is None or self.maxsize <= 0:
+            return None
+
+        with self._lock:
+            matrix = self._entries.get(key)
+            if matrix is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)  # Mark as most recently used
+            return matrix
+
+    def put(self, password: bytes, matrix: list) -> None:
+        """
+        Stores the derived matrix of a password, evicting the least recently used entries if full.
+
+        Args:
+            password (bytes): The password.
+            matrix (list): The derived matrix.
+        """
+        key = self.digest(password)
+        if key is None or self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = bytes(matrix)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, password: bytes) -> bool:
+        """
+        Removes the entry of a password.
+
+        Args:
+            password (bytes): The password.
+
+        Returns:
+            bool: True if an entry was removed.
+        """
+        key = self.digest(password)
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """ Removes every entry and resets the statistics. """
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def resize(self, maxsize: int) -> None:
+        """
+        Changes the maximum number of entries, evicting the oldest ones if needed.
+
+        Args:
+            maxsize (int): The new maximum size, 0 disables the cache.
+        """
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._entries) > max(maxsize, 0):
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        """ Returns the hit, miss and eviction counters together with the current size. """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'size': len(self._entries), 'maxsize': self.maxsize}
+
+
+# Shared by every SME256 instance of the process
+key_cache = KeyScheduleCache()
+
+
+class PrefixScheduleCache(KeyScheduleCache):
+    """
+    Size-bounded LRU cache of intermediate key schedule matrices, indexed by password prefix.
+
+    The key schedule consumes the password one byte at a time, so passwords sharing
+    a prefix go through the same matrices up to the end of it. The cache keeps the
+    matrix reached after every `interval` bytes (and at the end of each password),
+    keyed by the salted digest of the prefix, which makes it a prefix tree with only
+    the checkpoint nodes stored. derive() resumes from the deepest cached checkpoint,
+    so a family such as base || tenant_id only runs the key schedule over the suffixes.
+    """
+
+    def __init__(self, maxsize: int = 1024, interval: int = 8) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            maxsize (int): Maximum number of checkpoints kept, 0 disables the cache (default 1024).
+            interval (int): Distance in bytes between two stored checkpoints (default 8).
+        """
+        super().__init__(maxsize)
+        self.interval = max(1, interval)
+        self.resumed_bytes = 0  # Key schedule steps skipped thanks to the cache
+
+    def prefix_digests(self, password: bytes) -> list:
+        """
+        Computes the cache key of every prefix of a password in a single pass.
+
+        Args:
+            password (bytes): The password.
+
+        Returns:
+            list: digests[k] is the key of password[:k + 1].
+        """
+        state = blake2b(digest_size=32, key=self._salt)
+        digests = []
+        for k in range(0, len(password)):
+            state.update(password[k:k + 1])
+            digests.append(state.copy().digest())
+        return digests
+
+    def derive(self, password: bytes) -> bytes:
+        """
+        Derives the matrix of a password, resuming from the deepest cached prefix.
+
+        Args:
+            password (bytes): The password.
+
+        Returns:
+            bytes: The 256-byte derived matrix, identical to SME256(password).matrix.
+        """
+        password = bytes(password)
+        digests = self.prefix_digests(password)
+        start, matrix = 0, None
+        with self._lock:
+            for k in range(len(password), 0, -1):  # Deepest prefix first
+                matrix = self._entries.get(digests[k - 1])
+                if matrix is not None:
+                    start = k
+                    self._entries.move_to_end(digests[k - 1])
+                    break
+            if start:
+                self.hits += 1
+                self.resumed_bytes += start
+            else:
+                self.misses += 1
+
+        sme = SME256.__new__(SME256)
+        sme.matrix = list(matrix) if matrix is not None else [i for i in range(0, 256)]
+        position = start
+        while position < len(password):
+            end = min((position // self.interval + 1) * self.interval, len(password))
+            sme.calculate_table_from_values(password[position:end])
+            self.store(digests[end - 1], sme.matrix)
+            position = end
+        return bytes(sme.matrix)
+
+    def store(self, key: bytes, matrix: list) -> None:
+        """
+        Stores one checkpoint, evicting the least recently used ones if full.
+
+        Args:
+            key (bytes): The digest of the prefix.
+            matrix (list): The matrix reached at the end of the prefix.
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = bytes(matrix)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """ Removes every checkpoint and resets the statistics. """
+        super().clear()
+        self.resumed_bytes = 0
+
+    def stats(self) -> dict:
+        """ Returns the counters of KeyScheduleCache.stats plus the number of resumed bytes. """
+        stats = super().stats()
+        stats['resumed_bytes'] = self.resumed_bytes
+        return stats
+
+
+# Used by SME256.from_prefix_cache
+prefix_cache = PrefixScheduleCache()
+
+
 class SME256:
     """
     The main class for 256 Scrambled-Matrix-Encryption (SME256), which implements
     a scrambling encryption technique using a matrix of values.
+
+    Every instance owns its matrix. Once the key schedule finishes, the derived key
+    lives in the immutable `table` and `inverse` bytes, which are the only state read
+    by encryption and decryption, so one instance can be shared by many threads.
+    `matrix` is a working copy: the move-by-move primitives modify it in place and
+    are not meant to be called concurrently.
     """
 
-    # Initialize a matrix with values from 0 to 255
-    matrix = [i for i in range(0, 256)]
+    # Key schedule implementation: 'numpy' (vectorized, needs NumPy) or 'python'
+    backend = 'numpy' if np is not None else 'python'
+    # Optional ScheduleHook (ScheduleProfiler, ScheduleTrace) seeing every key schedule step, None keeps the fast path
+    profiler = None
+    # Optional MetricsRegistry counting bytes, calls, errors and key derivation latency, None records nothing
+    metrics = None
 
-    def __init__(self, password: bytes, warnings: bool = True) -> None:
+    def __init__(self, password: bytes, warnings: bool = True, cache: bool = True) -> None:
         """
         Initialize the SME256 object with a password.
         
         Args:
             password (bytes): The password for the encryption process.
             warnings (bool): Whether to display warnings for short passwords (default True).
+            cache (bool): Whether to reuse/store the derived matrix in key_cache (default True).
         
         Raises:
             Print a warning if the password is less than 16 bytes.
@@ -27,8 +384,168 @@ class SME256:
             print('* WARNING: Password too short, recommend the use of a longer password *')
             print('!' * 80 + '\n')
 
+        metrics = self.metrics
+        start_time = perf_counter() if metrics is not None else 0.0
         self.password = password
-        self.calculate_table_from_values()  # Initialize matrix transformation using the password
+        cached = key_cache.get(password) if cache else None
+
+        if cached is None:
+            self.matrix = [i for i in range(0, 256)]  # Every key schedule starts from the identity matrix
+            self.calculate_table_from_values()  # Initialize matrix transformation using the password, builds the lookup tables
+            if cache:
+                key_cache.put(password, self.matrix)
+        else:
+            self.matrix = list(cached)  # Skip the key schedule entirely
+            self.build_tables()  # Freeze the cached matrix into byte lookup tables
+        if metrics is not None:
+            metrics.observe('key_derivation', perf_counter() - start_time)
+            metrics.record('derive', 'cached' if cached is not None else 'schedule', len(password))
+
+    @classmethod
+    def from_table(cls, table: bytes, inverse: bytes = None, verify: bool = True):
+        """
+        Creates a key from an already derived table, without running the key schedule.
+
+        Args:
+            table (bytes): The 256-byte forward table (the derived matrix).
+            inverse (bytes): The matching 256-byte inverse table, rebuilt when omitted (default None).
+            verify (bool): Check that the tables are a permutation and its inverse (default True).
+
+        Returns:
+            The new instance of the class, with no password attached.
+
+        Raises:
+            ValueError: If verify is set and the tables are not a valid pair.
+        """
+        sme = cls.__new__(cls)
+        sme.password = None
+        sme.matrix = list(table)
+        if inverse is None:
+            sme.build_tables()  # Validates the permutation too
+            return sme
+
+        sme.table = bytes(table)
+        sme.inverse = bytes(inverse)
+        if verify and (len(sme.table) != 256 or len(sme.inverse) != 256 or sme.table.translate(sme.inverse) != bytes(range(0, 256))):
+            print("Error18: Matrix is not a permutation of 0-255, lookup tables cannot be built.")
+            raise ValueError("table and inverse are not a permutation of 0-255 and its inverse")
+        return sme
+
+    @classmethod
+    def from_prefix_cache(cls, password: bytes, cache: PrefixScheduleCache = None):
+        """
+        Creates a key, resuming its key schedule from the deepest cached password prefix.
+
+        Args:
+            password (bytes): The password.
+            cache (PrefixScheduleCache): The checkpoints to use (default the process-wide prefix_cache).
+
+        Returns:
+            A new instance of the class, identical to cls(password).
+        """
+        sme = cls.from_table((cache or prefix_cache).derive(password))
+        sme.password = password
+        return sme
+
+    def snapshot(self) -> bytes:
+        """
+        Captures the current matrix.
+
+        Returns:
+            bytes: An immutable copy of the matrix, cheap to keep and safe to share.
+        """
+        return bytes(self.matrix)
+
+    def restore(self, snapshot: bytes) -> None:
+        """
+        Puts the instance back in the state of a snapshot, rebuilding its lookup tables.
+
+        Args:
+            snapshot (bytes): A value returned by snapshot().
+        """
+        self.matrix = list(snapshot)
+        self.build_tables()
+
+    def fork(self):
+        """
+        Creates an independent copy of the key.
+
+        The immutable lookup tables are shared, only the 256-entry working matrix is copied.
+
+        Returns:
+            A new instance of the same class in the same state.
+        """
+        clone = self.__class__.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        clone.matrix = list(self.matrix)
+        return clone
+
+    def extend(self, values: bytes) -> None:
+        """
+        Continues the key schedule over more values from the current state.
+
+        key.extend(suffix) on the key of a password gives the key of password + suffix,
+        SME256(base).fork() followed by extend(tenant_id) skips the steps of base.
+
+        Args:
+            values (bytes): The values appended to the password.
+        """
+        self.calculate_table_from_values(values)  # Rebuilds the lookup tables
+        if self.password is not None:
+            self.password = bytes(self.password) + bytes(values)
+
+    @classmethod
+    def from_passwords(cls, passwords, cache: bool = True) -> list:
+        """
+        Creates the keys of many passwords, running their key schedules as one batch.
+
+        Args:
+            passwords: A sequence of bytes passwords.
+            cache (bool): Whether to reuse/store the derived matrices in key_cache (default True).
+
+        Returns:
+            list: One instance of the class per password, identical to cls(password).
+        """
+        metrics = cls.metrics
+        start_time = perf_counter() if metrics is not None else 0.0
+        passwords = list(passwords)
+        matrices = [key_cache.get(password) if cache else None for password in passwords]
+        missing = [k for k, matrix in enumerate(matrices) if matrix is None]
+        for k, matrix in zip(missing, derive_matrices([passwords[k] for k in missing])):
+            matrices[k] = matrix
+            if cache:
+                key_cache.put(passwords[k], matrix)
+
+        keys = []
+        for password, matrix in zip(passwords, matrices):
+            sme = cls.from_table(matrix)
+            sme.password = password
+            keys.append(sme)
+        if metrics is not None and passwords:
+            metrics.observe('key_derivation_batch', perf_counter() - start_time)
+            metrics.record('derive', 'batch', sum(len(password) for password in passwords), len(passwords))
+        return keys
+
+    def build_tables(self) -> None:
+        """
+        Builds the forward and inverse byte lookup tables from the current matrix.
+
+        The forward table maps a plaintext byte to its ciphertext byte and the inverse
+        table maps it back, so both directions can run as a single bytes.translate call.
+
+        Raises:
+            ValueError: If the matrix is not a permutation of the values 0 to 255.
+        """
+        if sorted(self.matrix) != list(range(0, 256)):
+            print("Error18: Matrix is not a permutation of 0-255, lookup tables cannot be built.")
+            raise ValueError("matrix is not a permutation of 0-255")
+
+        inverse = bytearray(256)
+        for index, value in enumerate(self.matrix):
+            inverse[value] = index  # Record where each value lives in the matrix
+
+        self.table = bytes(self.matrix)
+        self.inverse = bytes(inverse)
 
     def rotate_column(self, column_index: int, pos: int) -> list:
         """
@@ -243,6 +760,53 @@ class SME256:
         """
         Calculates transformation of the matrix based on the provided values (default is the password).
 
+        The work is done by the key schedule backend selected in SME256.backend, see
+        set_backend; every registered backend gives the same result as
+        calculate_table_from_values_stepwise. The lookup tables are rebuilt from the
+        new matrix, so the instance encrypts with the new key right away.
+
+        Args:
+            values (bytes): The values to use for transformation (default is self.password).
+        """
+        if values is None:
+            values = self.password
+
+        if self.profiler is not None:
+            self.calculate_table_from_values_profiled(values, self.profiler)
+        else:
+            backend = get_backend(self.backend)
+            try:
+                self.matrix = list(backend.derive(self.matrix, values))
+            except (IndexError, TypeError, OverflowError) as e:
+                print("Error8 in calculating table from values. Please check input values.")
+                raise e
+        self.build_tables()  # Encrypt and decrypt follow the new matrix
+
+    def calculate_table_from_values_profiled(self, values: bytes, profiler: 'ScheduleHook') -> None:
+        """
+        Runs calculate_table_from_values one step at a time through a profiler.
+
+        The steps run on the tables of the selected backend, see KeyScheduleBackend.derive_profiled.
+
+        Args:
+            values (bytes): The values to use for transformation.
+            profiler (ScheduleHook): The profiler or trace running every step.
+
+        Raises:
+            ValueError: If the selected backend has no profiled path (Error34).
+        """
+        backend = get_backend(self.backend)
+        try:
+            self.matrix = list(backend.derive_profiled(self.matrix, values, profiler))
+        except (IndexError, TypeError, OverflowError) as e:
+            print("Error8 in calculating table from values. Please check input values.")
+            raise e
+
+    def calculate_table_from_values_stepwise(self, values: bytes = None) -> None:
+        """
+        Reference implementation of calculate_table_from_values, applies every row and
+        column move one by one through the primitives of the class.
+
         Args:
             values (bytes): The values to use for transformation (default is self.password).
         """
@@ -262,88 +826,1657 @@ class SME256:
             print("Error8 in calculating table from values. Please check input values.")
             raise e
 
-    
-class SME256BF(SME256):
+
+class ScheduleTables:
     """
-    A child class that extends SME256 for basic frame encryption functions.
-    256 Scrambled-Matrix-Encryption Byte-Flow (SMEBF256)
+    Precomputed permutations of the SME256 key schedule primitives.
+
+    rotate_row_column(n) and bring_front(value_index) always move the same positions
+    whatever the matrix holds, so each one is a fixed permutation of the 256 cells.
+    They are recorded once by running the move-by-move primitives over the identity
+    matrix: after an operation the cell j holds the value previously at permutation[j].
+    The scramblers depend on the parity of the first row, they are stored as the
+    16-cell gathers of column_to_row_even/uneven for every row and column.
     """
 
-    def encrypt(self, plaintext: bytes | str) -> bytes:
+    def __init__(self) -> None:
+        """ Builds every table from the reference primitives of SME256. """
+        simulator = SME256.__new__(SME256)
+        simulator.matrix = [i for i in range(0, 256)]
+
+        # rotations[n] is the permutation of rotate_row_column(n), built incrementally
+        self.rotations = [tuple(simulator.matrix)]
+        for i in range(0, 255):
+            if i % 2 == 0:
+                simulator.rotate_row(i % 16, 1)
+                simulator.rotate_column(i % 16, 1)
+            else:
+                simulator.rotate_column(i % 16, 1)
+                simulator.rotate_row(i % 16, 1)
+            self.rotations.append(tuple(simulator.matrix))
+
+        # fronts[value_index] is the permutation of bring_front(value_index), front_iterations[value_index]
+        # the number of turns of its loop (one rotate_column and one rotate_row each)
+        self.fronts = []
+        self.front_iterations = []
+        rotate_column = simulator.rotate_column
+        turns = [0]
+
+        def counted_rotate_column(column_index: int, pos: int) -> list:
+            turns[0] += 1
+            return rotate_column(column_index, pos)
+
+        simulator.rotate_column = counted_rotate_column  # Shadows the method on this instance only
+        for value_index in range(0, 256):
+            simulator.matrix = [i for i in range(0, 256)]
+            turns[0] = 0
+            simulator.bring_front(value_index)
+            self.fronts.append(tuple(simulator.matrix))
+            self.front_iterations.append(turns[0])
+        del simulator.rotate_column
+
+        # column_to_row[row][column] holds the (even, uneven) gathers of that column for that row
+        self.column_to_row = []
+        for row in range(0, 16):
+            simulator.matrix = [i for i in range(0, 256)]
+            self.column_to_row.append([
+                (tuple(simulator.column_to_row_even(column, row)), tuple(simulator.column_to_row_uneven(column, row)))
+                for column in range(0, 16)
+            ])
+
+        # Order in which each scrambler visits the columns, indexed by the starting column
+        self.even_columns = [tuple((column + i) % 16 for i in range(0, 46, 3)) for column in range(0, 16)]
+        self.uneven_columns = [
+            tuple((column + i) % 16 if i % 2 else (column - i) % 16 for i in range(0, 16))
+            for column in range(0, 16)
+        ]
+
+        self.rotation_getters = [itemgetter(*permutation) for permutation in self.rotations]
+        self.front_getters = [itemgetter(*permutation) for permutation in self.fronts]
+
+        # The same permutations as bytes: permutation.translate(matrix) gathers a bytes matrix in C
+        self.rotation_tables = [bytes(permutation) for permutation in self.rotations]
+        self.front_tables = [bytes(permutation) for permutation in self.fronts]
+        self.column_to_row_tables = [[(bytes(even), bytes(uneven)) for even, uneven in row] for row in self.column_to_row]
+
+    def rotate(self, matrix, n: int) -> tuple:
+        """ Applies rotate_row_column(n) to a matrix as a single gather. """
+        return self.rotation_getters[n](matrix)
+
+    def front(self, matrix, value_index: int) -> tuple:
+        """ Applies bring_front(value_index) to a matrix as a single gather. """
+        return self.front_getters[value_index](matrix)
+
+    def scramble_positions(self, matrix, index: int) -> list:
         """
-        Encrypts the provided plaintext using the SME256 algorithm.
+        Returns the gather applied by column_select_scrambler_even/uneven for a matrix.
 
         Args:
-            plaintext (bytes | str): The plaintext to encrypt.
+            matrix: The current matrix.
+            index (int): The index used to determine scramble order.
 
         Returns:
-            bytes: The resulting ciphertext.
+            list: The 256 source positions of the scrambled matrix.
         """
-        if not isinstance(plaintext, bytes):
-            plaintext = plaintext.encode()  # Ensure encryption function works with bytes
-        
-        # Handle potential encoding issues in the list comprehension
-        try:
-            ciphertext = bytes([self.matrix[i] for i in plaintext])  # Map plaintext indices to matrix values
-            return ciphertext
-        except IndexError as e:
-            print("Error10: Encryption failed due to invalid index in plaintext.")
-            raise e
+        blocks = self.column_to_row[(index >> 4) & 0x0F]
+        columns = self.even_columns[index & 0x0F] if index % 2 == 0 else self.uneven_columns[index & 0x0F]
+        positions = []
+        for column in columns:
+            positions.extend(blocks[column][matrix[column] & 1])  # Even or odd block depending on the leading value
+        return positions
 
-    def decrypt(self, ciphertext: bytes | str) -> bytes:
+    def scramble(self, matrix, index: int) -> tuple:
         """
-        Decrypts the provided ciphertext back into plaintext.
+        Applies column_select_scrambler_even/uneven to a matrix as a single gather.
 
         Args:
-            ciphertext (bytes | str): The ciphertext to decrypt.
+            matrix: The current matrix.
+            index (int): The index used to determine scramble order.
 
         Returns:
-            bytes: The resulting plaintext.
+            tuple: The scrambled matrix.
         """
-        if not isinstance(ciphertext, bytes):
-            ciphertext = ciphertext.encode()  # Ensure ciphertext is bytes
-        
-        try:
-            # Rebuild plaintext from indices based on the matrix
-            plaintext = bytes([self.matrix.index(i) for i in ciphertext])
-            return bytes(plaintext)
-        except ValueError as e:
-            print("Error12: Decrypting failed because index was not found in the matrix.")
-            raise e
+        return itemgetter(*self.scramble_positions(matrix, index))(matrix)
+
+    def scramble_bytes(self, matrix: bytes, index: int) -> bytes:
+        """
+        Same as scramble for a bytes matrix, the gather is a single bytes.translate.
 
+        Args:
+            matrix (bytes): The current matrix.
+            index (int): The index used to determine scramble order.
 
-class SME256dBF(SME256):
+        Returns:
+            bytes: The scrambled matrix.
+        """
+        blocks = self.column_to_row_tables[(index >> 4) & 0x0F]
+        columns = self.even_columns[index & 0x0F] if index % 2 == 0 else self.uneven_columns[index & 0x0F]
+        return b''.join([blocks[column][matrix[column] & 1] for column in columns]).translate(matrix)
+
+
+class NumpyScheduleTables:
     """
-    A child class of SME256 that implements an alternative encryption method 
-    that updates the transformation matrix dynamically during encryption and decryption.
-    256 Scrambled-Matrix-Encryption dependent-Byte-Flow (SMEdBF256)
+    NumPy version of ScheduleTables, the matrix is kept as a uint8 array and every
+    rotation, bring-front and column-to-row conversion is a fancy-indexing gather.
     """
 
-    def encrypt(self, plaintext: bytes | str) -> bytes:
+    def __init__(self, tables: ScheduleTables) -> None:
         """
-        Encrypts plaintext, updating transformation dynamically.
+        Converts the pure-Python tables into arrays.
 
         Args:
-            plaintext (bytes | str): The plaintext to encrypt.
+            tables (ScheduleTables): The tables to convert.
+        """
+        self.rotations = np.array(tables.rotations, dtype=np.uint8)  # (256, 256)
+        self.fronts = np.array(tables.fronts, dtype=np.uint8)  # (256, 256)
+        self.column_to_row = np.array(tables.column_to_row, dtype=np.uint8)  # (row, column, parity, 16)
+        self.columns = np.array([tables.even_columns, tables.uneven_columns], dtype=np.intp)  # (parity, column, 16)
+        self.front_iterations = tables.front_iterations
 
-        Returns:
+    def rotate(self, matrix: 'np.ndarray', n: int) -> 'np.ndarray':
+        """ Applies rotate_row_column(n) to a matrix. """
+        return matrix[self.rotations[n]]
+
+    def front(self, matrix: 'np.ndarray', value_index: int) -> 'np.ndarray':
+        """ Applies bring_front(value_index) to a matrix. """
+        return matrix[self.fronts[value_index]]
+
+    def scramble(self, matrix: 'np.ndarray', index: int) -> 'np.ndarray':
+        """
+        Applies column_select_scrambler_even/uneven to a matrix.
+
+        Args:
+            matrix (np.ndarray): The current uint8 matrix.
+            index (int): The index used to determine scramble order.
+
+        Returns:
+            np.ndarray: The scrambled matrix.
+        """
+        columns = self.columns[index & 1, index & 0x0F]
+        return matrix[self.column_to_row[(index >> 4) & 0x0F, columns, matrix[columns] & 1].ravel()]
+
+    def derive(self, matrix: 'np.ndarray', values: bytes) -> 'np.ndarray':
+        """
+        Runs the key schedule over a uint8 matrix.
+
+        Args:
+            matrix (np.ndarray): The starting uint8 matrix.
+            values (bytes): The values to use for transformation.
+
+        Returns:
+            np.ndarray: The transformed matrix.
+        """
+        for i in values:
+            matrix = matrix[self.rotations[int(matrix[matrix[0]]) ^ i]]  # Rotate based on XOR with current leading value
+            matrix = matrix[self.fronts[int(matrix[0]) ^ i]]  # Bring current leading value to the front
+            matrix = self.scramble(matrix, int(matrix[0]) ^ i)  # Even/odd column scrambling
+        return matrix
+
+    def derive_batch(self, matrices: 'np.ndarray', values: list) -> 'np.ndarray':
+        """
+        Runs the key schedule of many passwords at once over an (N, 256) uint8 array.
+
+        Each step gathers every row through its own permutation, as a single fancy
+        index into the flattened array (row offset + permutation). Rows are processed longest password first, so the rows still running at a
+        given step are always a prefix of the array and shorter passwords simply
+        drop out. Every row ends exactly as derive() would leave it.
+
+        Args:
+            matrices (np.ndarray): The (N, 256) uint8 starting matrices.
+            values (list): The N passwords (bytes-like), of any lengths.
+
+        Returns:
+            np.ndarray: The (N, 256) uint8 transformed matrices, in the order of values.
+        """
+        count = len(values)
+        lengths = np.fromiter((len(value) for value in values), dtype=np.intp, count=count)
+        order = np.argsort(-lengths, kind='stable')  # Longest first
+        lengths = lengths[order]
+        longest = int(lengths[0]) if count else 0
+
+        passwords = np.zeros((count, longest), dtype=np.uint8)
+        for row, k in enumerate(order):
+            passwords[row, :lengths[row]] = np.frombuffer(bytes(values[k]), dtype=np.uint8)
+
+        state = np.array(matrices, dtype=np.uint8)[order]
+        rows = np.arange(count)
+        offsets = rows[:, None] * 256  # Start of every row in the flattened array
+        active = count
+        for step in range(0, longest):
+            while lengths[active - 1] <= step:  # Passwords shorter than this step are done
+                active -= 1
+            matrix, i, base = state[:active], passwords[:active, step], offsets[:active]
+
+            matrix = matrix.ravel()[self.rotations[matrix[rows[:active], matrix[:, 0]] ^ i] + base]
+            matrix = matrix.ravel()[self.fronts[matrix[:, 0] ^ i] + base]
+            index = matrix[:, 0] ^ i
+            columns = self.columns[index & 1, index & 0x0F]  # (active, 16) columns in visiting order
+            blocks = self.column_to_row[((index >> 4) & 0x0F)[:, None], columns, matrix.ravel()[columns + base] & 1]
+            state[:active] = matrix.ravel()[blocks.reshape(active, 256) + base]
+
+        result = np.empty_like(state)
+        result[order] = state  # Back to the order of values
+        return result
+
+
+def derive_matrices(passwords, backend: str = None) -> list:
+    """
+    Derives the matrices of many passwords, all of them together with the numpy backend.
+
+    Args:
+        passwords: A sequence of bytes passwords, of any lengths.
+        backend (str): A registered backend, 'numpy' runs them as one batch (default SME256.backend).
+
+    Returns:
+        list: The 256-byte derived matrix of every password, in the same order.
+
+    Raises:
+        TypeError: If a password is not bytes-like.
+    """
+    passwords = list(passwords)
+    if not passwords:
+        return []
+
+    backend = get_backend(backend)
+    try:
+        return backend.derive_batch(passwords)
+    except (IndexError, TypeError, ValueError) as e:
+        print("Error8 in calculating table from values. Please check input values.")
+        raise e
+
+
+_schedule_tables = None
+_numpy_schedule_tables = None
+_IDENTITY_ARRAY = np.arange(256, dtype=np.uint8) if np is not None else None
+_schedule_tables_lock = Lock()
+
+
+def schedule_tables() -> ScheduleTables:
+    """
+    Returns the process-wide ScheduleTables, building them on first use.
+
+    Returns:
+        ScheduleTables: The precomputed permutations of the key schedule.
+    """
+    global _schedule_tables
+    if _schedule_tables is None:
+        with _schedule_tables_lock:
+            if _schedule_tables is None:
+                _schedule_tables = ScheduleTables()
+    return _schedule_tables
+
+
+def numpy_schedule_tables() -> NumpyScheduleTables:
+    """
+    Returns the process-wide NumpyScheduleTables, building them on first use.
+
+    Returns:
+        NumpyScheduleTables: The precomputed permutations of the key schedule as arrays.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+    """
+    global _numpy_schedule_tables
+    if np is None:
+        print("Error22: The numpy backend needs NumPy to be installed.")
+        raise ImportError("the numpy backend needs NumPy to be installed")
+    if _numpy_schedule_tables is None:
+        tables = schedule_tables()
+        with _schedule_tables_lock:
+            if _numpy_schedule_tables is None:
+                _numpy_schedule_tables = NumpyScheduleTables(tables)
+    return _numpy_schedule_tables
+
+
+def _derive_reference(matrix, values: bytes) -> list:
+    """ Key schedule of the 'reference' backend: every row and column move of the primitives, one by one. """
+    sme = SME256.__new__(SME256)
+    sme.matrix = list(matrix)
+    sme.calculate_table_from_values_stepwise(values)
+    return sme.matrix
+
+
+def _derive_python(matrix, values: bytes) -> tuple:
+    """ Key schedule of the 'python' backend: one precomputed gather per primitive. """
+    tables = schedule_tables()
+    rotations = tables.rotation_getters
+    fronts = tables.front_getters
+    for i in values:
+        matrix = rotations[matrix[matrix[0]] ^ i](matrix)  # Rotate based on XOR with current leading value
+        matrix = fronts[matrix[0] ^ i](matrix)  # Bring current leading value to the front
+        matrix = tables.scramble(matrix, matrix[0] ^ i)  # Even/odd column scrambling
+    return matrix
+
+
+def _derive_numpy(matrix, values: bytes) -> list:
+    """ Key schedule of the 'numpy' backend: the gathers run on a uint8 array. """
+    return numpy_schedule_tables().derive(np.frombuffer(bytes(matrix), dtype=np.uint8), values).tolist()
+
+
+def _derive_batch_numpy(passwords: list) -> list:
+    """ Batched key schedule of the 'numpy' backend, every password advances in the same gathers. """
+    start = np.broadcast_to(_IDENTITY_ARRAY, (len(passwords), 256))
+    return [row.tobytes() for row in numpy_schedule_tables().derive_batch(start, passwords)]
+
+
+class KeyScheduleBackend:
+    """
+    A key schedule implementation selectable through SME256.backend.
+
+    derive() is the whole contract: it runs the key schedule over some values from
+    a starting matrix. Keys are derived through it, SME256dBF runs the built-in
+    'python' and 'numpy' backends with inlined loops and any other backend with
+    one derive() call per byte. Every backend must give exactly the matrices of
+    'reference', check a new one with verifySME before selecting it.
+    """
+
+    def __init__(self, name: str, derive, derive_batch=None, description: str = '', tables=None) -> None:
+        """
+        Initialize a backend.
+
+        Args:
+            name (str): The name stored in SME256.backend.
+            derive: Callable (matrix, values) returning the transformed matrix as a sequence of 256 ints.
+            derive_batch: Callable (passwords) returning the 256-byte matrix of every password (default one derive() per password).
+            description (str): Short description shown by available_backends callers (default '').
+            tables: Callable returning the ScheduleTables or NumpyScheduleTables a ScheduleHook steps through,
+                None when the backend has no profiled path (default None).
+        """
+        self.name = name
+        self.derive = derive
+        self.description = description
+        self.tables = tables
+        if derive_batch is not None:
+            self.derive_batch = derive_batch
+
+    def derive_batch(self, passwords: list) -> list:
+        """
+        Derives the matrices of many passwords from the identity matrix.
+
+        Args:
+            passwords (list): The bytes passwords.
+
+        Returns:
+            list: The 256-byte derived matrix of every password.
+        """
+        return [bytes(self.derive(_IDENTITY, password)) for password in passwords]
+
+    def derive_profiled(self, matrix, values: bytes, profiler: 'ScheduleHook'):
+        """
+        Runs the key schedule one step at a time through a profiler, on the tables of the backend.
+
+        Args:
+            matrix: The starting matrix.
+            values (bytes): The values of the steps.
+            profiler (ScheduleHook): The profiler or trace running every step.
+
+        Returns:
+            The transformed matrix, a tuple for ScheduleTables and a list for NumpyScheduleTables.
+
+        Raises:
+            ValueError: If the backend has no profiled path.
+        """
+        if self.tables is None:
+            print(f"Error34: Backend {self.name} cannot be profiled, detach the profiler or select another backend.")
+            raise ValueError(f"backend {self.name!r} has no profiled path")
+
+        tables = self.tables()
+        vectorized = isinstance(tables, NumpyScheduleTables)
+        matrix = np.frombuffer(bytes(matrix), dtype=np.uint8) if vectorized else tuple(matrix)
+        for i in values:
+            matrix = profiler.step(tables, matrix, i)
+        return matrix.tolist() if vectorized else matrix
+
+
+class DifferentialBackend(KeyScheduleBackend):
+    """
+    Runs every derivation through a candidate backend and the reference, and fails on any difference.
+
+    Registered as '<candidate>+verify' by set_backend(name, verify=True), it lets a
+    new backend run real traffic while proving it produces the same keys and
+    SME256dBF ciphertexts, at the cost of the reference speed.
+    """
+
+    def __init__(self, candidate: KeyScheduleBackend, reference: KeyScheduleBackend) -> None:
+        """
+        Initialize the differential backend.
+
+        Args:
+            candidate (KeyScheduleBackend): The backend under verification, its results are returned.
+            reference (KeyScheduleBackend): The backend it is checked against.
+        """
+        super().__init__(candidate.name + '+verify', self.derive_checked, description=f'{candidate.name} checked against {reference.name}', tables=candidate.tables)
+        self.candidate = candidate
+        self.reference = reference
+        self.checked = 0
+
+    def derive_checked(self, matrix, values: bytes):
+        """
+        Derives with both backends and compares the results.
+
+        Raises:
+            RuntimeError: If the candidate and the reference disagree.
+        """
+        return self.check(matrix, values, self.candidate.derive(matrix, values))
+
+    def derive_profiled(self, matrix, values: bytes, profiler: 'ScheduleHook'):
+        """
+        Runs the profiled path of the candidate and compares its result with the reference.
+
+        Raises:
+            ValueError: If the candidate has no profiled path.
+            RuntimeError: If the candidate and the reference disagree.
+        """
+        return self.check(matrix, values, self.candidate.derive_profiled(matrix, values, profiler))
+
+    def check(self, matrix, values: bytes, result):
+        """
+        Compares a result of the candidate with the reference derivation.
+
+        Args:
+            matrix: The starting matrix.
+            values (bytes): The values of the derivation.
+            result: The matrix returned by the candidate.
+
+        Returns:
+            The result, unchanged.
+
+        Raises:
+            RuntimeError: If the candidate and the reference disagree.
+        """
+        if bytes(result) != bytes(self.reference.derive(matrix, values)):
+            print(f"Error32: Backend {self.candidate.name} does not match the {self.reference.name} key schedule.")
+            if SME256.metrics is not None:
+                SME256.metrics.error('Error32')
+            raise RuntimeError(f"backend {self.candidate.name!r} differs from {self.reference.name!r} for values {bytes(values).hex()}")
+        self.checked += 1
+        return result
+
+
+_backends = {}
+
+
+def register_backend(backend: KeyScheduleBackend, replace: bool = False) -> KeyScheduleBackend:
+    """
+    Adds a backend to the registry.
+
+    Args:
+        backend (KeyScheduleBackend): The backend to add.
+        replace (bool): Allow replacing a backend of the same name (default False).
+
+    Returns:
+        KeyScheduleBackend: The registered backend.
+
+    Raises:
+        ValueError: If the name is taken and replace is not set.
+    """
+    if backend.name in _backends and not replace:
+        raise ValueError(f"backend {backend.name!r} is already registered")
+    _backends[backend.name] = backend
+    return backend
+
+
+def available_backends() -> list:
+    """ Returns the names of the registered backends, 'reference' first. """
+    return list(_backends)
+
+
+def get_backend(name: str = None) -> KeyScheduleBackend:
+    """
+    Looks a backend up in the registry.
+
+    Args:
+        name (str): The backend name (default SME256.backend).
+
+    Returns:
+        KeyScheduleBackend: The backend.
+
+    Raises:
+        ValueError: If no backend of that name is registered.
+    """
+    backend = _backends.get(name or SME256.backend)
+    if backend is None:
+        print("Error31: Unknown key schedule backend, see available_backends().")
+        raise ValueError(f"unknown key schedule backend {name or SME256.backend!r}, available: {', '.join(_backends)}")
+    return backend
+
+
+def select_backend(candidates=None, password_length: int = 32, payload_size: int = 256, repeat: int = 5) -> str:
+    """
+    Picks the fastest backend with a short micro-benchmark and selects it.
+
+    Each candidate first derives a random password and must match the reference,
+    then the time of a key derivation plus a SME256dBF encryption is measured.
+
+    Args:
+        candidates: Backend names to try (default every registered one except 'reference' and verifying ones).
+        password_length (int): Length of the benchmark password (default 32).
+        payload_size (int): Size of the benchmark SME256dBF payload (default 256).
+        repeat (int): Measured runs per candidate, the best one counts (default 5).
+
+    Returns:
+        str: The selected backend name, also stored in SME256.backend.
+    """
+    if candidates is None:
+        candidates = [name for name, backend in _backends.items() if name != 'reference' and not isinstance(backend, DifferentialBackend)]
+    password, payload = urandom(password_length), urandom(payload_size)
+    expected = bytes(get_backend('reference').derive(_IDENTITY, password))
+    output = bytearray(payload_size)
+
+    timings = {}
+    for name in candidates:
+        backend = get_backend(name)
+        if bytes(backend.derive(_IDENTITY, password)) != expected:
+            continue  # Never select a backend that would derive other keys
+        best = None
+        for _ in range(0, repeat):
+            start_time = perf_counter()
+            matrix = backend.derive(_IDENTITY, password)
+            DependentByteFlow(matrix, name).encrypt_into(payload, output)
+            elapsed = perf_counter() - start_time
+            best = elapsed if best is None else min(best, elapsed)
+        timings[name] = best
+
+    SME256.backend = min(timings, key=timings.get) if timings else 'reference'
+    return SME256.backend
+
+
+def set_backend(name: str, verify: bool = False) -> str:
+    """
+    Selects the key schedule backend of every SME256 key created afterwards.
+
+    Args:
+        name (str): A registered backend, or 'auto' to run select_backend.
+        verify (bool): Check every derivation of the backend against 'reference' (default False).
+
+    Returns:
+        str: The selected backend name, stored in SME256.backend.
+
+    Raises:
+        ValueError: If the backend is not registered.
+    """
+    if name == 'auto':
+        name = select_backend()
+    backend = get_backend(name)
+    if verify and not isinstance(backend, DifferentialBackend):
+        name = backend.name + '+verify'
+        if name not in _backends:
+            register_backend(DifferentialBackend(backend, get_backend('reference')))
+    SME256.backend = name
+    return name
+
+
+_IDENTITY = bytes(range(0, 256))
+register_backend(KeyScheduleBackend('reference', _derive_reference, description='move-by-move primitives, the specification'))
+register_backend(KeyScheduleBackend('python', _derive_python, description='precomputed gathers on tuples', tables=schedule_tables))
+if np is not None:
+    register_backend(KeyScheduleBackend('numpy', _derive_numpy, _derive_batch_numpy, description='precomputed gathers on uint8 arrays, batched', tables=numpy_schedule_tables))
+
+
+class ScheduleHook:
+    """
+    Base class of the objects that can be attached to SME256.profiler.
+
+    While attached, every key schedule step of the key derivation and of the
+    SME256dBF byte flow goes through step() instead of the fast path. Used as a
+    context manager, a hook attaches itself to every key for the duration of the block.
+    """
+
+    def __enter__(self):
+        self._previous = getattr(self, '_previous', [])
+        self._previous.append(SME256.profiler)
+        SME256.profiler = self  # Attach to every key for the duration of the block
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        SME256.profiler = self._previous.pop()
+
+    def step(self, tables, matrix, i: int):
+        """
+        Runs one key schedule step.
+
+        Args:
+            tables (ScheduleTables | NumpyScheduleTables): The tables matching the matrix type.
+            matrix: The current matrix (tuple or uint8 array).
+            i (int): The value of the step (password byte, or ciphertext XOR plaintext for dBF).
+
+        Returns:
+            The transformed matrix, of the same type.
+        """
+        matrix = tables.rotate(matrix, int(matrix[int(matrix[0])]) ^ i)
+        matrix = tables.front(matrix, int(matrix[0]) ^ i)
+        return tables.scramble(matrix, int(matrix[0]) ^ i)
+
+    def transform(self, decrypt: bool, source: int, result: int) -> None:
+        """ Called by SME256dBF for every byte, before the step it triggers. """
+
+
+class ScheduleProfiler(ScheduleHook):
+    """
+    Opt-in instrumentation of the key schedule and of the SME256dBF byte flow.
+
+    While a profiler is attached (SME256.profiler for every key, or the profiler
+    attribute of a single instance) each key schedule step runs through step(),
+    which times its three phases and counts the moves the reference primitives
+    would have made: rotate_row/rotate_column calls, bring_front loop turns,
+    scrambler invocations and column_to_row conversions. When no profiler is
+    attached the only cost is one attribute check per derivation or dBF call.
+    Cached keys skip the key schedule, derive them with cache=False to profile it.
+    """
+
+    COUNTERS = (
+        'steps', 'rotate_row', 'rotate_column', 'rotate_row_column', 'bring_front', 'bring_front_iterations',
+        'column_select_scrambler_even', 'column_select_scrambler_uneven', 'column_to_row_even', 'column_to_row_uneven',
+    )
+    PHASES = ('rotate_row_column', 'bring_front', 'column_select_scrambler_even', 'column_select_scrambler_uneven')
+
+    def __init__(self, callback=None, max_steps: int = 1 << 16) -> None:
+        """
+        Initialize an empty profiler.
+
+        Args:
+            callback: Called after every step with a dict of its value, time and counts (default None).
+            max_steps (int): Number of most recent per-step timings kept (default 65536).
+        """
+        self.callback = callback
+        self.max_steps = max_steps
+        self.reset()
+
+    def reset(self) -> None:
+        """ Clears every counter and timing. """
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+        self.phase_times = dict.fromkeys(self.PHASES, 0.0)
+        self.step_times = deque(maxlen=self.max_steps)  # (value, seconds) of every step, most recent last
+
+    def step(self, tables, matrix, i: int):
+        """
+        Runs and records one key schedule step.
+
+        Args:
+            tables (ScheduleTables | NumpyScheduleTables): The tables matching the matrix type.
+            matrix: The current matrix (tuple or uint8 array).
+            i (int): The value of the step (password byte, or ciphertext XOR plaintext for dBF).
+
+        Returns:
+            The transformed matrix, of the same type.
+        """
+        start = perf_counter()
+        n = int(matrix[int(matrix[0])]) ^ i
+        matrix = tables.rotate(matrix, n)  # Rotate based on XOR with current leading value
+        rotated = perf_counter()
+        value_index = int(matrix[0]) ^ i
+        matrix = tables.front(matrix, value_index)  # Bring current leading value to the front
+        fronted = perf_counter()
+        index = int(matrix[0]) ^ i
+        uneven = index % 2
+        columns = schedule_tables().uneven_columns[index & 0x0F] if uneven else schedule_tables().even_columns[index & 0x0F]
+        odd_blocks = sum(int(matrix[column]) & 1 for column in columns)
+        matrix = tables.scramble(matrix, index)  # Even/odd column scrambling
+        end = perf_counter()
+
+        turns = tables.front_iterations[value_index]
+        scrambler = 'column_select_scrambler_uneven' if uneven else 'column_select_scrambler_even'
+        counters = self.counters
+        counters['steps'] += 1
+        counters['rotate_row_column'] += 1
+        counters['rotate_row'] += n + turns
+        counters['rotate_column'] += n + turns
+        counters['bring_front'] += 1
+        counters['bring_front_iterations'] += turns
+        counters[scrambler] += 1
+        counters['column_to_row_uneven'] += odd_blocks
+        counters['column_to_row_even'] += 16 - odd_blocks
+
+        self.phase_times['rotate_row_column'] += rotated - start
+        self.phase_times['bring_front'] += fronted - rotated
+        self.phase_times[scrambler] += end - fronted
+        self.step_times.append((i, end - start))
+
+        if self.callback is not None:
+            self.callback({
+                'value': i, 'elapsed': end - start, 'rotations': n, 'bring_front_iterations': turns,
+                'scrambler': scrambler, 'column_to_row_uneven': odd_blocks,
+            })
+        return matrix
+
+    def stats(self) -> dict:
+        """
+        Returns a snapshot of the collected data.
+
+        Returns:
+            dict: counters, phase_times (seconds), total_time, mean_step_time and slowest_steps,
+                the ten slowest recent (value, seconds) steps.
+        """
+        total = sum(self.phase_times.values())
+        return {
+            'counters': dict(self.counters),
+            'phase_times': dict(self.phase_times),
+            'total_time': total,
+            'mean_step_time': total / self.counters['steps'] if self.counters['steps'] else 0.0,
+            'slowest_steps': sorted(self.step_times, key=itemgetter(1), reverse=True)[:10],
+        }
+
+    def pstats_data(self) -> dict:
+        """
+        Converts the phase timings into the raw dictionary format of the pstats module.
+
+        Returns:
+            dict: {(file, line, function): (primitive calls, calls, own time, cumulative time, callers)}.
+        """
+        root = (__file__, SME256.calculate_table_from_values.__code__.co_firstlineno, 'calculate_table_from_values')
+        total = sum(self.phase_times.values())
+        steps = self.counters['steps']
+        data = {root: (steps, steps, 0.0, total, {})}
+        for phase in self.PHASES:
+            calls = self.counters[phase]
+            if calls:
+                key = (__file__, getattr(SME256, phase).__code__.co_firstlineno, phase)
+                elapsed = self.phase_times[phase]
+                data[key] = (calls, calls, elapsed, elapsed, {root: (calls, calls, elapsed, elapsed)})
+        return data
+
+    def dump_stats(self, path: str) -> None:
+        """
+        Writes the timings as a pstats file, readable with pstats.Stats(path) or snakeviz.
+
+        Args:
+            path (str): Destination file.
+        """
+        with open(path, 'wb') as file:
+            marshal.dump(self.pstats_data(), file)
+
+    def folded(self) -> str:
+        """
+        Returns the timings as collapsed stacks, the input of flamegraph.pl and speedscope.
+
+        Returns:
+            str: One 'calculate_table_from_values;phase microseconds' line per phase.
+        """
+        return ''.join(
+            f'calculate_table_from_values;{phase} {round(self.phase_times[phase] * 1e6)}\n'
+            for phase in self.PHASES if self.counters[phase]
+        )
+
+
+class ScheduleTrace(ScheduleHook):
+    """
+    Compact record of the key schedule steps, for visualization and debugging.
+
+    While attached, every step is computed by the precomputed tables at full speed
+    and appended to a byte string: one opcode and one argument per phase, the
+    starting matrix whenever a new derivation or dBF message begins, and the input
+    and output of every SME256dBF byte. A step costs 8 bytes. Renderers rebuild the
+    intermediate matrices with replay() instead of reimplementing the key schedule.
+    """
+
+    MAGIC = b'SMETRACE1'
+    BEGIN, STEP, ROTATE, FRONT, SCRAMBLE, ENCRYPT, DECRYPT = range(0, 7)
+    NAMES = ('begin', 'step', 'rotate_row_column', 'bring_front', 'scramble', 'encrypt', 'decrypt')
+
+    def __init__(self, data: bytes = b'') -> None:
+        """
+        Initialize a trace.
+
+        Args:
+            data (bytes): Previously recorded trace data (default empty).
+        """
+        self.data = bytearray(data)
+        self._last = None  # Matrix returned by the last step, to detect a new starting matrix
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def step(self, tables, matrix, i: int):
+        """
+        Runs and records one key schedule step.
+
+        Args:
+            tables (ScheduleTables | NumpyScheduleTables): The tables matching the matrix type.
+            matrix: The current matrix (tuple or uint8 array).
+            i (int): The value of the step.
+
+        Returns:
+            The transformed matrix, of the same type.
+        """
+        if matrix is not self._last:
+            self.data.append(self.BEGIN)
+            self.data += bytes(int(value) for value in matrix)
+
+        n = int(matrix[int(matrix[0])]) ^ i
+        matrix = tables.rotate(matrix, n)
+        value_index = int(matrix[0]) ^ i
+        matrix = tables.front(matrix, value_index)
+        index = int(matrix[0]) ^ i
+        matrix = tables.scramble(matrix, index)
+
+        self.data += bytes((self.STEP, i, self.ROTATE, n, self.FRONT, value_index, self.SCRAMBLE, index))
+        self._last = matrix
+        return matrix
+
+    def transform(self, decrypt: bool, source: int, result: int) -> None:
+        """
+        Records one SME256dBF byte.
+
+        Args:
+            decrypt (bool): Whether the byte was decrypted.
+            source (int): The input byte.
+            result (int): The output byte.
+        """
+        self.data += bytes((self.DECRYPT if decrypt else self.ENCRYPT, source, result))
+
+    def events(self):
+        """
+        Decodes the trace.
+
+        Yields:
+            tuple: ('begin', matrix bytes), ('step', value), ('rotate_row_column', n),
+                ('bring_front', value_index), ('scramble', index), ('encrypt', plaintext byte,
+                ciphertext byte) or ('decrypt', ciphertext byte, plaintext byte).
+
+        Raises:
+            ValueError: If the trace data is truncated or holds an unknown opcode.
+        """
+        data, position = self.data, 0
+        while position < len(data):
+            opcode = data[position]
+            size = 256 if opcode == self.BEGIN else 2 if opcode in (self.ENCRYPT, self.DECRYPT) else 1
+            if opcode >= len(self.NAMES) or position + 1 + size > len(data):
+                print("Error27: Trace data is corrupted or has an unknown format.")
+                raise ValueError("trace data is corrupted or has an unknown format")
+            arguments = data[position + 1:position + 1 + size]
+            yield (self.NAMES[opcode], bytes(arguments)) if opcode == self.BEGIN else (self.NAMES[opcode], *arguments)
+            position += 1 + size
+
+    def replay(self):
+        """
+        Rebuilds the matrix after every event through the precomputed tables.
+
+        Yields:
+            tuple: (event, matrix), the decoded event and the matrix tuple once it is applied.
+        """
+        tables = schedule_tables()
+        matrix = tuple(range(0, 256))
+        for event in self.events():
+            operation = event[0]
+            if operation == 'begin':
+                matrix = tuple(event[1])
+            elif operation == 'rotate_row_column':
+                matrix = tables.rotate(matrix, event[1])
+            elif operation == 'bring_front':
+                matrix = tables.front(matrix, event[1])
+            elif operation == 'scramble':
+                matrix = tables.scramble(matrix, event[1])
+            yield event, matrix
+
+    def dump(self, path: str) -> None:
+        """
+        Writes the trace to a file.
+
+        Args:
+            path (str): Destination file.
+        """
+        with open(path, 'wb') as file:
+            file.write(self.MAGIC)
+            file.write(self.data)
+
+    @classmethod
+    def load(cls, path: str) -> 'ScheduleTrace':
+        """
+        Reads a trace written by dump().
+
+        Args:
+            path (str): Source file.
+
+        Returns:
+            ScheduleTrace: The loaded trace.
+
+        Raises:
+            ValueError: If the file is not a trace.
+        """
+        with open(path, 'rb') as file:
+            data = file.read()
+        if not data.startswith(cls.MAGIC):
+            print("Error27: Trace data is corrupted or has an unknown format.")
+            raise ValueError("trace data is corrupted or has an unknown format")
+        return cls(data[len(cls.MAGIC):])
+
+
+class MetricsRegistry:
+    """
+    Opt-in in-process metrics of SME256 keys, attached to SME256.metrics.
+
+    Records calls and bytes per operation and mode ('encrypt'/'decrypt' x 'bf'/'dbf',
+    plus 'derive' for key derivations), latency histograms (key_derivation,
+    key_derivation_batch) and the count of the errors hit (Error23, Error24, Error32
+    or any code passed to error()). Every thread writes to its own shard, shards are
+    only merged when the registry is read, so recording never takes a lock. With
+    SME256.metrics left to None the hot paths only pay one attribute check.
+    """
+
+    # Upper bounds in seconds of the histogram buckets, a last bucket holds everything slower
+    BUCKETS = (1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+    def __init__(self, buckets: tuple = BUCKETS) -> None:
+        """
+        Initialize an empty registry.
+
+        Args:
+            buckets (tuple): Increasing upper bounds of the latency buckets, in seconds (default BUCKETS).
+        """
+        self.buckets = tuple(buckets)
+        self._lock = Lock()
+        self.reset()
+
+    def __enter__(self):
+        self._previous = SME256.metrics
+        SME256.metrics = self
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        SME256.metrics = self._previous
+
+    def reset(self) -> None:
+        """ Drops every recorded value. """
+        with self._lock:
+            self._local = local()
+            self._shards = []
+            self.started = time()
+
+    def _shard(self) -> dict:
+        """ Returns the shard of the calling thread, created on its first record. """
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = {'operations': {}, 'errors': Counter(), 'histograms': {}, 'sums': Counter()}
+            with self._lock:  # Once per thread
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def record(self, operation: str, mode: str, nbytes: int, calls: int = 1) -> None:
+        """
+        Counts calls and bytes of an operation.
+
+        Args:
+            operation (str): e.g. 'encrypt', 'decrypt' or 'derive'.
+            mode (str): e.g. 'bf' or 'dbf'.
+            nbytes (int): Bytes processed.
+            calls (int): Calls or messages processed (default 1).
+        """
+        try:
+            counts = self._local.shard['operations'][operation, mode]
+        except (AttributeError, KeyError):
+            counts = self._shard()['operations'].setdefault((operation, mode), [0, 0])
+        counts[0] += calls
+        counts[1] += nbytes
+
+    def observe(self, name: str, seconds: float) -> None:
+        """
+        Adds a latency to a histogram.
+
+        Args:
+            name (str): The histogram, e.g. 'key_derivation'.
+            seconds (float): The measured latency.
+        """
+        shard = self._shard()
+        histogram = shard['histograms'].get(name)
+        if histogram is None:
+            histogram = shard['histograms'][name] = [0] * (len(self.buckets) + 1)
+        histogram[bisect_left(self.buckets, seconds)] += 1
+        shard['sums'][name] += seconds
+
+    def error(self, code: str) -> None:
+        """
+        Counts an error path.
+
+        Args:
+            code (str): The error code, e.g. 'Error23'.
+        """
+        self._shard()['errors'][code] += 1
+
+    def snapshot(self) -> dict:
+        """
+        Merges the shards of every thread.
+
+        Returns:
+            dict: calls, bytes and errors Counters, histograms {name: bucket counts} and sums {name: seconds}.
+        """
+        merged = {'calls': Counter(), 'bytes': Counter(), 'errors': Counter(), 'histograms': {}, 'sums': Counter()}
+        with self._lock:
+            shards = list(self._shards)
+        for shard in shards:
+            for key, (calls, nbytes) in list(shard['operations'].items()):
+                merged['calls'][key] += calls
+                merged['bytes'][key] += nbytes
+            for name in ('errors', 'sums'):
+                merged[name].update(dict(shard[name]))
+            for name, histogram in list(shard['histograms'].items()):
+                total = merged['histograms'].setdefault(name, [0] * len(histogram))
+                for k, count in enumerate(histogram):
+                    total[k] += count
+        return merged
+
+    def quantile(self, histogram: list, q: float) -> float:
+        """
+        Estimates a quantile from bucket counts.
+
+        Args:
+            histogram (list): Bucket counts, see snapshot.
+            q (float): The quantile, from 0 to 1.
+
+        Returns:
+            float: The upper bound of the bucket holding the quantile (inf for the last one), 0.0 when empty.
+        """
+        total = sum(histogram)
+        if not total:
+            return 0.0
+        for k, cumulative in enumerate(accumulate(histogram)):
+            if cumulative >= q * total:
+                return self.buckets[k] if k < len(self.buckets) else float('inf')
+        return float('inf')
+
+    def as_dict(self) -> dict:
+        """
+        Returns every metric as JSON-serializable data.
+
+        Returns:
+            dict: uptime, operations {'operation/mode': {calls, bytes, bytes_per_s}}, errors {code: count}
+                and latency {name: {count, sum, mean, p50, p90, p99, buckets {upper bound: count}}}.
+        """
+        data = self.snapshot()
+        uptime = time() - self.started
+        operations = {
+            f'{operation}/{mode}': {
+                'calls': data['calls'][(operation, mode)], 'bytes': data['bytes'][(operation, mode)],
+                'bytes_per_s': data['bytes'][(operation, mode)] / uptime if uptime > 0 else 0.0,
+            }
+            for operation, mode in sorted(data['calls'])
+        }
+        latency = {}
+        for name, histogram in sorted(data['histograms'].items()):
+            count = sum(histogram)
+            latency[name] = {
+                'count': count, 'sum': data['sums'][name], 'mean': data['sums'][name] / count if count else 0.0,
+                'p50': self.quantile(histogram, 0.50), 'p90': self.quantile(histogram, 0.90), 'p99': self.quantile(histogram, 0.99),
+                'buckets': {str(bound): count for bound, count in zip(self.buckets + ('inf',), histogram)},
+            }
+        return {'uptime': uptime, 'operations': operations, 'errors': dict(sorted(data['errors'].items())), 'latency': latency}
+
+    def to_json(self, indent: int = 2) -> str:
+        """ Returns as_dict() as a JSON document. """
+        return json.dumps(self.as_dict(), indent=indent)
+
+    def to_text(self) -> str:
+        """
+        Returns the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: sme_calls_total, sme_bytes_total, sme_errors_total and one sme_<name>_seconds histogram per latency.
+        """
+        data = self.snapshot()
+        lines = ['# TYPE sme_calls_total counter']
+        lines += [f'sme_calls_total{{operation="{operation}",mode="{mode}"}} {count}' for (operation, mode), count in sorted(data['calls'].items())]
+        lines.append('# TYPE sme_bytes_total counter')
+        lines += [f'sme_bytes_total{{operation="{operation}",mode="{mode}"}} {count}' for (operation, mode), count in sorted(data['bytes'].items())]
+        lines.append('# TYPE sme_errors_total counter')
+        lines += [f'sme_errors_total{{code="{code}"}} {count}' for code, count in sorted(data['errors'].items())]
+        for name, histogram in sorted(data['histograms'].items()):
+            lines.append(f'# TYPE sme_{name}_seconds histogram')
+            for bound, cumulative in zip(self.buckets + ('+Inf',), accumulate(histogram)):
+                lines.append(f'sme_{name}_seconds_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f'sme_{name}_seconds_sum {data["sums"][name]}')
+            lines.append(f'sme_{name}_seconds_count {sum(histogram)}')
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, path: str, format: str = 'json') -> None:
+        """
+        Writes the metrics to a file.
+
+        Args:
+            path (str): Destination file.
+            format (str): 'json' or 'text' (default 'json').
+        """
+        with open(path, 'w') as file:
+            file.write(self.to_json() if format == 'json' else self.to_text())
+
+
+def enable_metrics(registry: MetricsRegistry = None) -> MetricsRegistry:
+    """
+    Starts recording metrics for every key.
+
+    Args:
+        registry (MetricsRegistry): The registry to record into (default a new one).
+
+    Returns:
+        MetricsRegistry: The registry, also stored in SME256.metrics.
+    """
+    SME256.metrics = registry or MetricsRegistry()
+    return SME256.metrics
+
+
+def disable_metrics() -> None:
+    """ Stops recording metrics, the hot paths go back to a single attribute check. """
+    SME256.metrics = None
+
+    
+class SME256BF(SME256):
+    """
+    A child class that extends SME256 for basic frame encryption functions.
+    256 Scrambled-Matrix-Encryption Byte-Flow (SMEBF256)
+    """
+
+    def encrypt(self, plaintext: bytes | str) -> bytes:
+        """
+        Encrypts the provided plaintext using the SME256 algorithm.
+
+        Args:
+            plaintext (bytes | str): The plaintext to encrypt.
+
+        Returns:
+            bytes: The resulting ciphertext.
+        """
+        if not isinstance(plaintext, bytes):
+            plaintext = plaintext.encode()  # Ensure encryption function works with bytes
+        
+        try:
+            ciphertext = plaintext.translate(self.table)  # Map plaintext bytes to matrix values in one pass
+        except (IndexError, ValueError) as e:
+            print("Error10: Encryption failed due to invalid index in plaintext.")
+            raise e
+
+        if self.metrics is not None:
+            self.metrics.record('encrypt', 'bf', len(plaintext))
+        return ciphertext
+
+    def decrypt(self, ciphertext: bytes | str) -> bytes:
+        """
+        Decrypts the provided ciphertext back into plaintext.
+
+        Args:
+            ciphertext (bytes | str): The ciphertext to decrypt.
+
+        Returns:
+            bytes: The resulting plaintext.
+        """
+        if not isinstance(ciphertext, bytes):
+            ciphertext = ciphertext.encode()  # Ensure ciphertext is bytes
+        
+        try:
+            plaintext = ciphertext.translate(self.inverse)  # Rebuild plaintext from the inverse table
+        except ValueError as e:
+            print("Error12: Decrypting failed because index was not found in the matrix.")
+            raise e
+
+        if self.metrics is not None:
+            self.metrics.record('decrypt', 'bf', len(ciphertext))
+        return plaintext
+
+    def translate_into(self, src, dst, table: bytes, operation: str = None) -> int:
+        """
+        Maps every byte of src through a lookup table and writes the result into dst.
+
+        The work is done in CHUNK_SIZE slices, so the temporary memory used does not
+        grow with the size of the input. src and dst may be the same buffer.
+
+        Args:
+            src: The buffer to read from.
+            dst: The writable buffer to write to.
+            table (bytes): The 256-byte lookup table to apply.
+            operation (str): 'encrypt' or 'decrypt', the operation recorded in the metrics (default None, not recorded).
+
+        Returns:
+            int: The number of bytes written.
+        """
+        source, destination = _buffer_views(src, dst)
+
+        for start in range(0, len(source), CHUNK_SIZE):
+            end = start + CHUNK_SIZE
+            destination[start:end] = source[start:end].tobytes().translate(table)
+
+        if operation is not None and self.metrics is not None:
+            self.metrics.record(operation, 'bf', len(source))
+        return len(source)
+
+    def encrypt_into(self, src, dst) -> int:
+        """
+        Encrypts a buffer into a caller-owned buffer.
+
+        Args:
+            src: The plaintext buffer (bytes, bytearray, memoryview, mmap...).
+            dst: The writable buffer receiving the ciphertext.
+
+        Returns:
+            int: The number of bytes written.
+        """
+        return self.translate_into(src, dst, self.table, 'encrypt')
+
+    def decrypt_into(self, src, dst) -> int:
+        """
+        Decrypts a buffer into a caller-owned buffer.
+
+        Args:
+            src: The ciphertext buffer (bytes, bytearray, memoryview, mmap...).
+            dst: The writable buffer receiving the plaintext.
+
+        Returns:
+            int: The number of bytes written.
+        """
+        return self.translate_into(src, dst, self.inverse, 'decrypt')
+
+    def encrypt_inplace(self, buffer) -> int:
+        """
+        Encrypts a writable buffer in place.
+
+        Args:
+            buffer: The writable buffer holding the plaintext.
+
+        Returns:
+            int: The number of bytes encrypted.
+        """
+        return self.encrypt_into(buffer, buffer)
+
+    def decrypt_inplace(self, buffer) -> int:
+        """
+        Decrypts a writable buffer in place.
+
+        Args:
+            buffer: The writable buffer holding the ciphertext.
+
+        Returns:
+            int: The number of bytes decrypted.
+        """
+        return self.decrypt_into(buffer, buffer)
+
+    def encrypt_packed(self, buffer, offsets) -> tuple:
+        """
+        Encrypts many messages packed in a single buffer in one pass.
+
+        Args:
+            buffer: The concatenated plaintexts (any bytes-like object).
+            offsets: The message boundaries, see pack_messages.
+
+        Returns:
+            tuple: (ciphertexts, offsets), the ciphertexts packed with the same boundaries.
+        """
+        result = bytes(buffer).translate(self.table)
+        if self.metrics is not None:
+            self.metrics.record('encrypt', 'bf', len(result), len(offsets) - 1)
+        return result, offsets
+
+    def decrypt_packed(self, buffer, offsets) -> tuple:
+        """
+        Decrypts many messages packed in a single buffer in one pass.
+
+        Args:
+            buffer: The concatenated ciphertexts (any bytes-like object).
+            offsets: The message boundaries, see pack_messages.
+
+        Returns:
+            tuple: (plaintexts, offsets), the plaintexts packed with the same boundaries.
+        """
+        result = bytes(buffer).translate(self.inverse)
+        if self.metrics is not None:
+            self.metrics.record('decrypt', 'bf', len(result), len(offsets) - 1)
+        return result, offsets
+
+    def encrypt_many(self, messages) -> list:
+        """
+        Encrypts a sequence of messages in a single pass, without the per-call overhead of encrypt.
+        For the lowest overhead pack the messages and use encrypt_packed.
+
+        Args:
+            messages: A sequence of bytes-like objects or str.
+
+        Returns:
+            list: The ciphertext of every message, in order.
+        """
+        table = self.table
+        results = [
+            message.translate(table) if isinstance(message, bytes)
+            else (message.encode() if isinstance(message, str) else bytes(message)).translate(table)
+            for message in messages
+        ]
+        if self.metrics is not None:
+            self.metrics.record('encrypt', 'bf', sum(len(result) for result in results), len(results))
+        return results
+
+    def decrypt_many(self, messages) -> list:
+        """
+        Decrypts a sequence of messages in a single pass, without the per-call overhead of decrypt.
+        For the lowest overhead pack the messages and use decrypt_packed.
+
+        Args:
+            messages: A sequence of bytes-like objects or str.
+
+        Returns:
+            list: The plaintext of every message, in order.
+        """
+        inverse = self.inverse
+        results = [
+            message.translate(inverse) if isinstance(message, bytes)
+            else (message.encode() if isinstance(message, str) else bytes(message)).translate(inverse)
+            for message in messages
+        ]
+        if self.metrics is not None:
+            self.metrics.record('decrypt', 'bf', sum(len(result) for result in results), len(results))
+        return results
+
+
+class DependentByteFlow:
+    """
+    Per-byte state machine of SME256dBF.
+
+    After every byte the matrix goes through one key schedule step keyed by
+    (ciphertext byte XOR plaintext byte). The engine keeps only that evolving
+    state as bytes, applies each step as bytes.translate gathers of the
+    precomputed permutations and keeps the inverse permutation for decryption
+    with bytes.maketrans, so it produces exactly the same bytes as the
+    move-by-move algorithm. Both built-in backends run this engine: one
+    256-byte step at a time NumPy only adds call overhead (about 4x slower),
+    it is kept for key derivation and batches. Other registered backends run
+    one derive() call per byte.
+    """
+
+    def __init__(self, matrix, backend: str = None, profiler: ScheduleHook = None) -> None:
+        """
+        Initialize the engine from a derived matrix.
+
+        Args:
+            matrix: The starting matrix (list, bytes or any sequence of 256 values).
+            backend (str): A registered backend, 'numpy' and 'python' both run the bytes engine (default SME256.backend).
+            profiler (ScheduleHook): Runs every per-byte step when set, e.g. a ScheduleProfiler or ScheduleTrace (default None).
+        """
+        backend = backend or SME256.backend
+        self.backend = 'python' if backend == 'numpy' else backend
+        self.profiler = profiler
+        if self.backend != 'python':
+            get_backend(self.backend)  # Fail on an unknown backend now rather than on the first byte
+        self.state = bytes(matrix)
+        self.inverse = bytes.maketrans(self.state, _IDENTITY)
+
+    def fork(self) -> 'DependentByteFlow':
+        """
+        Creates an independent engine in the same state.
+
+        Returns:
+            DependentByteFlow: The copy, both engines continue separately.
+        """
+        clone = DependentByteFlow.__new__(DependentByteFlow)
+        clone.backend, clone.profiler = self.backend, self.profiler
+        clone.state, clone.inverse = self.state, self.inverse  # Immutable, both can be shared
+        return clone
+
+    @property
+    def matrix(self) -> list:
+        """ Returns the current state as a list. """
+        return list(self.state)
+
+    def encrypt_into(self, source, destination) -> None:
+        """
+        Encrypts a byte sequence, advancing the state after every byte.
+
+        Args:
+            source: The plaintext bytes (any iterable of ints from 0 to 255).
+            destination: A writable buffer at least as long as the source.
+        """
+        if self.profiler is not None:
+            self.process_profiled(source, destination, False)
+            return
+        if self.backend != 'python':
+            self.process_registered(source, destination, False)
+            return
+
+        tables = schedule_tables()
+        rotations, fronts, scramble = tables.rotation_tables, tables.front_tables, tables.scramble_bytes
+        matrix = self.state
+        for position, i in enumerate(source):
+            value = matrix[i]
+            destination[position] = value
+            value ^= i
+            matrix = rotations[matrix[matrix[0]] ^ value].translate(matrix)
+            matrix = fronts[matrix[0] ^ value].translate(matrix)
+            matrix = scramble(matrix, matrix[0] ^ value)
+        self.state = matrix
+        self.inverse = bytes.maketrans(matrix, _IDENTITY)
+
+    def decrypt_into(self, source, destination) -> None:
+        """
+        Decrypts a byte sequence, advancing the state after every byte.
+
+        Args:
+            source: The ciphertext bytes (any iterable of ints from 0 to 255).
+            destination: A writable buffer at least as long as the source.
+        """
+        if self.profiler is not None:
+            self.process_profiled(source, destination, True)
+            return
+        if self.backend != 'python':
+            self.process_registered(source, destination, True)
+            return
+
+        tables = schedule_tables()
+        rotations, fronts, scramble = tables.rotation_tables, tables.front_tables, tables.scramble_bytes
+        matrix, inverse = self.state, self.inverse
+        for position, i in enumerate(source):
+            value = inverse[i]
+            destination[position] = value
+            value ^= i
+            matrix = rotations[matrix[matrix[0]] ^ value].translate(matrix)
+            matrix = fronts[matrix[0] ^ value].translate(matrix)
+            matrix = scramble(matrix, matrix[0] ^ value)
+            inverse = bytes.maketrans(matrix, _IDENTITY)  # Keep the inverse permutation in sync
+        self.state, self.inverse = matrix, inverse
+
+    def process_registered(self, source, destination, decrypt: bool) -> None:
+        """
+        Encrypts or decrypts a byte sequence with one derive() call of the backend per byte.
+
+        Args:
+            source: The input bytes (any iterable of ints from 0 to 255).
+            destination: A writable buffer at least as long as the source.
+            decrypt (bool): Look the bytes up in the inverse permutation instead of the matrix.
+        """
+        derive = get_backend(self.backend).derive
+        matrix, inverse = self.state, self.inverse
+        for position, i in enumerate(source):
+            value = inverse[i] if decrypt else matrix[i]
+            destination[position] = value
+            matrix = bytes(derive(matrix, (value ^ i,)))
+            if decrypt:
+                inverse = bytes.maketrans(matrix, _IDENTITY)
+        self.state, self.inverse = matrix, bytes.maketrans(matrix, _IDENTITY)
+
+    def process_profiled(self, source, destination, decrypt: bool) -> None:
+        """
+        Encrypts or decrypts a byte sequence, running every step through the profiler.
+
+        Args:
+            source: The input bytes (any iterable of ints from 0 to 255).
+            destination: A writable buffer at least as long as the source.
+            decrypt (bool): Look the bytes up in the inverse permutation instead of the matrix.
+        """
+        profiler = self.profiler
+        if self.backend == 'python':
+            tables, step = schedule_tables(), profiler.step
+        else:  # One profiled step on the tables of the registered backend
+            tables, derive_profiled = None, get_backend(self.backend).derive_profiled
+        transform = getattr(profiler, 'transform', None)
+        matrix, inverse = self.state, self.inverse
+        for position, i in enumerate(source):
+            value = inverse[i] if decrypt else matrix[i]
+            destination[position] = value
+            if transform is not None:
+                transform(decrypt, i, value)
+            matrix = step(tables, matrix, value ^ i) if tables is not None else derive_profiled(matrix, (value ^ i,), profiler)
+            if decrypt:
+                inverse = bytes.maketrans(bytes(matrix), _IDENTITY)  # Keep the inverse permutation in sync
+        self.state, self.inverse = matrix, bytes.maketrans(bytes(matrix), _IDENTITY)  # The state keeps the type of the hook steps, see ScheduleTrace
+
+
+class DependentByteFlowContext:
+    """
+    Incremental SME256dBF encryption or decryption.
+
+    The evolving matrix is carried from one update() to the next, so feeding a
+    message in pieces gives exactly the same output as a single encrypt/decrypt
+    call while only the current piece is held in memory.
+    """
+
+    def __init__(self, sme: 'SME256dBF', mode: str, matrix: bytes = None, processed: int = 0) -> None:
+        """
+        Initialize a context from a derived key.
+
+        Args:
+            sme (SME256dBF): The derived key.
+            mode (str): Either 'encrypt' or 'decrypt'.
+            matrix (bytes): State to resume from, e.g. a checkpoint taken mid-stream (default the key).
+            processed (int): Bytes already processed when that state was reached (default 0).
+        """
+        if mode not in ('encrypt', 'decrypt'):
+            raise ValueError(f"unknown mode: {mode!r}, expected 'encrypt' or 'decrypt'")
+        self.mode = mode
+        self.processed = processed
+        self.finalized = False
+        self.metrics = sme.metrics
+        self.engine = DependentByteFlow(sme.table if matrix is None else matrix, sme.backend, sme.profiler)
+
+    def state(self) -> bytes:
+        """
+        Returns the current matrix, the whole state needed to resume the stream at this point.
+
+        Returns:
+            bytes: The 256-byte matrix.
+        """
+        return bytes(self.engine.matrix)
+
+    def update_into(self, src, dst) -> int:
+        """
+        Processes the next piece of the stream into a caller-owned buffer.
+
+        Args:
+            src: The next piece of the stream (bytes, bytearray, memoryview, mmap...).
+            dst: The writable buffer receiving the result, may be src itself.
+
+        Returns:
+            int: The number of bytes written.
+        """
+        if self.finalized:
+            print("Error23: The context was already finalized.")
+            if self.metrics is not None:
+                self.metrics.error('Error23')
+            raise ValueError("the context was already finalized")
+
+        source, destination = _buffer_views(src, dst)
+        try:
+            if self.mode == 'encrypt':
+                self.engine.encrypt_into(source, destination)
+            else:
+                self.engine.decrypt_into(source, destination)
+        except (IndexError, ValueError) as e:
+            print("Error24: Incremental processing failed, the stream state is no longer valid.")
+            if self.metrics is not None:
+                self.metrics.error('Error24')
+            self.finalized = True
+            raise e
+
+        self.processed += len(source)
+        if self.metrics is not None:
+            self.metrics.record(self.mode, 'dbf', len(source))
+        return len(source)
+
+    def update(self, chunk: bytes | str) -> bytes:
+        """
+        Processes the next piece of the stream.
+
+        Args:
+            chunk (bytes | str): The next piece of the stream.
+
+        Returns:
+            bytes: The processed piece.
+        """
+        if isinstance(chunk, str):
+            chunk = chunk.encode()  # Ensure chunk is bytes
+
+        out = bytearray(len(chunk))
+        self.update_into(chunk, out)
+        return bytes(out)
+
+    def fork(self) -> 'DependentByteFlowContext':
+        """
+        Creates an independent context in the same state, e.g. after a shared header.
+
+        Returns:
+            DependentByteFlowContext: The copy, both contexts continue separately.
+        """
+        if self.finalized:
+            print("Error23: The context was already finalized.")
+            if self.metrics is not None:
+                self.metrics.error('Error23')
+            raise ValueError("the context was already finalized")
+        clone = DependentByteFlowContext.__new__(DependentByteFlowContext)
+        clone.mode, clone.processed, clone.finalized, clone.metrics = self.mode, self.processed, False, self.metrics
+        clone.engine = self.engine.fork()
+        return clone
+
+    def finalize(self) -> bytes:
+        """
+        Ends the stream, no further update is accepted.
+
+        Returns:
+            bytes: The remaining output, always empty as SME256dBF does not buffer.
+        """
+        self.finalized = True
+        return b''
+
+
+class SME256dBF(SME256):
+    """
+    A child class of SME256 that implements an alternative encryption method 
+    that updates the transformation matrix dynamically during encryption and decryption.
+    256 Scrambled-Matrix-Encryption dependent-Byte-Flow (SMEdBF256)
+    """
+
+    def encryptor(self, matrix: bytes = None, processed: int = 0) -> DependentByteFlowContext:
+        """
+        Creates an incremental encryption context starting from this key.
+
+        Args:
+            matrix (bytes): State to resume from, see DependentByteFlowContext.state (default the key).
+            processed (int): Bytes already processed when that state was reached (default 0).
+
+        Returns:
+            DependentByteFlowContext: A context exposing update() and finalize().
+        """
+        return DependentByteFlowContext(self, 'encrypt', matrix, processed)
+
+    def decryptor(self, matrix: bytes = None, processed: int = 0) -> DependentByteFlowContext:
+        """
+        Creates an incremental decryption context starting from this key.
+
+        Args:
+            matrix (bytes): State to resume from, see DependentByteFlowContext.state (default the key).
+            processed (int): Bytes already processed when that state was reached (default 0).
+
+        Returns:
+            DependentByteFlowContext: A context exposing update() and finalize().
+        """
+        return DependentByteFlowContext(self, 'decrypt', matrix, processed)
+
+    def encrypt(self, plaintext: bytes | str) -> bytes:
+        """
+        Encrypts plaintext, updating transformation dynamically.
+
+        Args:
+            plaintext (bytes | str): The plaintext to encrypt.
+
+        Returns:
             bytes: The resulting ciphertext.
         """
-        ciphertext = []
-        support_matrix = [i for i in self.matrix]  # Save initial matrix state
-        
         if not isinstance(plaintext, bytes):
             plaintext = plaintext.encode()  # Ensure plaintext is bytes
 
-        for i in plaintext:
-            try:
-                ciphertext.append(self.matrix[i])  # Encrypt value based on matrix
-                self.calculate_table_from_values([self.matrix[i] ^ i])  # Dynamically update matrix based on XOR
-            except IndexError as e:
-                print("Error14: Encryption process failed due to invalid index.")
-                raise e
-
-        self.matrix = support_matrix  # Reset matrix state for consistency
+        ciphertext = bytearray(len(plaintext))
+        self.encrypt_into(plaintext, ciphertext)
         return bytes(ciphertext)
 
     def decrypt(self, ciphertext: bytes | str) -> bytes:
@@ -356,19 +2489,328 @@ class SME256dBF(SME256):
         Returns:
             bytes: The resulting plaintext.
         """
-        plaintext = []
-        support_matrix = [i for i in self.matrix]  # Save initial matrix state
-        
         if not isinstance(ciphertext, bytes):
             ciphertext = ciphertext.encode()  # Ensure ciphertext is bytes
 
-        for i in ciphertext:
-            try:
-                plaintext.append(self.matrix.index(i))  # Decrypt value based on matrix indices
-                self.calculate_table_from_values([i ^ self.matrix.index(i)])  # Update the matrix
-            except ValueError as e:
-                print("Error16: Decryption process failed because index was not found in the matrix.")
-                raise e
-
-        self.matrix = support_matrix  # Reset matrix state for consistency
+        plaintext = bytearray(len(ciphertext))
+        self.decrypt_into(ciphertext, plaintext)
         return bytes(plaintext)
+
+    def encrypt_into(self, src, dst) -> int:
+        """
+        Encrypts a buffer into a caller-owned buffer, updating transformation dynamically.
+        src and dst may be the same buffer.
+
+        Args:
+            src: The plaintext buffer (bytes, bytearray, memoryview, mmap...).
+            dst: The writable buffer receiving the ciphertext.
+
+        Returns:
+            int: The number of bytes written.
+        """
+        source, destination = _buffer_views(src, dst)
+
+        try:
+            # The engine works on its own copy of the key, the instance is never modified
+            DependentByteFlow(self.table, self.backend, self.profiler).encrypt_into(source, destination)
+        except IndexError as e:
+            print("Error14: Encryption process failed due to invalid index.")
+            raise e
+
+        if self.metrics is not None:
+            self.metrics.record('encrypt', 'dbf', len(source))
+        return len(source)
+
+    def decrypt_into(self, src, dst) -> int:
+        """
+        Decrypts a buffer into a caller-owned buffer with dynamic matrix updates.
+        src and dst may be the same buffer.
+
+        Args:
+            src: The ciphertext buffer (bytes, bytearray, memoryview, mmap...).
+            dst: The writable buffer receiving the plaintext.
+
+        Returns:
+            int: The number of bytes written.
+        """
+        source, destination = _buffer_views(src, dst)
+
+        try:
+            DependentByteFlow(self.table, self.backend, self.profiler).decrypt_into(source, destination)
+        except ValueError as e:
+            print("Error16: Decryption process failed because index was not found in the matrix.")
+            raise e
+
+        if self.metrics is not None:
+            self.metrics.record('decrypt', 'dbf', len(source))
+        return len(source)
+
+    def encrypt_inplace(self, buffer) -> int:
+        """
+        Encrypts a writable buffer in place, updating transformation dynamically.
+
+        Args:
+            buffer: The writable buffer holding the plaintext.
+
+        Returns:
+            int: The number of bytes encrypted.
+        """
+        return self.encrypt_into(buffer, buffer)
+
+    def decrypt_inplace(self, buffer) -> int:
+        """
+        Decrypts a writable buffer in place with dynamic matrix updates.
+
+        Args:
+            buffer: The writable buffer holding the ciphertext.
+
+        Returns:
+            int: The number of bytes decrypted.
+        """
+        return self.decrypt_into(buffer, buffer)
+
+    def process_packed(self, buffer, offsets, mode: str, workers: int = None) -> tuple:
+        """
+        Encrypts or decrypts many independent messages packed in a single buffer.
+
+        Every message starts from the key matrix, exactly as separate encrypt/decrypt calls.
+
+        Args:
+            buffer: The concatenated messages (any bytes-like object).
+            offsets: The message boundaries, see pack_messages.
+            mode (str): Either 'encrypt' or 'decrypt'.
+            workers (int): Spread the messages over this many processes (default None, in process).
+
+        Returns:
+            tuple: (results, offsets), the results packed with the same boundaries.
+        """
+        if mode not in ('encrypt', 'decrypt'):
+            raise ValueError(f"unknown mode: {mode!r}, expected 'encrypt' or 'decrypt'")
+        if workers:
+            from parallelSME import dependent_packed  # Imported here, parallelSME depends on this module
+            out = dependent_packed(self, buffer, offsets, mode, workers)
+        else:
+            source = memoryview(buffer).cast('B')
+            out = bytearray(len(source))
+            destination = memoryview(out)
+
+            for k in range(0, len(offsets) - 1):
+                start, end = offsets[k], offsets[k + 1]
+                engine = DependentByteFlow(self.table, self.backend, self.profiler)
+                try:
+                    if mode == 'encrypt':
+                        engine.encrypt_into(source[start:end], destination[start:end])
+                    else:
+                        engine.decrypt_into(source[start:end], destination[start:end])
+                except (IndexError, ValueError) as e:
+                    print(f"Error25: Batch {mode}ion failed on message {k}.")
+                    raise e
+
+        if self.metrics is not None:  # Only completed batches are counted
+            self.metrics.record(mode, 'dbf', offsets[-1] - offsets[0] if len(offsets) else 0, max(0, len(offsets) - 1))
+        return bytes(out), offsets
+
+    def encrypt_packed(self, buffer, offsets, workers: int = None) -> tuple:
+        """
+        Encrypts many independent messages packed in a single buffer.
+
+        Args:
+            buffer: The concatenated plaintexts (any bytes-like object).
+            offsets: The message boundaries, see pack_messages.
+            workers (int): Spread the messages over this many processes (default None, in process).
+
+        Returns:
+            tuple: (ciphertexts, offsets), the ciphertexts packed with the same boundaries.
+        """
+        return self.process_packed(buffer, offsets, 'encrypt', workers)
+
+    def decrypt_packed(self, buffer, offsets, workers: int = None) -> tuple:
+        """
+        Decrypts many independent messages packed in a single buffer.
+
+        Args:
+            buffer: The concatenated ciphertexts (any bytes-like object).
+            offsets: The message boundaries, see pack_messages.
+            workers (int): Spread the messages over this many processes (default None, in process).
+
+        Returns:
+            tuple: (plaintexts, offsets), the plaintexts packed with the same boundaries.
+        """
+        return self.process_packed(buffer, offsets, 'decrypt', workers)
+
+    def encrypt_many(self, messages, workers: int = None) -> list:
+        """
+        Encrypts a sequence of independent messages.
+
+        Args:
+            messages: A sequence of bytes-like objects or str.
+            workers (int): Spread the messages over this many processes (default None, in process).
+
+        Returns:
+            list: The ciphertext of every message, in order.
+        """
+        return unpack_messages(*self.encrypt_packed(*pack_messages(messages), workers))
+
+    def decrypt_many(self, messages, workers: int = None) -> list:
+        """
+        Decrypts a sequence of independent messages.
+
+        Args:
+            messages: A sequence of bytes-like objects or str.
+            workers (int): Spread the messages over this many processes (default None, in process).
+
+        Returns:
+            list: The plaintext of every message, in order.
+        """
+        return unpack_messages(*self.decrypt_packed(*pack_messages(messages), workers))
+
+
+class CompactKey:
+    """
+    Minimal, immutable form of a derived SME256 key: the forward and inverse tables only.
+
+    A SME256 instance keeps its working matrix as a list of 256 ints, the password
+    and an instance dictionary, several kilobytes per key. A compact key holds two
+    256-byte tables in __slots__, never keeps the password, and pickles to the
+    forward table alone, so caches of many tenant keys and transfers to worker
+    processes only pay for the real state. The encryption methods are the ones of
+    SME256BF and SME256dBF, the subclasses below reuse them as they are.
+    """
+
+    __slots__ = ('table', 'inverse')
+
+    # Follow the class-wide settings of SME256, slots leave no room for per-key values
+    backend = property(lambda self: SME256.backend)
+    profiler = property(lambda self: SME256.profiler)
+    metrics = property(lambda self: SME256.metrics)
+
+    def __init__(self, table: bytes, inverse: bytes = None, verify: bool = True) -> None:
+        """
+        Initialize the key from a derived table.
+
+        Args:
+            table (bytes): The 256-byte forward table (the derived matrix).
+            inverse (bytes): The matching 256-byte inverse table, rebuilt when omitted (default None).
+            verify (bool): Check that the given tables are a permutation and its inverse (default True).
+
+        Raises:
+            ValueError: If the tables are not a valid pair.
+        """
+        table = bytes(table)
+        if inverse is None:
+            rebuilt = bytearray(256)
+            for index, value in enumerate(table):
+                rebuilt[value] = index
+            inverse, verify = bytes(rebuilt), True  # A repeated value leaves a wrong inverse, always check
+        else:
+            inverse = bytes(inverse)
+        if verify and (len(table) != 256 or len(inverse) != 256 or table.translate(inverse) != bytes(range(0, 256))):
+            print("Error18: Matrix is not a permutation of 0-255, lookup tables cannot be built.")
+            raise ValueError("table and inverse are not a permutation of 0-255 and its inverse")
+        self.table = table
+        self.inverse = inverse
+
+    @classmethod
+    def from_password(cls, password: bytes, cache: bool = True) -> 'CompactKey':
+        """
+        Derives the key of a password, the password is not kept.
+
+        Args:
+            password (bytes): The password.
+            cache (bool): Whether to reuse/store the derived matrix in key_cache (default True).
+
+        Returns:
+            CompactKey: The key, identical to the tables of SME256(password).
+        """
+        metrics = SME256.metrics
+        start_time = perf_counter() if metrics is not None else 0.0
+        cached = matrix = key_cache.get(password) if cache else None
+        if matrix is None:
+            matrix = derive_matrices([password])[0]
+            if cache:
+                key_cache.put(password, matrix)
+        key = cls(matrix)
+        if metrics is not None:
+            metrics.observe('key_derivation', perf_counter() - start_time)
+            metrics.record('derive', 'cached' if cached is not None else 'schedule', len(password))
+        return key
+
+    @classmethod
+    def from_passwords(cls, passwords, cache: bool = True) -> list:
+        """
+        Derives the keys of many passwords as one batch, see SME256.from_passwords.
+
+        Args:
+            passwords: A sequence of bytes passwords.
+            cache (bool): Whether to reuse/store the derived matrices in key_cache (default True).
+
+        Returns:
+            list: One key per password.
+        """
+        return [cls(sme.table, sme.inverse, verify=False) for sme in SME256.from_passwords(passwords, cache)]
+
+    @classmethod
+    def from_key(cls, sme: SME256) -> 'CompactKey':
+        """
+        Copies the tables of a full SME256 instance.
+
+        Args:
+            sme (SME256): The key to compact.
+
+        Returns:
+            CompactKey: The compact key, sharing the immutable tables of sme.
+        """
+        return cls(sme.table, sme.inverse, verify=False)
+
+    def __reduce__(self) -> tuple:
+        return self.__class__, (self.table,)  # The inverse is rebuilt, and checked, when unpickling
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, CompactKey) and hmac_compare(self.table, other.table)
+
+    __hash__ = None  # Keys are not meant to be dictionary keys, use the key ID
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__}>'  # Never print the key material
+
+
+class SME256BFKey(CompactKey):
+    """ Compact SME256BF key, see CompactKey. """
+
+    __slots__ = ()
+
+    encrypt = SME256BF.encrypt
+    decrypt = SME256BF.decrypt
+    translate_into = SME256BF.translate_into
+    encrypt_into = SME256BF.encrypt_into
+    decrypt_into = SME256BF.decrypt_into
+    encrypt_inplace = SME256BF.encrypt_inplace
+    decrypt_inplace = SME256BF.decrypt_inplace
+    encrypt_packed = SME256BF.encrypt_packed
+    decrypt_packed = SME256BF.decrypt_packed
+    encrypt_many = SME256BF.encrypt_many
+    decrypt_many = SME256BF.decrypt_many
+
+
+class SME256dBFKey(CompactKey):
+    """ Compact SME256dBF key, see CompactKey. """
+
+    __slots__ = ()
+
+    encryptor = SME256dBF.encryptor
+    decryptor = SME256dBF.decryptor
+    encrypt = SME256dBF.encrypt
+    decrypt = SME256dBF.decrypt
+    encrypt_into = SME256dBF.encrypt_into
+    decrypt_into = SME256dBF.decrypt_into
+    encrypt_inplace = SME256dBF.encrypt_inplace
+    decrypt_inplace = SME256dBF.decrypt_inplace
+    process_packed = SME256dBF.process_packed
+    encrypt_packed = SME256dBF.encrypt_packed
+    decrypt_packed = SME256dBF.decrypt_packed
+    encrypt_many = SME256dBF.encrypt_many
+    decrypt_many = SME256dBF.decrypt_many
+
+
+if environ.get('SME_BACKEND'):  # e.g. SME_BACKEND=auto picks the fastest backend at import
+    set_backend(environ['SME_BACKEND'])
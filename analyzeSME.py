@@ -0,0 +1,317 @@
+#Copyright 2025 yo525
+#SPDX-License-Identifier: Apache-2.0
+
+#Import necessary modules
+from SME import derive_matrices
+
+from argparse import ArgumentParser
+from collections import Counter
+from itertools import islice
+from json import dump
+from multiprocessing import Pool, cpu_count
+from os import urandom
+from timeit import default_timer
+import sys
+
+
+def analyze_matrix(matrix) -> dict:
+    """
+    Checks and describes a derived matrix in linear time.
+
+    Args:
+        matrix: A sequence of 256 values.
+
+    Returns:
+        dict: valid (is a permutation of 0-255), repeated ({value: count} of values found more
+            than once), missing (values never found), out_of_range ((index, value) of the cells
+            not holding an integer from 0 to 255), fixed_points (cells holding their own index)
+            and, for valid matrices, cycles (the sorted cycle lengths of the permutation).
+    """
+    counts = [0] * 256
+    out_of_range = []
+    for index, value in enumerate(matrix):
+        try:
+            if 0 <= value <= 255:
+                counts[value] += 1  # TypeError for a value that is not an integer, e.g. 1.5
+                continue
+        except TypeError:
+            pass
+        out_of_range.append((index, value))  # Would raise IndexError or wrap around as a negative index
+
+    repeated = {value: count for value, count in enumerate(counts) if count > 1}
+    missing = [value for value, count in enumerate(counts) if count == 0]
+    fixed_points = sum(1 for index, value in enumerate(matrix) if index == value)
+    result = {
+        'valid': len(matrix) == 256 and not repeated and not missing and not out_of_range,
+        'repeated': repeated, 'missing': missing, 'out_of_range': out_of_range, 'fixed_points': fixed_points,
+    }
+
+    if result['valid']:
+        visited = bytearray(256)
+        cycles = []
+        for start in range(0, 256):
+            length = 0
+            while not visited[start]:  # Every cell is visited once over the whole loop
+                visited[start] = 1
+                start = matrix[start]
+                length += 1
+            if length:
+                cycles.append(length)
+        result['cycles'] = sorted(cycles)
+    return result
+
+
+def similarity(first, second) -> int:
+    """
+    Counts the cells holding the same value in two matrices.
+
+    Args:
+        first: A sequence of 256 values.
+        second: Another sequence of 256 values.
+
+    Returns:
+        int: The number of equal cells, a random pair of permutations averages 1.
+    """
+    return sum(1 for a, b in zip(first, second) if a == b)
+
+
+def neighbour(password: bytes, position: int = 0) -> bytes:
+    """
+    Returns the password differing from the given one in the lowest bit of one byte.
+
+    Args:
+        password (bytes): The password.
+        position (int): Index of the byte to flip, negative values count from the end (default 0).
+
+    Returns:
+        bytes: The neighbouring password.
+    """
+    flipped = bytearray(password)
+    flipped[position] ^= 1
+    return bytes(flipped)
+
+
+class AnalysisReport:
+    """
+    Aggregated statistics of the matrices derived for many passwords.
+
+    Every field is a plain counter, so the partial reports of the workers are
+    merged by simply adding them up.
+    """
+
+    def __init__(self) -> None:
+        """ Initialize an empty report. """
+        self.passwords = 0
+        self.invalid = 0
+        self.elapsed = 0.0
+        self.invalid_samples = []  # First passwords (hex) whose matrix was not a permutation
+        self.fixed_points = Counter()  # Fixed points per matrix -> number of matrices
+        self.cycle_counts = Counter()  # Cycles per matrix -> number of matrices
+        self.longest_cycles = Counter()  # Longest cycle per matrix -> number of matrices
+        self.cycle_lengths = Counter()  # Cycle length -> number of cycles over all matrices
+        self.similarities = Counter()  # Equal cells with the neighbouring password -> number of pairs
+        self.first_values = Counter()  # Value of the first cell -> number of matrices
+
+    def add(self, password: bytes, matrix, neighbour_matrix=None) -> None:
+        """
+        Adds the analysis of one derived matrix.
+
+        Args:
+            password (bytes): The password the matrix was derived from.
+            matrix: The derived matrix.
+            neighbour_matrix: The matrix of the neighbouring password (default None).
+        """
+        result = analyze_matrix(matrix)
+        self.passwords += 1
+        self.fixed_points[result['fixed_points']] += 1
+        self.first_values[matrix[0]] += 1
+        if neighbour_matrix is not None:
+            self.similarities[similarity(matrix, neighbour_matrix)] += 1
+
+        if not result['valid']:
+            self.invalid += 1
+            if len(self.invalid_samples) < 10:
+                self.invalid_samples.append(bytes(password).hex())
+            return
+
+        cycles = result['cycles']
+        self.cycle_counts[len(cycles)] += 1
+        self.longest_cycles[cycles[-1]] += 1
+        self.cycle_lengths.update(cycles)
+
+    def merge(self, other: 'AnalysisReport') -> None:
+        """
+        Adds the counters of another report to this one.
+
+        Args:
+            other (AnalysisReport): The partial report to add.
+        """
+        self.passwords += other.passwords
+        self.invalid += other.invalid
+        self.invalid_samples.extend(other.invalid_samples[:10 - len(self.invalid_samples)])
+        for name in ('fixed_points', 'cycle_counts', 'longest_cycles', 'cycle_lengths', 'similarities', 'first_values'):
+            getattr(self, name).update(getattr(other, name))
+
+    @staticmethod
+    def _mean(distribution: Counter) -> float:
+        """ Returns the mean of a value -> occurrences distribution. """
+        total = sum(distribution.values())
+        return sum(value * count for value, count in distribution.items()) / total if total else 0.0
+
+    def summary(self) -> dict:
+        """
+        Returns the headline figures of the report.
+
+        A random permutation of 256 values has on average 1 fixed point, about 6.1
+        cycles and a longest cycle of about 160, and two random ones share 1 cell.
+
+        Returns:
+            dict: passwords, invalid, the mean of every distribution and the throughput.
+        """
+        return {
+            'passwords': self.passwords,
+            'invalid': self.invalid,
+            'mean_fixed_points': self._mean(self.fixed_points),
+            'mean_cycles': self._mean(self.cycle_counts),
+            'mean_longest_cycle': self._mean(self.longest_cycles),
+            'mean_neighbour_similarity': self._mean(self.similarities),
+            'distinct_first_values': len(self.first_values),
+            'elapsed': self.elapsed,
+            'passwords_per_s': self.passwords / self.elapsed if self.elapsed > 0 else 0.0,
+        }
+
+    def as_dict(self) -> dict:
+        """ Returns the summary and every distribution as JSON-serializable data. """
+        distributions = {
+            name: {str(value): count for value, count in sorted(getattr(self, name).items())}
+            for name in ('fixed_points', 'cycle_counts', 'longest_cycles', 'cycle_lengths', 'similarities', 'first_values')
+        }
+        return {'summary': self.summary(), 'invalid_samples': self.invalid_samples, 'distributions': distributions}
+
+    def __str__(self) -> str:
+        summary = self.summary()
+        return '\n'.join([
+            f'Passwords analyzed: {summary["passwords"]} in {summary["elapsed"]:.2f}s ({summary["passwords_per_s"]:.0f}/s)',
+            f'Invalid matrices:   {summary["invalid"]}' + (f' (e.g. {", ".join(self.invalid_samples[:3])})' if self.invalid else ''),
+            f'Fixed points:       mean {summary["mean_fixed_points"]:.3f} (random permutation: 1)',
+            f'Cycles:             mean {summary["mean_cycles"]:.3f} (random permutation: ~6.1)',
+            f'Longest cycle:      mean {summary["mean_longest_cycle"]:.1f} (random permutation: ~160)',
+            f'Neighbour overlap:  mean {summary["mean_neighbour_similarity"]:.3f} equal cells (random pair: 1)',
+            f'First cell values:  {summary["distinct_first_values"]} distinct out of 256',
+        ])
+
+
+def _analyze_chunk(passwords: list, neighbour_position: int | None) -> AnalysisReport:
+    """
+    Derives and analyzes a chunk of passwords as one batch, runs in a worker process.
+
+    Args:
+        passwords (list): The passwords of the chunk.
+        neighbour_position (int | None): Byte flipped to build the neighbouring password, None skips it.
+
+    Returns:
+        AnalysisReport: The partial report of the chunk.
+    """
+    report = AnalysisReport()
+    matrices = derive_matrices(passwords)  # One batch for the whole chunk
+    neighbours = [None] * len(passwords)
+    if neighbour_position is not None:
+        flipped = [k for k, password in enumerate(passwords) if password]
+        for k, matrix in zip(flipped, derive_matrices([neighbour(passwords[k], neighbour_position) for k in flipped])):
+            neighbours[k] = matrix
+    for password, matrix, neighbour_matrix in zip(passwords, matrices, neighbours):
+        report.add(password, matrix, neighbour_matrix)
+    return report
+
+
+def _analyze_chunk_task(task: tuple) -> AnalysisReport:
+    """ Unpacks an imap task for _analyze_chunk. """
+    return _analyze_chunk(*task)
+
+
+def _chunks(passwords, size: int):
+    """ Yields lists of at most size passwords, the input is consumed lazily. """
+    iterator = iter(passwords)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def random_passwords(count: int, length: int = 16):
+    """
+    Yields random passwords.
+
+    Args:
+        count (int): Number of passwords.
+        length (int): Length of every password in bytes (default 16).
+    """
+    for _ in range(0, count):
+        yield urandom(length)
+
+
+def analyze(passwords, workers: int = None, chunk_size: int = 256, neighbour_position: int | None = 0) -> AnalysisReport:
+    """
+    Derives the matrices of many passwords in parallel and aggregates their statistics.
+
+    The passwords are consumed lazily in chunks, so a generator of millions of them
+    never needs to fit in memory, and only the small partial reports travel back
+    from the workers.
+
+    Args:
+        passwords: Any iterable of bytes passwords.
+        workers (int): Number of worker processes, 1 runs in this process (default the number of CPUs).
+        chunk_size (int): Passwords per task (default 256).
+        neighbour_position (int | None): Byte flipped to build the neighbouring password, None skips
+            the similarity analysis and halves the work (default 0).
+
+    Returns:
+        AnalysisReport: The aggregated report.
+    """
+    workers = workers or cpu_count()
+    report = AnalysisReport()
+    start_time = default_timer()
+
+    if workers == 1:
+        for chunk in _chunks(passwords, chunk_size):
+            report.merge(_analyze_chunk(chunk, neighbour_position))
+    else:
+        tasks = ((chunk, neighbour_position) for chunk in _chunks(passwords, chunk_size))
+        with Pool(workers) as pool:
+            for partial in pool.imap_unordered(_analyze_chunk_task, tasks):
+                report.merge(partial)
+
+    report.elapsed = default_timer() - start_time
+    return report
+
+
+def main(argv: list = None) -> int:
+    """
+    Command line entry point: python -m analyzeSME [--count N] [--length L] [--workers W]
+
+    Args:
+        argv (list): Arguments to parse (default sys.argv[1:]).
+
+    Returns:
+        int: 1 if a derived matrix was not a permutation, 0 otherwise.
+    """
+    parser = ArgumentParser(prog='python -m analyzeSME', description='Derive and analyze the SME256 matrices of many random passwords.')
+    parser.add_argument('-n', '--count', type=int, default=10000, help='number of random passwords (default 10000)')
+    parser.add_argument('-l', '--length', type=int, default=16, help='password length in bytes (default 16)')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='worker processes (default the number of CPUs)')
+    parser.add_argument('--chunk-size', type=int, default=256, help='passwords per task (default 256)')
+    parser.add_argument('--no-neighbours', action='store_true', help='skip the neighbouring password similarity')
+    parser.add_argument('-o', '--output', help='write the report as JSON to this file')
+    args = parser.parse_args(argv)
+
+    report = analyze(
+        random_passwords(args.count, args.length), args.workers, args.chunk_size,
+        None if args.no_neighbours else 0,
+    )
+    print(report)
+    if args.output:
+        with open(args.output, 'w') as file:
+            dump(report.as_dict(), file, indent=2)
+    return 1 if report.invalid else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,449 @@
+#Copyright 2025 yo525
+#SPDX-License-Identifier: Apache-2.0
+
+#Import necessary modules
+from SME import SME256BF, SME256dBF, CHUNK_SIZE, is_dependent
+
+import asyncio
+from collections import deque
+
+# SME256dBF pieces at least this big are processed in an executor instead of the event loop
+OFFLOAD_THRESHOLD = 1 << 12
+
+# Bytes waiting to be encrypted above which the protocol adapter asks the application to pause writing
+WRITE_HIGH_WATER = 1 << 18
+
+
+class _Transformer:
+    """
+    Encrypts or decrypts the successive pieces of one direction of a stream.
+
+    SME256BF pieces are processed inline, they only cost a table lookup. SME256dBF
+    keeps its evolving matrix in an incremental context and pieces of at least
+    OFFLOAD_THRESHOLD bytes are processed in an executor so the loop is not blocked.
+    """
+
+    def __init__(self, sme: SME256BF | SME256dBF, mode: str, executor=None) -> None:
+        """
+        Initialize the transformer.
+
+        Args:
+            sme (SME256BF | SME256dBF): The derived key.
+            mode (str): Either 'encrypt' or 'decrypt'.
+            executor: Executor used for heavy pieces (default the loop default executor).
+        """
+        if mode not in ('encrypt', 'decrypt'):
+            raise ValueError(f"unknown mode: {mode!r}, expected 'encrypt' or 'decrypt'")
+        self.executor = executor
+        self.heavy = is_dependent(sme)
+        if self.heavy:
+            context = sme.encryptor() if mode == 'encrypt' else sme.decryptor()
+            self.transform = context.update
+        else:
+            self.transform = sme.encrypt if mode == 'encrypt' else sme.decrypt
+
+    def offloaded(self, data) -> bool:
+        """ Returns whether a piece is processed outside the event loop. """
+        return self.heavy and len(data) >= OFFLOAD_THRESHOLD
+
+    async def __call__(self, data: bytes) -> bytes:
+        """
+        Processes the next piece of the stream.
+
+        Args:
+            data (bytes): The piece to process.
+
+        Returns:
+            bytes: The processed piece.
+        """
+        if self.offloaded(data):
+            return await asyncio.get_running_loop().run_in_executor(self.executor, self.transform, bytes(data))
+        return self.transform(bytes(data))
+
+
+class EncryptedStreamReader:
+    """
+    asyncio.StreamReader compatible wrapper that decrypts what it reads.
+
+    SME256 keeps the length of the data, so reading n ciphertext bytes gives n plaintext bytes.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, sme: SME256BF | SME256dBF, executor=None) -> None:
+        """
+        Initialize the wrapper.
+
+        Args:
+            reader (asyncio.StreamReader): The reader of the ciphertext.
+            sme (SME256BF | SME256dBF): The derived key.
+            executor: Executor used for heavy SME256dBF pieces (default the loop default executor).
+        """
+        self.reader = reader
+        self._decrypt = _Transformer(sme, 'decrypt', executor)
+        self._lock = asyncio.Lock()  # Pieces must be decrypted in stream order
+
+    async def read(self, n: int = -1) -> bytes:
+        """ Reads up to n bytes (until EOF if n is -1) and decrypts them. """
+        async with self._lock:
+            return await self._decrypt(await self.reader.read(n))
+
+    async def readexactly(self, n: int) -> bytes:
+        """ Reads exactly n bytes and decrypts them, raises asyncio.IncompleteReadError on EOF. """
+        async with self._lock:
+            try:
+                data = await self.reader.readexactly(n)
+            except asyncio.IncompleteReadError as e:
+                # The partial data was consumed from the stream, keep the state in sync
+                raise asyncio.IncompleteReadError(await self._decrypt(e.partial), e.expected)
+            return await self._decrypt(data)
+
+    def at_eof(self) -> bool:
+        """ Returns True when the underlying reader reached EOF and its buffer is empty. """
+        return self.reader.at_eof()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> bytes:
+        data = await self.read(CHUNK_SIZE)
+        if not data:
+            raise StopAsyncIteration
+        return data
+
+
+class EncryptedStreamWriter:
+    """
+    asyncio.StreamWriter compatible wrapper that encrypts what it writes.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter, sme: SME256BF | SME256dBF, executor=None) -> None:
+        """
+        Initialize the wrapper.
+
+        Args:
+            writer (asyncio.StreamWriter): The writer of the ciphertext.
+            sme (SME256BF | SME256dBF): The derived key.
+            executor: Executor used for heavy SME256dBF pieces (default the loop default executor).
+        """
+        self.writer = writer
+        self._encrypt = _Transformer(sme, 'encrypt', executor)
+        self._lock = asyncio.Lock()  # Pieces must be encrypted in stream order
+
+    @property
+    def transport(self) -> asyncio.BaseTransport:
+        return self.writer.transport
+
+    def write(self, data: bytes) -> None:
+        """
+        Encrypts and writes data inline, like StreamWriter.write.
+
+        Large SME256dBF writes block the loop while they are encrypted, use send() for them.
+        """
+        if self._lock.locked():
+            print("Error26: write() called while send() is encrypting, the stream order would be lost.")
+            raise RuntimeError("write() called while send() is in progress")
+        self.writer.write(self._encrypt.transform(bytes(data)))
+
+    def writelines(self, data) -> None:
+        """ Encrypts and writes every piece of an iterable. """
+        for piece in data:
+            self.write(piece)
+
+    async def send(self, data: bytes) -> None:
+        """
+        Encrypts data, offloading heavy SME256dBF work, writes it and waits for the buffer to drain.
+        """
+        async with self._lock:
+            self.writer.write(await self._encrypt(data))
+            await self.writer.drain()
+
+    async def drain(self) -> None:
+        await self.writer.drain()
+
+    def can_write_eof(self) -> bool:
+        return self.writer.can_write_eof()
+
+    def write_eof(self) -> None:
+        self.writer.write_eof()
+
+    def close(self) -> None:
+        self.writer.close()
+
+    def is_closing(self) -> bool:
+        return self.writer.is_closing()
+
+    async def wait_closed(self) -> None:
+        await self.writer.wait_closed()
+
+    def get_extra_info(self, name: str, default=None):
+        return self.writer.get_extra_info(name, default)
+
+
+def wrap_streams(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, sme: SME256BF | SME256dBF, executor=None) -> tuple:
+    """
+    Wraps both directions of a connection.
+
+    Each direction keeps its own SME256dBF state, both start from the key.
+
+    Returns:
+        tuple: The (EncryptedStreamReader, EncryptedStreamWriter) pair.
+    """
+    return EncryptedStreamReader(reader, sme, executor), EncryptedStreamWriter(writer, sme, executor)
+
+
+async def open_connection(host: str = None, port: int = None, *, sme: SME256BF | SME256dBF, executor=None, **kwargs) -> tuple:
+    """
+    Same as asyncio.open_connection, returns encrypted reader and writer wrappers.
+    """
+    reader, writer = await asyncio.open_connection(host, port, **kwargs)
+    return wrap_streams(reader, writer, sme, executor)
+
+
+async def start_server(client_connected_cb, host: str = None, port: int = None, *, sme: SME256BF | SME256dBF, executor=None, **kwargs) -> asyncio.AbstractServer:
+    """
+    Same as asyncio.start_server, the callback receives encrypted reader and writer wrappers.
+    """
+    async def callback(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        result = client_connected_cb(*wrap_streams(reader, writer, sme, executor))
+        if asyncio.iscoroutine(result):
+            await result
+
+    return await asyncio.start_server(callback, host, port, **kwargs)
+
+
+class _OrderedPipe:
+    """
+    Runs the pieces of one direction through a transformer and delivers them in order.
+
+    Light pieces are delivered at once. As soon as a piece is offloaded every following
+    piece is queued behind it, on_busy is called when the queue starts and on_idle when
+    it is empty again, which lets the owner apply backpressure. If a piece fails the
+    stream state is lost: the queue is dropped, on_error receives the exception and
+    every later submit raises it again.
+    """
+
+    def __init__(self, transformer: _Transformer, deliver, on_busy, on_idle, on_error) -> None:
+        self.transformer = transformer
+        self.deliver = deliver
+        self.on_busy = on_busy
+        self.on_idle = on_idle
+        self.on_error = on_error
+        self.queue = deque()
+        self.queued = 0
+        self.task = None
+        self.error = None
+
+    @property
+    def busy(self) -> bool:
+        return self.task is not None
+
+    def submit(self, data: bytes) -> None:
+        """ Processes a piece, inline when nothing is pending and the piece is light. """
+        if self.error is not None:
+            raise self.error
+        if not self.busy and not self.transformer.offloaded(data):
+            self.deliver(self.transformer.transform(bytes(data)))
+            return
+
+        self.queue.append(bytes(data))
+        self.queued += len(data)
+        if not self.busy:
+            self.on_busy()
+            self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        try:
+            while self.queue:
+                data = self.queue.popleft()
+                self.deliver(await self.transformer(data))
+                self.queued -= len(data)
+        except Exception as e:  # Nothing awaits the task, hand the failure to the owner
+            self.error = e
+            self.queue.clear()
+            self.queued = 0
+            self.task = None
+            self.on_error(e)
+            return
+        self.task = None
+        self.on_idle()
+
+
+class EncryptedTransport(asyncio.Transport):
+    """
+    Transport handed to the application protocol by EncryptedProtocol, encrypts every write.
+    """
+
+    def __init__(self, transport: asyncio.Transport, adapter: 'EncryptedProtocol') -> None:
+        super().__init__()
+        self.transport = transport
+        self.adapter = adapter
+        self._close_pending = False
+        self._eof_pending = False
+
+    def write(self, data: bytes) -> None:
+        self.adapter.outgoing.submit(data)
+        if self.adapter.outgoing.queued > WRITE_HIGH_WATER:
+            self.adapter.pause_application()
+
+    def writelines(self, list_of_data) -> None:
+        for data in list_of_data:
+            self.write(data)
+
+    def can_write_eof(self) -> bool:
+        return self.transport.can_write_eof()
+
+    def write_eof(self) -> None:
+        if self.adapter.outgoing.busy:
+            self._eof_pending = True  # Sent once every queued piece was written
+        else:
+            self.transport.write_eof()
+
+    def close(self) -> None:
+        if self.adapter.outgoing.busy:
+            self._close_pending = True  # Closed once every queued piece was written
+        else:
+            self.transport.close()
+
+    def abort(self) -> None:
+        self.transport.abort()
+
+    def is_closing(self) -> bool:
+        return self._close_pending or self.transport.is_closing()
+
+    def get_extra_info(self, name: str, default=None):
+        return self.transport.get_extra_info(name, default)
+
+    def pause_reading(self) -> None:
+        self.adapter.application_paused_reading = True
+        self.transport.pause_reading()
+
+    def resume_reading(self) -> None:
+        self.adapter.application_paused_reading = False
+        if not self.adapter.incoming.busy:
+            self.transport.resume_reading()
+
+    def is_reading(self) -> bool:
+        return self.transport.is_reading()
+
+    def set_write_buffer_limits(self, high: int = None, low: int = None) -> None:
+        self.transport.set_write_buffer_limits(high, low)
+
+    def get_write_buffer_size(self) -> int:
+        return self.transport.get_write_buffer_size() + self.adapter.outgoing.queued
+
+    def set_protocol(self, protocol: asyncio.BaseProtocol) -> None:
+        self.adapter.protocol = protocol
+
+    def get_protocol(self) -> asyncio.BaseProtocol:
+        return self.adapter.protocol
+
+
+class EncryptedProtocol(asyncio.Protocol):
+    """
+    Protocol adapter that runs an application protocol over an encrypted connection.
+
+    Incoming data is decrypted before reaching the application protocol and its
+    writes are encrypted before reaching the socket. While heavy SME256dBF pieces
+    are processed in the executor, reading from the socket is paused and the
+    application is asked to pause writing when too much data is waiting.
+
+    Usage: loop.create_connection(lambda: EncryptedProtocol(MyProtocol(), sme), host, port)
+    """
+
+    def __init__(self, protocol: asyncio.Protocol, sme: SME256BF | SME256dBF, executor=None) -> None:
+        """
+        Initialize the adapter.
+
+        Args:
+            protocol (asyncio.Protocol): The application protocol.
+            sme (SME256BF | SME256dBF): The derived key.
+            executor: Executor used for heavy SME256dBF pieces (default the loop default executor).
+        """
+        self.protocol = protocol
+        self.sme = sme
+        self.executor = executor
+        self.transport = None
+        self.application_paused_reading = False
+        self._socket_paused_writing = False
+        self._application_paused_writing = False
+        self._eof_pending = False
+        self._lost_pending = None
+        self._failure = None
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self.transport = EncryptedTransport(transport, self)
+        self.incoming = _OrderedPipe(
+            _Transformer(self.sme, 'decrypt', self.executor), self.protocol.data_received,
+            transport.pause_reading, self._incoming_idle, self._pipe_failed
+        )
+        self.outgoing = _OrderedPipe(
+            _Transformer(self.sme, 'encrypt', self.executor), transport.write,
+            lambda: None, self._outgoing_idle, self._pipe_failed
+        )
+        self.protocol.connection_made(self.transport)
+
+    def data_received(self, data: bytes) -> None:
+        self.incoming.submit(data)
+
+    def eof_received(self):
+        if self.incoming.busy:
+            self._eof_pending = True  # Delivered after the queued data, keep the transport open meanwhile
+            return True
+        return self.protocol.eof_received()
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        if self.incoming.busy:
+            self._lost_pending = (exc,)  # Delivered after the queued data
+            return
+        self.protocol.connection_lost(self._failure or exc)
+
+    def pause_writing(self) -> None:
+        self._socket_paused_writing = True
+        self.pause_application()
+
+    def resume_writing(self) -> None:
+        self._socket_paused_writing = False
+        if self.outgoing.queued <= WRITE_HIGH_WATER:
+            self.resume_application()
+
+    def pause_application(self) -> None:
+        """ Asks the application protocol to stop writing. """
+        if not self._application_paused_writing:
+            self._application_paused_writing = True
+            self.protocol.pause_writing()
+
+    def resume_application(self) -> None:
+        """ Lets the application protocol write again. """
+        if self._application_paused_writing:
+            self._application_paused_writing = False
+            self.protocol.resume_writing()
+
+    def _pipe_failed(self, exc: Exception) -> None:
+        """ A piece could not be processed, the stream cannot continue: abort and report it to the application. """
+        if self._failure is not None:
+            return
+        self._failure = exc
+        if self._lost_pending is None:
+            self.transport.transport.abort()  # connection_lost follows and receives the exception
+        elif not self.incoming.busy:  # The socket is already gone, abort would not call connection_lost again
+            self._lost_pending = None
+            self.protocol.connection_lost(exc)
+
+    def _incoming_idle(self) -> None:
+        if self._lost_pending is not None:
+            self.protocol.connection_lost(self._failure or self._lost_pending[0])
+            return
+        if self._eof_pending:
+            self._eof_pending = False
+            if not self.protocol.eof_received():
+                self.transport.transport.close()
+            return
+        if not self.application_paused_reading and not self.transport.transport.is_closing():
+            self.transport.transport.resume_reading()
+
+    def _outgoing_idle(self) -> None:
+        if not self._socket_paused_writing:
+            self.resume_application()
+        if self.transport._eof_pending:
+            self.transport.transport.write_eof()
+        if self.transport._close_pending:
+            self.transport.transport.close()
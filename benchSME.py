@@ -0,0 +1,262 @@
+#Copyright 2025 yo525
+#SPDX-License-Identifier: Apache-2.0
+
+#Import necessary modules
+from SME import SME256, SME256BF, SME256dBF, SME256BFKey, key_cache
+
+from argparse import ArgumentParser
+from json import dump, load
+from os import urandom
+from pickle import dumps
+from platform import platform, python_version
+from statistics import mean, quantiles
+from time import perf_counter, strftime
+from tracemalloc import start, stop, take_snapshot, is_tracing
+import sys
+
+# Sizes used by the default suite
+PASSWORD_LENGTHS = (8, 16, 32, 64)
+BF_SIZES = (1 << 10, 1 << 16, 1 << 20, 1 << 24)
+DBF_SIZES = (1 << 8, 1 << 12, 1 << 14)
+# Keys held at once by the memory cases
+FOOTPRINT_KEYS = 2000
+
+
+def measure(function, repeat: int = 20, warmup: int = 3, number: int = 1) -> list:
+    """
+    Times a function call.
+
+    Args:
+        function: The callable to time, called without arguments.
+        repeat (int): Number of measured samples (default 20).
+        warmup (int): Number of calls run and discarded first (default 3).
+        number (int): Calls per sample, the sample is divided by it (default 1).
+
+    Returns:
+        list: The time of one call, in seconds, for every sample.
+    """
+    for _ in range(0, warmup):
+        function()
+
+    samples = []
+    for _ in range(0, repeat):
+        start_time = perf_counter()
+        for _ in range(0, number):
+            function()
+        samples.append((perf_counter() - start_time) / number)
+    return samples
+
+
+def summarize(samples: list, nbytes: int = None, warmup: int = 0) -> dict:
+    """
+    Computes the statistics of a list of samples.
+
+    Args:
+        samples (list): Seconds per call.
+        nbytes (int): Bytes processed per call, enables the throughput (default None).
+        warmup (int): Number of warmup calls, only reported (default 0).
+
+    Returns:
+        dict: min, max, mean, p50, p90, p99 (seconds), samples, warmup and mb_per_s.
+    """
+    if len(samples) > 1:
+        cuts = quantiles(samples, n=100, method='inclusive')  # True percentiles, not a running average
+        p50, p90, p99 = cuts[49], cuts[89], cuts[98]
+    else:
+        p50 = p90 = p99 = samples[0]
+
+    result = {
+        'samples': len(samples), 'warmup': warmup,
+        'min': min(samples), 'max': max(samples), 'mean': mean(samples),
+        'p50': p50, 'p90': p90, 'p99': p99,
+    }
+    if nbytes:
+        result['bytes'] = nbytes
+        result['mb_per_s'] = nbytes / p50 / 1e6
+    return result
+
+
+def footprint(factory, count: int = FOOTPRINT_KEYS) -> float:
+    """
+    Measures the memory held by keys, as a cache of many tenant keys would hold them.
+
+    Args:
+        factory: Callable building one key from a password.
+        count (int): Number of keys kept alive together (default FOOTPRINT_KEYS).
+
+    Returns:
+        float: The bytes allocated per key.
+    """
+    passwords = [urandom(16) for _ in range(0, count)]
+    tracing = is_tracing()
+    if not tracing:
+        start()
+    before = sum(stat.size for stat in take_snapshot().statistics('filename'))
+    keys = [factory(password) for password in passwords]
+    after = sum(stat.size for stat in take_snapshot().statistics('filename'))
+    if not tracing:
+        stop()
+    return (after - before - sys.getsizeof(keys)) / len(keys)
+
+
+def memory_cases(count: int = FOOTPRINT_KEYS) -> dict:
+    """
+    Compares the per-key memory and pickle size of full and compact keys.
+
+    Args:
+        count (int): Number of keys kept alive together (default FOOTPRINT_KEYS).
+
+    Returns:
+        dict: {case name: {'bytes_per_key': float, 'pickle_bytes': int}}.
+    """
+    key_cache.clear()  # Cached matrices would be counted by the first case only
+    password = urandom(16)
+    cases = {
+        'memory/SME256BF': (lambda p: SME256BF(p, warnings=False, cache=False), SME256BF(password, warnings=False, cache=False)),
+        'memory/SME256BFKey': (lambda p: SME256BFKey.from_password(p, cache=False), SME256BFKey.from_password(password, cache=False)),
+    }
+    return {
+        name: {'bytes_per_key': footprint(factory, count), 'pickle_bytes': len(dumps(sample))}
+        for name, (factory, sample) in cases.items()
+    }
+
+
+def _primitive_cases(password: bytes) -> dict:
+    """ Builds the callables timing each primitive of the key schedule. """
+    sme = SME256(password, warnings=False, cache=False)
+    index = sme.matrix[0]
+    return {
+        'primitive/rotate_row': lambda: sme.rotate_row(index % 16, 1),
+        'primitive/rotate_column': lambda: sme.rotate_column(index % 16, 1),
+        'primitive/rotate_row_column': lambda: sme.rotate_row_column(255),
+        'primitive/bring_front': lambda: sme.bring_front(255),
+        'primitive/column_select_scrambler_even': lambda: sme.column_select_scrambler_even(index & 0xFE),
+        'primitive/column_select_scrambler_uneven': lambda: sme.column_select_scrambler_uneven(index | 0x01),
+    }
+
+
+def run_suite(repeat: int = 20, warmup: int = 3, quick: bool = False, progress: bool = True) -> dict:
+    """
+    Runs the whole benchmark suite.
+
+    Args:
+        repeat (int): Samples per case (default 20).
+        warmup (int): Discarded calls per case (default 3).
+        quick (bool): Skip the largest payload of every group (default False).
+        progress (bool): Print each case as it completes (default True).
+
+    Returns:
+        dict: {'meta': {...}, 'results': {case name: statistics}, 'memory': memory_cases()}.
+    """
+    password = urandom(32)
+    bf = SME256BF(password, warnings=False)
+    dbf = SME256dBF(password, warnings=False)
+    bf_sizes = BF_SIZES[:-1] if quick else BF_SIZES
+    dbf_sizes = DBF_SIZES[:-1] if quick else DBF_SIZES
+    cases = []  # (name, callable, bytes per call, calls per sample, samples)
+
+    for length in PASSWORD_LENGTHS:
+        key = urandom(length)
+        cases.append((f'key_schedule/{length}B', lambda key=key: SME256(key, warnings=False, cache=False), None, 1, repeat))
+
+    for size in bf_sizes:
+        plaintext = urandom(size)
+        ciphertext = bf.encrypt(plaintext)
+        number = max(1, (1 << 20) // size)  # Keep every sample around a mebibyte
+        cases.append((f'bf_encrypt/{size}B', lambda p=plaintext: bf.encrypt(p), size, number, repeat))
+        cases.append((f'bf_decrypt/{size}B', lambda c=ciphertext: bf.decrypt(c), size, number, repeat))
+
+    for size in dbf_sizes:
+        plaintext = urandom(size)
+        ciphertext = dbf.encrypt(plaintext)
+        samples = max(3, repeat // 4) if size > 1 << 12 else repeat  # dBF runs at hundreds of KB/s
+        cases.append((f'dbf_encrypt/{size}B', lambda p=plaintext: dbf.encrypt(p), size, 1, samples))
+        cases.append((f'dbf_decrypt/{size}B', lambda c=ciphertext: dbf.decrypt(c), size, 1, samples))
+
+    for name, function in _primitive_cases(password).items():
+        cases.append((name, function, None, 10, repeat))
+
+    results = {}
+    for name, function, nbytes, number, samples in cases:
+        results[name] = summarize(measure(function, samples, warmup, number), nbytes, warmup)
+        if progress:
+            print(format_result(name, results[name]), file=sys.stderr)
+
+    memory = memory_cases()
+    if progress:
+        for name, result in memory.items():
+            print(f'{name:45s} {result["bytes_per_key"]:10.0f} B/key  pickle {result["pickle_bytes"]} B', file=sys.stderr)
+
+    meta = {
+        'python': python_version(), 'platform': platform(), 'backend': SME256.backend,
+        'timestamp': strftime('%Y-%m-%dT%H:%M:%S'), 'repeat': repeat, 'warmup': warmup,
+    }
+    return {'meta': meta, 'results': results, 'memory': memory}
+
+
+def format_result(name: str, result: dict) -> str:
+    """ Formats one case as a single report line. """
+    line = f'{name:45s} p50 {result["p50"] * 1e6:12.1f}us  p90 {result["p90"] * 1e6:12.1f}us  p99 {result["p99"] * 1e6:12.1f}us'
+    if 'mb_per_s' in result:
+        line += f'  {result["mb_per_s"]:10.3f} MB/s'
+    return line
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.10) -> list:
+    """
+    Compares a run with a saved baseline.
+
+    Args:
+        current (dict): The results of run_suite.
+        baseline (dict): Previously saved results of run_suite.
+        tolerance (float): Allowed relative slowdown of the median (default 0.10).
+
+    Returns:
+        list: One (name, baseline p50, current p50, ratio) tuple per regressed case.
+    """
+    regressions = []
+    for name, result in current['results'].items():
+        reference = baseline.get('results', {}).get(name)
+        if reference is None:
+            continue
+        ratio = result['p50'] / reference['p50']
+        if ratio > 1 + tolerance:
+            regressions.append((name, reference['p50'], result['p50'], ratio))
+    return regressions
+
+
+def main(argv: list = None) -> int:
+    """
+    Command line entry point: python -m benchSME [--output FILE] [--baseline FILE]
+
+    Args:
+        argv (list): Arguments to parse (default sys.argv[1:]).
+
+    Returns:
+        int: 1 if a regression against the baseline was found, 0 otherwise.
+    """
+    parser = ArgumentParser(prog='python -m benchSME', description='Benchmark the SME256 key schedule, modes and primitives.')
+    parser.add_argument('-o', '--output', help='write the results as JSON to this file')
+    parser.add_argument('-b', '--baseline', help='JSON results to compare against')
+    parser.add_argument('-t', '--tolerance', type=float, default=0.10, help='allowed relative slowdown of the median (default 0.10)')
+    parser.add_argument('-r', '--repeat', type=int, default=20, help='samples per case (default 20)')
+    parser.add_argument('-w', '--warmup', type=int, default=3, help='discarded calls per case (default 3)')
+    parser.add_argument('--quick', action='store_true', help='skip the largest payloads')
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.repeat, args.warmup, args.quick)
+    if args.output:
+        with open(args.output, 'w') as file:
+            dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, load(file), args.tolerance)
+        for name, before, after, ratio in regressions:
+            print(f'REGRESSION {name}: p50 {before * 1e6:.1f}us -> {after * 1e6:.1f}us (x{ratio:.2f})', file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
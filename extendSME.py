@@ -5,6 +5,9 @@
 from SME import SME256 as sme256
 from SME import SME256dBF as sme256dbf
 from SME import SME256BF as sme256bf
+from SME import DependentByteFlow, ScheduleTrace, schedule_tables
+from benchSME import summarize
+from analyzeSME import analyze_matrix
 
 from time import sleep
 from timeit import default_timer
@@ -19,6 +22,153 @@ try:
 except:
     pass
 
+def _move_frames(matrix: tuple, event: tuple, step: str) -> list:
+    """
+    Expands a key schedule phase into one frame per row/column move or column conversion.
+
+    The moves come from the primitives of SME256 themselves, run on a scratch instance.
+
+    Args:
+        matrix (tuple): The matrix before the phase.
+        event (tuple): The decoded trace event of the phase.
+        step (str): Step counter shown in the subtitle.
+
+    Returns:
+        list: The (matrix, highlighted values, color, subtitle) frames.
+    """
+    simulator = sme256.__new__(sme256)
+    simulator.matrix = list(matrix)
+    operation, argument = event
+    frames = []
+
+    if operation == 'rotate_row_column':
+        def recorder(method, label: str):
+            def record(index: int, pos: int) -> list:
+                moved = method(index, pos)
+                frames.append((list(simulator.matrix), moved, 'blue', f'{step}\nShifting {label}: {str(index).zfill(3)} --> {argument}'))
+                return moved
+            return record
+
+        simulator.rotate_row = recorder(simulator.rotate_row, 'row')
+        simulator.rotate_column = recorder(simulator.rotate_column, 'column')
+        simulator.rotate_row_column(argument)
+
+    elif operation == 'bring_front':
+        row, column = (argument // 16) + 1, 16 if argument % 16 == 0 else (argument % 16) + 1
+        value = matrix[((row - 1) * 16) + column - 1]
+        frames.append((list(matrix), [value], 'red', f'{step}\nBringing front\nIndex value: {argument} --> {value}'))
+
+        def recorder(method):
+            def record(index: int, pos: int) -> list:
+                moved = method(index, pos)
+                frames.append((list(simulator.matrix), [value], 'red', f'{step}\nBringing front\nIndex value: {value}'))
+                return moved
+            return record
+
+        simulator.rotate_row = recorder(simulator.rotate_row)
+        simulator.rotate_column = recorder(simulator.rotate_column)
+        simulator.bring_front(argument)
+
+    elif operation == 'scramble':
+        support = ['   ' for _ in range(0, 256)]
+
+        def recorder(method):
+            def record(column_index: int, row_index: int) -> list:
+                nonlocal support
+                values = method(column_index, row_index)
+                support = support[16:] + values  # The converted column enters as the last row
+                frames.append((support, values, 'blue', f'{step}\nConverting column: {column_index} to row'))
+                return values
+            return record
+
+        simulator.column_to_row_even = recorder(simulator.column_to_row_even)
+        simulator.column_to_row_uneven = recorder(simulator.column_to_row_uneven)
+        if argument % 2 == 0:
+            simulator.column_select_scrambler_even(argument)
+        else:
+            simulator.column_select_scrambler_uneven(argument)
+
+    return frames
+
+
+def trace_frames(trace: ScheduleTrace, expand: bool = True):
+    """
+    Turns a recorded trace into display frames.
+
+    Args:
+        trace (ScheduleTrace): The trace to render.
+        expand (bool): One frame per row/column move instead of one per phase (default True).
+
+    Yields:
+        tuple: (matrix, highlighted values, color, subtitle).
+    """
+    steps = sum(1 for event in trace.events() if event[0] == 'step')
+    step = 0
+    previous = None
+    for event, matrix in trace.replay():
+        operation = event[0]
+        label = f'Step: {step} out of {steps}'
+        if operation == 'step':
+            step += 1
+        elif operation == 'begin':
+            yield list(matrix), [], 'blue', 'Starting matrix'
+        elif operation in ('encrypt', 'decrypt'):
+            yield list(matrix), [event[2] if operation == 'encrypt' else event[1]], 'red', f'{operation.capitalize()}ing: {event[1]} --> {event[2]}'
+        else:
+            if expand:
+                yield from _move_frames(previous, event, label)
+            yield list(matrix), [], 'blue', f'{label}\n{operation} {event[1]} done'
+        previous = matrix
+    yield list(previous) if previous is not None else [], [], 'blue', 'SME calculation finish'
+
+
+def trace_frame_count(trace: ScheduleTrace, expand: bool = True) -> int:
+    """
+    Counts the frames trace_frames will yield, without expanding any move.
+
+    Args:
+        trace (ScheduleTrace): The trace to render.
+        expand (bool): Count the expanded row/column moves (default True).
+
+    Returns:
+        int: The number of frames.
+    """
+    turns = schedule_tables().front_iterations
+    count = 1
+    for event in trace.events():
+        operation = event[0]
+        if operation in ('begin', 'encrypt', 'decrypt'):
+            count += 1
+        elif operation != 'step':
+            count += 1
+            if expand:
+                count += {'rotate_row_column': lambda n: 2 * n, 'bring_front': lambda v: 1 + 2 * turns[v], 'scramble': lambda index: 16}[operation](event[1])
+    return count
+
+
+def export_trace(trace: ScheduleTrace, path: str, expand: bool = False) -> int:
+    """
+    Writes the frames of a trace to a text file, one 16x16 grid per frame.
+
+    Args:
+        trace (ScheduleTrace): The trace to export.
+        path (str): Destination file.
+        expand (bool): One frame per row/column move instead of one per phase (default False).
+
+    Returns:
+        int: The number of frames written.
+    """
+    count = 0
+    with open(path, 'w') as file:
+        for matriz, val, color, subtitule in trace_frames(trace, expand):
+            file.write(f'# {subtitule.replace(chr(10), " | ")}\n')
+            for row in range(0, len(matriz), 16):
+                file.write(' '.join(str(value).rjust(3) for value in matriz[row:row + 16]) + '\n')
+            file.write('\n')
+            count += 1
+    return count
+
+
 class SME256(sme256):
     """
     Adds function to the main class SME256, adds a benchmarking/matrix-integrity-checker tool
@@ -33,41 +183,32 @@ class SME256(sme256):
             cycles (int): Number of benchmark iterations (default 1000).
         """
         print('Checking and benchmarking SME256 algorithm, this may take a while...\n')
-        fastest, slowest, median = 0, 0, 0
+        samples = []
 
         for i in range(1, cycles + 1):
             self.matrix = [i for i in range(0, 256)]  # Reset matrix for each cycle
             start_time = default_timer()  # Start timer
             self.calculate_table_from_values()  # Calculate values for benchmarking
             end_time = default_timer()  # End timer
-            total_time = end_time - start_time  # Calculate duration for this cycle
-            print(f'Round: {i} out of: {cycles} completed in: {total_time:.6f}s', end='\r')
-
-            # Update benchmarking metrics
-            if i == 1:
-                median += total_time
-                fastest = [total_time, i]
-                slowest = [total_time, i]
-            else:
-                median = (median + total_time) / 2  # Update median estimate
-                if total_time < fastest[0]:  # Update fastest time
-                    fastest = [total_time, i]
-                elif total_time > slowest[0]:  # Update slowest time
-                    slowest = [total_time, i]
+            samples.append(end_time - start_time)  # Duration for this cycle
+            print(f'Round: {i} out of: {cycles} completed in: {samples[-1]:.6f}s', end='\r')
+
+        result = summarize(samples)
+        fastest = samples.index(result['min']) + 1
+        slowest = samples.index(result['max']) + 1
 
         # Print benchmark results
         print('\n\n' + '*' * 47)
         print('*              BENCHMARK RESULTS              *')
         print('*' * 47 + '\n')
-        print(f' • End of the benchmarking, {cycles} repetitions --> Average time: {median:.6f}s')
-        print(f'   - Fastest: cycle {fastest[1]} --> {fastest[0]:.6f}s')
-        print(f'   - Slowest: cycle {slowest[1]} --> {slowest[0]:.6f}s')
+        print(f' • End of the benchmarking, {cycles} repetitions --> Median time: {result["p50"]:.6f}s (mean {result["mean"]:.6f}s)')
+        print(f'   - p90: {result["p90"]:.6f}s  p99: {result["p99"]:.6f}s')
+        print(f'   - Fastest: cycle {fastest} --> {result["min"]:.6f}s')
+        print(f'   - Slowest: cycle {slowest} --> {result["max"]:.6f}s')
+        print('   - Full suite (modes, payload sizes, primitives, JSON output): python -m benchSME')
         print('\n • cProfile results:\n')
         runctx('self.calculate_table_from_values()', locals=locals(), globals=globals())
 
-        conteo = {}  # Dictionary to count repetitions of items in the matrix
-        percentage = 0
-
         # Print results of the checks
         print('\n\n' + '*' * 47)
         print('*                CHECK RESULTS                *')
@@ -84,22 +225,22 @@ class SME256(sme256):
                 ]))
             print('\n'.join(tabla)+'\n')
 
-        # Count occurrences of items in the matrix and match against their indices
-        for i in self.matrix:
-            if self.matrix.count(i) > 1 and i not in conteo:
-                conteo[str(i)] = str(self.matrix.count(i))  # Count occurrences of repeated values
-            
-            if i == self.matrix.index(i):  # Check if value is in its original index
-                percentage += 1
+        result = analyze_matrix(self.matrix)  # Single pass over the matrix instead of count/index per item
+        percentage = result['fixed_points']
 
         # Print equality percentage and repeated items
         print(f' • Equality percentage: {((percentage / 256) * 100):.2f}% with {percentage} item(s) in their original index\n • Repeated items:')
         
-        for i in conteo:
-            print(f'\t- {i} appears {conteo[i]} times.')
+        for i, count in result['repeated'].items():
+            print(f'\t- {i} appears {count} times.')
         
-        if len(conteo) == 0:  # If no repeated items were found
+        if len(result['repeated']) == 0:  # If no repeated items were found
             print('\tNone')
+        for index, value in result['out_of_range']:
+            print(f' • Out of range: {value!r} at index {index}')
+        if result['valid']:
+            print(f' • Cycle structure: {len(result["cycles"])} cycle(s), longest {result["cycles"][-1]}')
+        print(' • Statistics over many passwords: python -m analyzeSME --count 100000')
 
 
     def imprimir(self, val: list = [], subtitule: str = None, color: str = 'blue', matriz: list = None) -> None:
@@ -140,144 +281,102 @@ class SME256(sme256):
             exit()
         pprint(self.imprimir())
 
-    def calculate_table_from_values_show(self, interval: int | float = 0.01, eliminar: bool = False, values: bytes = None) -> None:
+    def record_trace(self, values: bytes = None) -> ScheduleTrace:
         """
-        Shows the step-by-step calculation of the transformation process with delays.
+        Runs the key schedule from the identity matrix at full speed, recording its trace.
 
         Args:
-            interval (int | float): Time interval between each step display.
-            eliminar (bool): Whether to remove the live display after completion (default False).
             values (bytes): The values to use for transformation (default is self.password).
+
+        Returns:
+            ScheduleTrace: The recorded trace, the matrix of the instance is updated too.
+        """
+        if values is None:
+            values = self.password
+
+        trace = ScheduleTrace()
+        self.matrix = [i for i in range(0, 256)]  # Initialize matrix
+        try:
+            self.calculate_table_from_values_profiled(values, trace)
+        except Exception as e:
+            print("Error9 during show step-by-step calculation. Please check the transformation logic.")
+            raise e
+        return trace
+
+    def play(self, frames, total: int, interval: int | float = 0.01, eliminar: bool = False, fps: int = 30, duration: float = None) -> None:
+        """
+        Displays a sequence of frames in a live panel at a capped frame rate.
+
+        Frames are paced interval seconds apart (or spread over duration), but at most fps of
+        them are rendered per second, the others are skipped instead of slowing the replay down.
+
+        Args:
+            frames: Iterable of (matrix, highlighted values, color, subtitle) frames.
+            total (int): Number of frames, used for the pacing.
+            interval (int | float): Time between two frames (default 0.01).
+            eliminar (bool): Whether to remove the live display after completion (default False).
+            fps (int): Maximum rendered frames per second (default 30).
+            duration (float): Total replay time in seconds, overrides interval (default None).
         """
         if check_dependencie('rich') == None:
             print('!' * 64 + '   Reference')
             print('* WARNING: Need to install rich in order to use this function. *    in the')
             print('!' * 64 + ' documentation')
             exit()
-            
-        self.matrix = [i for i in range(0, 256)]  # Initialize matrix
-        if values is None:
-            values = self.password
-        
+
+        per_frame = duration / max(total, 1) if duration is not None else interval
+        frame_time = 1 / fps
         with Live(self.imprimir(), auto_refresh=False, transient=eliminar) as live:
-            step = 1
-            for i in values:
-                valor = self.matrix[self.matrix[0]] ^ i  # Current transformation value determined by XOR
-                for j in range(0, valor):  # Iterate through transformation steps
-                    try:
-                        if j % 2 == 0:
-                            # Update the display for row and column rotation
-                            live.update(self.imprimir(self.rotate_row(j % 16, 1), subtitule=f'Step: {step} out of {len(values)}\nShifting row: {str(j).zfill(3)} --> {str(valor)}'))
-                            live.refresh()
-                            sleep(interval)
-                            live.update(self.imprimir(self.rotate_column(j % 16, 1), subtitule=f'Step: {step} out of {len(values)}\nShifting column: {str(j).zfill(3)} --> {str(valor)}'))
-                            live.refresh()
-                            sleep(interval)
-                        else:
-                            # Update the display for column and row rotation
-                            live.update(self.imprimir(self.rotate_column(j % 16, 1), subtitule=f'Step: {step} out of {len(values)}\nShifting column: {str(j).zfill(3)} --> {str(valor)}'))
-                            live.refresh()
-                            sleep(interval)
-                            live.update(self.imprimir(self.rotate_row(j % 16, 1), subtitule=f'Step: {step} out of {len(values)}\nShifting row: {str(j).zfill(3)} --> {str(valor)}'))
-                            live.refresh()
-                            sleep(interval)
-                    except Exception as e:
-                        print("Error9 during show step-by-step calculation. Please check the transformation logic.")
-                        raise e
-                    
-                value_index = self.matrix[0] ^ i  # Get the new index value
-                if value_index % 16 == 0:
-                    column = 16
-                    row = (value_index // 16) + 1
-                else:
-                    column = (value_index % 16) + 1
-                    row = (value_index // 16) + 1
-                
-                # Determine the relationship for moving columns
-                relation = 15 if row == 0 else 15 if int(column / row) == 16 else column / row
-                column_moves = 0
-                column_previous = 0
-                value = self.matrix[((row - 1) * 16) + column - 1]
-                live.update(self.imprimir([value], color='red', subtitule=f'Step: {step} out of {len(values)}\nBringing front\nIndex value: {value_index} --> {value}'))
-                live.refresh()
-                sleep(interval + (interval * 0.2))
-                
-                while self.matrix[0] != value:  # Continue until the desired value is at the front
-                    column_moves += relation
-                    self.rotate_column(column - 1, 0 if row == 1 else 1)
-                    live.update(self.imprimir([value], color='red', subtitule=f'Step: {step} out of {len(values)}\nBringing front\nIndex value: {value}'))
-                    live.refresh()
-                    sleep(interval)
-                    row -= 0 if row == 1 else 1
-                    
-                    self.rotate_row(row - 1, int(column_moves) - int(column_previous) if column != 1 and column - int(column_moves) - int(column_previous) >= 1 else 0 if column == 1 else column - 1)
-                    live.update(self.imprimir([value], color='red', subtitule=f'Step: {step} out of {len(values)}\nBringing front\nIndex value: {value}'))
+            start_time = last_render = default_timer()
+            frame = None
+            for k, frame in enumerate(frames):
+                delay = start_time + k * per_frame - default_timer()
+                if delay > 0:
+                    sleep(delay)  # Keep the pace of the replay
+                if default_timer() - last_render >= frame_time:
+                    matriz, val, color, subtitule = frame
+                    live.update(self.imprimir(val, subtitule=subtitule, color=color, matriz=matriz))
                     live.refresh()
-                    sleep(interval)
-                    
-                    column -= int(column_moves) - int(column_previous) if column != 1 and column - int(column_moves) - int(column_previous) >= 1 else 0 if column == 1 else column - 1
-                    column_previous = column_moves if int(column_moves) - int(column_previous) >= 1 else column_previous
-                
-                # Scramble the matrix based on even/odd indexing
-                if (self.matrix[0] ^ i) % 2 == 0:
-                    index = self.matrix[0] ^ i
-                    matrix_support = ["   " for _ in range(0, 256)]  # Reset support matrix
-                    row = (index >> 4) & 0x0F  # Determine row from index
-                    column = index & 0x0F  # Determine column from index
-                    
-                    for j in range(0, 46, 3):
-                        if self.matrix[(column + j) % 16] % 2 == 0:
-                            valores = self.column_to_row_even((column + j) % 16, row)  # Even column handling
-                        else:
-                            valores = self.column_to_row_uneven((column + j) % 16, row)  # Odd column handling
-                        matrix_support.extend(valores)
-                        del matrix_support[0:16]  # Prevent overflow of support matrix
-                        live.update(self.imprimir(valores, subtitule=f'Step: {step} out of {len(values)}\nConverting column: {column + j} to row', matriz=matrix_support))
-                        live.refresh()
-                        sleep(interval + (interval * 0.25))
-                    
-                    self.matrix = matrix_support  # Update the main matrix
-                else:
-                    index = self.matrix[0] ^ i
-                    matrix_support = ["   " for _ in range(0, 256)]  # Reset support matrix
-                    row = (index >> 4) & 0x0F  # Determine row from index
-                    column = index & 0x0F  # Determine column from index
-                    
-                    for j in range(0, 16):
-                        if j % 2:
-                            # Handle odd indices differently
-                            if self.matrix[(column + j) % 16] % 2 == 0:
-                                valores = self.column_to_row_even((column + j) % 16, row)
-                                matrix_support.extend(valores)
-                                del matrix_support[0:16]
-                            else:
-                                valores = self.column_to_row_uneven((column + j) % 16, row)
-                                matrix_support.extend(valores)
-                                del matrix_support[0:16]
-                        else:
-                            # Handle even indices
-                            if self.matrix[(column - j) % 16] % 2 == 0:
-                                valores = self.column_to_row_even((column - j) % 16, row)
-                                matrix_support.extend(valores)
-                                del matrix_support[0:16]
-                            else:
-                                valores = self.column_to_row_uneven((column - j) % 16, row)
-                                matrix_support.extend(valores)
-                                del matrix_support[0:16]
-
-                        live.update(self.imprimir(valores, subtitule=f'Step: {step} out of {len(values)}\nConverting column: {column + j} to row', matriz=matrix_support))
-                        live.refresh()
-                        sleep(interval + (interval * 0.25))
-
-                    self.matrix = matrix_support  # Update the main matrix
-                
-                step += 1  # Increment step count
-                live.update(self.imprimir(subtitule=f'Step: {len(values)} out of {len(values)}\nSME calculation finish'))
+                    last_render = default_timer()
+
+            if frame is not None:  # The last frame is always shown
+                matriz, val, color, subtitule = frame
+                live.update(self.imprimir(val, subtitule=subtitule, color=color, matriz=matriz))
                 live.refresh()
 
             if eliminar:
                 live.stop()
 
+    def replay(self, trace: ScheduleTrace, interval: int | float = 0.01, eliminar: bool = False, fps: int = 30, duration: float = None, expand: bool = True) -> None:
+        """
+        Replays a recorded trace in a live panel.
+
+        Args:
+            trace (ScheduleTrace): The trace to replay.
+            interval (int | float): Time between two frames (default 0.01).
+            eliminar (bool): Whether to remove the live display after completion (default False).
+            fps (int): Maximum rendered frames per second (default 30).
+            duration (float): Total replay time in seconds, overrides interval (default None).
+            expand (bool): Show every row/column move instead of one frame per phase (default True).
+        """
+        self.play(trace_frames(trace, expand), trace_frame_count(trace, expand), interval, eliminar, fps, duration)
+
+    def calculate_table_from_values_show(self, interval: int | float = 0.01, eliminar: bool = False, values: bytes = None, fps: int = 30, duration: float = None) -> None:
+        """
+        Shows the step-by-step calculation of the transformation process with delays.
+
+        The key schedule runs first at full speed while recording a trace, which is then
+        replayed, so the display can never slow down or diverge from the real computation.
+
+        Args:
+            interval (int | float): Time interval between each step display.
+            eliminar (bool): Whether to remove the live display after completion (default False).
+            values (bytes): The values to use for transformation (default is self.password).
+            fps (int): Maximum rendered frames per second (default 30).
+            duration (float): Total replay time in seconds, overrides interval (default None).
+        """
+        self.replay(self.record_trace(values), interval, eliminar, fps, duration)
+
 
 class SME256BF(sme256bf,SME256):
     """
@@ -285,91 +384,66 @@ class SME256BF(sme256bf,SME256):
     Adds the ability to print the encryption process while it is happening..
     """
 
-    def encrypt_show(self, plaintext: bytes | str, interval: int = 0.001) -> bytes:
+    def _lookup_frames(self, data: bytes, mode: str):
+        """ Yields one frame per byte looked up in the derived matrix. """
+        for i in data:
+            value = self.table[i] if mode == 'encrypt' else self.inverse[i]
+            yield self.matrix, [value], 'red', f'{mode.capitalize()}ing: {i} --> {value}'
+        yield self.matrix, [], 'blue', 'Plaintext encrypted...' if mode == 'encrypt' else 'Ciphertext decrypted...'
+
+    def encrypt_show(self, plaintext: bytes | str, interval: int = 0.001, fps: int = 30, duration: float = None) -> bytes:
         """
         Encrypts the provided plaintext and shows the process step-by-step.
 
         Args:
             plaintext (bytes | str): The plaintext to encrypt.
             interval (int): The time in seconds for the delay between steps (default 0.001).
+            fps (int): Maximum rendered frames per second (default 30).
+            duration (float): Total time of each replay in seconds, overrides interval (default None).
 
         Returns:
             bytes: The resulting ciphertext.
         """
-        if check_dependencie('rich') == None:
-            print('!' * 64 + '   Reference')
-            print('* WARNING: Need to install rich in order to use this function. *    in the')
-            print('!' * 64 + ' documentation')
-            exit()
-        
-        ciphertext = []
-        
         if not isinstance(plaintext, bytes):
             plaintext = plaintext.encode()  # Ensure plaintext is bytes
         
-        self.calculate_table_from_values_show(interval=interval, eliminar=True)  # Prepare for display
+        self.calculate_table_from_values_show(interval=interval, eliminar=True, fps=fps, duration=duration)  # Prepare for display
 
-        with Live(self.imprimir(), auto_refresh=False) as live:
-            for i in plaintext:
-                try:
-                    # Update display with current value being encrypted
-                    live.update(self.imprimir(val=[self.matrix[i]], color='red', subtitule='Encrypting plaintext...'))
-                    live.refresh()
-                    sleep(interval + (interval * 0.25))  # Pause for visibility
-                    ciphertext.append(self.matrix[i])  # Append the encrypted value
-                except IndexError as e:
-                    print("Error11: Encryption process failed due to invalid index.")
-                    raise e
+        try:
+            ciphertext = self.encrypt(plaintext)
+        except IndexError as e:
+            print("Error11: Encryption process failed due to invalid index.")
+            raise e
 
-            live.update(self.imprimir(subtitule='Plaintext Encrypted...'))
-            live.refresh()
+        self.play(self._lookup_frames(plaintext, 'encrypt'), len(plaintext) + 1, interval * 1.25, fps=fps, duration=duration)
+        return ciphertext
 
-        return bytes(ciphertext)
-
-    def decrypt_show(self, ciphertext: bytes | str, interval: int = 0.001) -> bytes:
+    def decrypt_show(self, ciphertext: bytes | str, interval: int = 0.001, fps: int = 30, duration: float = None) -> bytes:
         """
         Decrypts the provided ciphertext and shows the process step-by-step.
 
         Args:
             ciphertext (bytes | str): The ciphertext to decrypt.
             interval (int): The time in seconds for the delay between steps (default 0.001).
+            fps (int): Maximum rendered frames per second (default 30).
+            duration (float): Total time of each replay in seconds, overrides interval (default None).
 
         Returns:
             bytes: The resulting plaintext.
         """
-        if check_dependencie('rich') == None:
-            print('!' * 64 + '   Reference')
-            print('* WARNING: Need to install rich in order to use this function. *    in the')
-            print('!' * 64 + ' documentation')
-            exit()
-        
-        plaintext = []
-        
         if not isinstance(ciphertext, bytes):
             ciphertext = ciphertext.encode()  # Ensure ciphertext is bytes
         
-        self.calculate_table_from_values_show(interval=interval, eliminar=True)  # Prepare for display
-        
-        # Iterate over each element in the ciphertext
-        for i in ciphertext:
-            try:
-                plaintext.append(self.matrix.index(i))  # Decrypt value based on matrix indices
-                # Update display for current value being decrypted
-                with Live(auto_refresh=False, transient=True) as live:
-                    live.update(self.imprimir(val=[self.matrix.index(i)], color='red', subtitule='Decrypting ciphertext...'))
-                    live.refresh()
-                    sleep(interval + (interval * 0.25))  # Pause for visibility
-                    live.update(pprint('', end=''))  # Some formatting and refresh
-                
-            except ValueError as e:
-                print("Error13: Decrypting process failed because index was not found in the matrix.")
-                raise e
+        self.calculate_table_from_values_show(interval=interval, eliminar=True, fps=fps, duration=duration)  # Prepare for display
 
-        with Live(self.imprimir(), auto_refresh=False) as live:
-            live.update(self.imprimir(subtitule='Ciphertext decrypted...'))  # End messaging display
-            live.refresh()
+        try:
+            plaintext = self.decrypt(ciphertext)
+        except ValueError as e:
+            print("Error13: Decrypting process failed because index was not found in the matrix.")
+            raise e
 
-        return bytes(plaintext)
+        self.play(self._lookup_frames(ciphertext, 'decrypt'), len(ciphertext) + 1, interval * 1.25, fps=fps, duration=duration)
+        return plaintext
 
 class SME256dBF(sme256dbf,SME256):
     """
@@ -378,96 +452,62 @@ class SME256dBF(sme256dbf,SME256):
     Adds the ability to print the encryption process while it is happening.
     """
 
-    def encrypt_show(self, plaintext: bytes | str, interval: int = 0.001) -> bytes:
+    def encrypt_show(self, plaintext: bytes | str, interval: int = 0.001, fps: int = 30, duration: float = None) -> bytes:
         """
         Encrypts plaintext using dynamic matrix updates with step-by-step display.
 
+        The message is encrypted by the real engine while recording a trace of the key
+        schedule and of every byte, the trace is replayed afterwards.
+
         Args:
             plaintext (bytes | str): The plaintext to encrypt.
             interval (int): The time in seconds for the delay between steps (default 0.001).
+            fps (int): Maximum rendered frames per second (default 30).
+            duration (float): Total replay time in seconds, overrides interval (default None).
 
         Returns:
             bytes: The resulting ciphertext.
         """
-        if check_dependencie('rich') == None:
-            print('!' * 64 + '   Reference')
-            print('* WARNING: Need to install rich in order to use this function. *    in the')
-            print('!' * 64 + ' documentation')
-            exit()
-        
-        ciphertext = []
-        support_matrix = [i for i in self.matrix]  # Save initial matrix state
-        
         if not isinstance(plaintext, bytes):
             plaintext = plaintext.encode()  # Ensure plaintext is bytes
 
-        self.calculate_table_from_values_show(interval=interval, eliminar=True)  # Prepare for display
-        
-        for i in plaintext:
-            try:
-                with Live(auto_refresh=False, transient=True) as live:
-                    ciphertext.append(self.matrix[i])  # Encrypt value based on matrix
-                    live.update(self.imprimir(val=[self.matrix[i]], color='red', subtitule='Encrypting plaintext...'))
-                    live.refresh()
-                    sleep(interval + (interval * 0.25))  # Pause for visibility
-                    live.stop()
-
-                self.calculate_table_from_values_show(values=[self.matrix[i] ^ i], interval=interval, eliminar=True)  # Update
-            except IndexError as e:
-                print("Error15: Encryption process failed due to invalid index.")
-                raise e
-
-        with Live(self.imprimir(), auto_refresh=False) as live:
-            live.update(self.imprimir(subtitule='Plaintext encrypted...'))  # End messaging display
-            live.refresh()
+        trace = self.record_trace()
+        ciphertext = bytearray(len(plaintext))
+        try:
+            DependentByteFlow(self.table, self.backend, trace).encrypt_into(plaintext, ciphertext)
+        except IndexError as e:
+            print("Error15: Encryption process failed due to invalid index.")
+            raise e
 
-        self.matrix = support_matrix  # Reset matrix state for consistency
+        self.replay(trace, interval, fps=fps, duration=duration)
         return bytes(ciphertext)
 
-    def decrypt_show(self, ciphertext: bytes | str, interval: int = 0.001) -> bytes:
+    def decrypt_show(self, ciphertext: bytes | str, interval: int = 0.001, fps: int = 30, duration: float = None) -> bytes:
         """
         Decrypts ciphertext with dynamic matrix updates with step-by-step display.
 
+        The message is decrypted by the real engine while recording a trace of the key
+        schedule and of every byte, the trace is replayed afterwards.
+
         Args:
             ciphertext (bytes | str): The ciphertext to decrypt.
             interval (int): The time in seconds for the delay between steps (default 0.001).
+            fps (int): Maximum rendered frames per second (default 30).
+            duration (float): Total replay time in seconds, overrides interval (default None).
 
         Returns:
             bytes: The resulting plaintext.
         """
-        if check_dependencie('rich') == None:
-            print('!' * 64 + '   Reference')
-            print('* WARNING: Need to install rich in order to use this function. *    in the')
-            print('!' * 64 + ' documentation')
-            exit()
-        
-        plaintext = []
-        support_matrix = [i for i in self.matrix]  # Save initial matrix state
-        
         if not isinstance(ciphertext, bytes):
             ciphertext = ciphertext.encode()  # Ensure ciphertext is bytes
 
-        self.calculate_table_from_values_show(interval=interval, eliminar=True)  # Prepare for display
-        
-        for i in ciphertext:
-            try:
-                with Live(auto_refresh=False, transient=True) as live:
-                    plaintext.append(self.matrix.index(i))  # Decrypt value based on matrix indices
-                    live.update(self.imprimir(val=[self.matrix.index(i)], color='red', subtitule='Decrypting ciphertext...'))
-                    live.refresh()
-                    sleep(interval + (interval * 0.25))  # Pause for visibility
-                    live.update(pprint('', end=''))  # Some formatting and refresh
-                    live.refresh()
+        trace = self.record_trace()
+        plaintext = bytearray(len(ciphertext))
+        try:
+            DependentByteFlow(self.table, self.backend, trace).decrypt_into(ciphertext, plaintext)
+        except ValueError as e:
+            print("Error17: Decryption process failed because index was not found in the matrix.")
+            raise e
 
-                self.calculate_table_from_values_show(interval=interval, values=[i ^ self.matrix.index(i)], eliminar=True)  # Update
-            except ValueError as e:
-                print("Error17: Decryption process failed because index was not found in the matrix.")
-                raise e
-
-        with Live(self.imprimir(), auto_refresh=False) as live:
-            live.update(self.imprimir(subtitule='Ciphertext decrypted...'))  # End messaging display
-            live.refresh()
-
-        self.matrix = support_matrix  # Reset matrix state for consistency
+        self.replay(trace, interval, fps=fps, duration=duration)
         return bytes(plaintext)
-
@@ -0,0 +1,364 @@
+#Copyright 2025 yo525
+#SPDX-License-Identifier: Apache-2.0
+
+#Import necessary modules
+from SME import SME256, SME256BF, SME256dBF, SME256BFKey, SME256dBFKey, derive_matrices
+
+from argparse import ArgumentParser
+from hashlib import blake2b
+from json import load
+from mmap import mmap, ACCESS_READ
+from multiprocessing import Pool, cpu_count
+from os import replace, fsync, fdopen, unlink
+from os.path import basename, dirname
+from struct import Struct, error as StructError
+from tempfile import mkstemp
+import sys
+
+# File layout: header, then one 512-byte record (table + inverse) per key, then the index
+MAGIC = b'SMEKEYS1'
+HEADER = Struct('<8sIIQ')  # magic, record count, reserved, index offset
+RECORD_SIZE = 512
+INDEX_ENTRY = Struct('<IH8s')  # record number, key ID length, checksum of the record; followed by the key ID
+MAX_KEY_ID = 0xFFFF  # Longest encoded key ID, in bytes
+
+
+def _checksum(record: bytes) -> bytes:
+    """ Returns the 8-byte checksum stored in the index for a record. """
+    return blake2b(record, digest_size=8).digest()
+
+
+def _derive(items: list) -> list:
+    """
+    Derives the records of a group of keys as one batch, runs in a worker process.
+
+    Args:
+        items (list): The (key ID, password) pairs.
+
+    Returns:
+        list: The (key ID, 512-byte record) pairs.
+    """
+    records = []
+    for (key_id, _), matrix in zip(items, derive_matrices([password for _, password in items])):
+        sme = SME256.from_table(matrix)  # Builds and checks the inverse table
+        records.append((key_id, sme.table + sme.inverse))
+    return records
+
+
+def derive_records(keys: dict, workers: int = None, batch_size: int = 1024) -> dict:
+    """
+    Runs the key schedule of many keys in batches on a process pool.
+
+    Args:
+        keys (dict): {key ID (str): password (bytes)}.
+        workers (int): Number of worker processes, 1 derives in this process (default the number of CPUs).
+        batch_size (int): Keys derived together by one task (default 1024).
+
+    Returns:
+        dict: {key ID: 512-byte record holding the forward and the inverse table}.
+    """
+    items = list(keys.items())
+    batches = [items[start:start + batch_size] for start in range(0, len(items), batch_size)]
+    workers = workers or cpu_count()
+    if workers == 1 or len(batches) < 2:
+        return dict(record for batch in batches for record in _derive(batch))
+    with Pool(min(workers, len(batches))) as pool:
+        return dict(record for records in pool.imap_unordered(_derive, batches) for record in records)
+
+
+def write_keystore(path: str, records: dict) -> int:
+    """
+    Writes a keystore file atomically.
+
+    The file is written to a new temporary file next to its destination, created
+    exclusively and readable by its owner only, and renamed over it, so processes
+    that have the previous version mapped keep reading a consistent file.
+
+    Args:
+        path (str): Destination file.
+        records (dict): {key ID (str): 512-byte record}.
+
+    Returns:
+        int: The number of keys written.
+
+    Raises:
+        ValueError: If a key ID is longer than MAX_KEY_ID bytes once encoded.
+    """
+    key_ids = sorted(records)
+    index = bytearray()
+    for number, key_id in enumerate(key_ids):
+        encoded = key_id.encode()
+        if len(encoded) > MAX_KEY_ID:
+            print(f"Error33: Key ID longer than {MAX_KEY_ID} bytes, the keystore index cannot store it.")
+            raise ValueError(f"key ID of {len(encoded)} bytes exceeds the {MAX_KEY_ID}-byte limit: {key_id[:32]!r}...")
+        index += INDEX_ENTRY.pack(number, len(encoded), _checksum(records[key_id]))
+        index += encoded
+
+    # O_EXCL with mode 0600: never reuses or follows an existing file, the contents are key material
+    descriptor, temporary = mkstemp(prefix=basename(path) + '.', suffix='.tmp', dir=dirname(path) or '.')
+    try:
+        with fdopen(descriptor, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, len(key_ids), 0, HEADER.size + RECORD_SIZE * len(key_ids)))
+            for key_id in key_ids:
+                file.write(records[key_id])
+            file.write(index)
+            file.flush()
+            fsync(file.fileno())
+        replace(temporary, path)
+    except BaseException:
+        unlink(temporary)
+        raise
+    return len(key_ids)
+
+
+def build_keystore(path: str, keys: dict, workers: int = None) -> int:
+    """
+    Derives every key in batches, in parallel, and writes a new keystore.
+
+    Args:
+        path (str): Destination file.
+        keys (dict): {key ID (str): password (bytes)}.
+        workers (int): Number of worker processes (default the number of CPUs).
+
+    Returns:
+        int: The number of keys written.
+    """
+    return write_keystore(path, derive_records(keys, workers))
+
+
+def update_keystore(path: str, add: dict = None, remove=(), workers: int = None) -> int:
+    """
+    Adds, replaces or removes keys of an existing keystore.
+
+    Only the added keys are derived, the stored records are copied as they are.
+
+    Args:
+        path (str): The keystore file.
+        add (dict): {key ID (str): password (bytes)} to add or replace (default None).
+        remove: Key IDs to remove (default none).
+        workers (int): Number of worker processes (default the number of CPUs).
+
+    Returns:
+        int: The number of keys of the updated keystore.
+    """
+    with KeyStore(path) as store:
+        records = {key_id: store.record(key_id) for key_id in store.keys()}
+    for key_id in remove:
+        records.pop(key_id, None)
+    records.update(derive_records(add or {}, workers))
+    return write_keystore(path, records)
+
+
+class KeyStore:
+    """
+    Read-only, memory-mapped keystore of derived SME256 tables indexed by key ID.
+
+    Opening the store only parses the index. Getting a key copies its 512-byte
+    record out of the map, no key schedule runs, and every process opening the
+    same file shares its pages through the page cache.
+    """
+
+    def __init__(self, path: str, verify: bool = False) -> None:
+        """
+        Opens a keystore file.
+
+        Args:
+            path (str): The keystore file.
+            verify (bool): Check the checksum of every record now instead of trusting the file (default False).
+
+        Raises:
+            ValueError: If the file is not a keystore, is empty or is truncated.
+        """
+        self.path = path
+        self._map = None
+        try:
+            with open(path, 'rb') as file:
+                self._map = mmap(file.fileno(), 0, access=ACCESS_READ)  # ValueError for an empty file
+            magic, count, _, index_offset = HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC or index_offset != HEADER.size + RECORD_SIZE * count:
+                raise ValueError('bad header')
+            self._index = {}
+            self._checksums = {}
+            position = index_offset
+            for _ in range(0, count):
+                number, length, checksum = INDEX_ENTRY.unpack_from(self._map, position)
+                position += INDEX_ENTRY.size
+                key_id = self._map[position:position + length].decode()
+                position += length
+                if number >= count:
+                    raise ValueError('bad record number')
+                self._index[key_id] = HEADER.size + number * RECORD_SIZE
+                self._checksums[key_id] = checksum
+        except (ValueError, UnicodeDecodeError, StructError) as e:
+            if self._map is not None:
+                self._map.close()
+            print("Error28: Keystore file is corrupted or has an unknown format.")
+            raise ValueError("keystore file is corrupted or has an unknown format") from e
+
+        if verify:
+            corrupted = self.verify()
+            if corrupted:
+                self._map.close()
+                print("Error28: Keystore file is corrupted or has an unknown format.")
+                raise ValueError(f"keystore records failed verification: {corrupted[:10]}")
+
+    def close(self) -> None:
+        """ Unmaps the file. """
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key_id: str) -> bool:
+        return key_id in self._index
+
+    def keys(self) -> list:
+        """ Returns the stored key IDs, sorted. """
+        return sorted(self._index)
+
+    def record(self, key_id: str) -> bytes:
+        """
+        Returns the raw record of a key.
+
+        Args:
+            key_id (str): The key ID.
+
+        Returns:
+            bytes: The 256-byte forward table followed by the 256-byte inverse table.
+
+        Raises:
+            KeyError: If the key ID is not stored.
+            ValueError: If the record does not match its checksum.
+        """
+        record = self._record(key_id)
+        if _checksum(record) != self._checksums[key_id]:
+            print("Error28: Keystore file is corrupted or has an unknown format.")
+            raise ValueError(f"keystore record of {key_id!r} does not match its checksum")
+        return record
+
+    def _record(self, key_id: str) -> bytes:
+        """ Returns the raw record of a key, without checking it. """
+        offset = self._index.get(key_id)
+        if offset is None:
+            print("Error29: Key ID not found in the keystore.")
+            raise KeyError(key_id)
+        return self._map[offset:offset + RECORD_SIZE]
+
+    def tables(self, key_id: str) -> tuple:
+        """
+        Returns the forward and the inverse table of a key.
+
+        Args:
+            key_id (str): The key ID.
+
+        Returns:
+            tuple: The (table, inverse) bytes.
+        """
+        record = self.record(key_id)
+        return record[:256], record[256:]
+
+    def bf(self, key_id: str, compact: bool = False) -> SME256BF | SME256BFKey:
+        """
+        Builds the SME256BF key of a key ID, without running the key schedule.
+
+        Args:
+            key_id (str): The key ID.
+            compact (bool): Return a SME256BFKey, for caches holding many keys (default False).
+
+        Returns:
+            SME256BF | SME256BFKey: The key.
+        """
+        if compact:
+            return SME256BFKey(*self.tables(key_id), verify=False)
+        return SME256BF.from_table(*self.tables(key_id), verify=False)
+
+    def dbf(self, key_id: str, compact: bool = False) -> SME256dBF | SME256dBFKey:
+        """
+        Builds the SME256dBF key of a key ID, without running the key schedule.
+
+        Args:
+            key_id (str): The key ID.
+            compact (bool): Return a SME256dBFKey, for caches holding many keys (default False).
+
+        Returns:
+            SME256dBF | SME256dBFKey: The key.
+        """
+        if compact:
+            return SME256dBFKey(*self.tables(key_id), verify=False)
+        return SME256dBF.from_table(*self.tables(key_id), verify=False)
+
+    def verify(self) -> list:
+        """
+        Checks the checksum and the permutation of every record.
+
+        Returns:
+            list: The key IDs whose record is corrupted.
+        """
+        identity = bytes(range(0, 256))
+        corrupted = []
+        for key_id in self.keys():
+            record = self._record(key_id)
+            if _checksum(record) != self._checksums[key_id] or record[:256].translate(record[256:]) != identity:
+                corrupted.append(key_id)
+        return corrupted
+
+
+def _read_keys(path: str) -> dict:
+    """ Reads a {key ID: password as hexadecimal} JSON file. """
+    with open(path) as file:
+        return {key_id: bytes.fromhex(password) for key_id, password in load(file).items()}
+
+
+def main(argv: list = None) -> int:
+    """
+    Command line entry point: python -m keystoreSME {build,add,remove,list,verify} store ...
+
+    Args:
+        argv (list): Arguments to parse (default sys.argv[1:]).
+
+    Returns:
+        int: The exit status.
+    """
+    parser = ArgumentParser(prog='python -m keystoreSME', description='Build and maintain keystores of derived SME256 tables.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help='derive every key of a JSON file into a new keystore')
+    build.add_argument('store')
+    build.add_argument('keys', help='JSON object {key ID: password as hexadecimal}')
+    add = commands.add_parser('add', help='derive and add or replace the keys of a JSON file')
+    add.add_argument('store')
+    add.add_argument('keys', help='JSON object {key ID: password as hexadecimal}')
+    remove = commands.add_parser('remove', help='remove keys')
+    remove.add_argument('store')
+    remove.add_argument('key_ids', nargs='+')
+    for name in ('list', 'verify'):
+        commands.add_parser(name).add_argument('store')
+    for command in (build, add):
+        command.add_argument('-w', '--workers', type=int, default=None, help='worker processes (default the number of CPUs)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        print(f'{build_keystore(args.store, _read_keys(args.keys), args.workers)} keys written', file=sys.stderr)
+    elif args.command == 'add':
+        print(f'{update_keystore(args.store, add=_read_keys(args.keys), workers=args.workers)} keys stored', file=sys.stderr)
+    elif args.command == 'remove':
+        print(f'{update_keystore(args.store, remove=args.key_ids)} keys stored', file=sys.stderr)
+    else:
+        with KeyStore(args.store) as store:
+            if args.command == 'list':
+                print('\n'.join(store.keys()))
+            else:
+                corrupted = store.verify()
+                print(f'{len(store)} keys, {len(corrupted)} corrupted', file=sys.stderr)
+                print('\n'.join(corrupted))
+                return 1 if corrupted else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,411 @@
+#Copyright 2025 yo525
+#SPDX-License-Identifier: Apache-2.0
+
+#Import necessary modules
+from SME import SME256BF, SME256dBF, DependentByteFlow, CHUNK_SIZE
+
+from multiprocessing import Pool, cpu_count, resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from threading import Lock
+from timeit import default_timer
+from os import urandom
+import atexit
+import sys
+
+# Buffers smaller than this are processed in the calling process, the pool round trip would cost more
+MIN_SHARD_SIZE = 1 << 20
+
+# Lookup tables of the key, set once per worker by the pool initializer
+_worker_tables = {}
+
+# Pool of dependent_packed when the caller does not give one, started on first use and kept for the next calls
+_packed_pool = None
+_packed_pool_workers = 0
+_packed_pool_lock = Lock()
+
+
+def _init_worker(table: bytes, inverse: bytes) -> None:
+    """
+    Pool initializer, stores the derived lookup tables in the worker process.
+
+    Args:
+        table (bytes): The forward 256-byte table of the key.
+        inverse (bytes): The inverse 256-byte table of the key.
+    """
+    _worker_tables['encrypt'] = table
+    _worker_tables['decrypt'] = inverse
+
+
+def _translate_shard(name: str, start: int, end: int, mode: str) -> int:
+    """
+    Translates a slice of a shared memory segment in place inside a worker.
+
+    Args:
+        name (str): Name of the shared memory segment.
+        start (int): First byte of the shard.
+        end (int): End of the shard (exclusive).
+        mode (str): Either 'encrypt' or 'decrypt'.
+
+    Returns:
+        int: The number of bytes processed.
+    """
+    table = _worker_tables[mode]
+    segment = SharedMemory(name=name)
+    try:
+        view = segment.buf[start:end]
+        for position in range(0, end - start, CHUNK_SIZE):
+            chunk = view[position:position + CHUNK_SIZE]
+            chunk[:] = chunk.tobytes().translate(table)
+            chunk.release()
+        view.release()
+    finally:
+        segment.close()
+    return end - start
+
+
+def _dependent_messages(name: str, offsets: list, mode: str, table: bytes, backend: str) -> int:
+    """
+    Runs SME256dBF over a group of packed messages of a shared memory segment, in place.
+
+    Args:
+        name (str): Name of the shared memory segment.
+        offsets (list): Boundaries of the consecutive messages of the group.
+        mode (str): Either 'encrypt' or 'decrypt'.
+        table (bytes): The key matrix every message starts from, sent with the task so any pool can run it.
+        backend (str): Key schedule backend used by the engine.
+
+    Returns:
+        int: The number of bytes processed.
+    """
+    segment = SharedMemory(name=name)
+    try:
+        view = segment.buf
+        for k in range(0, len(offsets) - 1):
+            message = view[offsets[k]:offsets[k + 1]]
+            engine = DependentByteFlow(table, backend)  # Every message starts from the key
+            if mode == 'encrypt':
+                engine.encrypt_into(message, message)
+            else:
+                engine.decrypt_into(message, message)
+            message.release()
+        view.release()
+    finally:
+        segment.close()
+    return offsets[-1] - offsets[0]
+
+
+def packed_pool(workers: int = None) -> Pool:
+    """
+    Returns the pool used by dependent_packed calls without a pool of their own.
+
+    The pool is started on the first call and reused by the next ones, starting
+    worker processes costs far more than SME256dBF over a batch of small messages.
+    Asking for another number of workers replaces it.
+
+    Args:
+        workers (int): Number of worker processes (default the number of CPUs).
+
+    Returns:
+        Pool: The shared pool.
+    """
+    global _packed_pool, _packed_pool_workers
+    workers = workers or cpu_count()
+    with _packed_pool_lock:
+        if _packed_pool is None or _packed_pool_workers != workers:
+            if _packed_pool is not None:
+                _packed_pool.terminate()
+            resource_tracker.ensure_running()  # Shared by the workers, see ParallelSME256BF
+            _packed_pool, _packed_pool_workers = Pool(workers), workers
+        return _packed_pool
+
+
+@atexit.register
+def close_packed_pool() -> None:
+    """ Stops the pool of packed_pool, if started. The next dependent_packed call starts a new one. """
+    global _packed_pool, _packed_pool_workers
+    with _packed_pool_lock:
+        if _packed_pool is not None:
+            _packed_pool.close()
+            _packed_pool.join()
+        _packed_pool, _packed_pool_workers = None, 0
+
+
+def dependent_packed(sme: SME256dBF, buffer, offsets, mode: str, workers: int = None, pool: Pool = None) -> bytes:
+    """
+    Spreads independent SME256dBF messages packed in a buffer over a process pool.
+
+    The messages are split in one group of consecutive messages per worker, with
+    roughly the same amount of bytes each, and processed in place in a shared
+    memory segment. The key travels with the tasks, so one pool serves every key.
+
+    Args:
+        sme (SME256dBF): The derived key.
+        buffer: The concatenated messages.
+        offsets: The message boundaries, see SME.pack_messages.
+        mode (str): Either 'encrypt' or 'decrypt'.
+        workers (int): Number of worker processes, or of groups with a given pool (default the number of CPUs).
+        pool (Pool): A multiprocessing pool to run the groups on, started after resource_tracker.ensure_running()
+            like ParallelSME256BF.pool (default packed_pool(workers), kept between calls).
+
+    Returns:
+        bytes: The processed messages, packed with the same boundaries.
+    """
+    length = offsets[-1] if len(offsets) else 0
+    if length == 0:
+        return b''
+
+    workers = workers or cpu_count()
+    target = -(-length // workers)  # Bytes per group
+    groups, first = [], 0
+    for k in range(1, len(offsets)):
+        if offsets[k] - offsets[first] >= target or k == len(offsets) - 1:
+            groups.append(list(offsets[first:k + 1]))
+            first = k
+
+    pool = pool or packed_pool(workers)
+    segment = SharedMemory(create=True, size=length)
+    try:
+        segment.buf[:length] = buffer
+        pool.starmap(_dependent_messages, [(segment.name, group, mode, sme.table, sme.backend) for group in groups])
+        return bytes(segment.buf[:length])
+    finally:
+        segment.close()
+        segment.unlink()
+
+
+class ParallelSME256BF:
+    """
+    Runs SME256BF over large buffers on several cores.
+
+    SME256BF maps every byte on its own, so a buffer can be cut in shards that are
+    translated by different processes with the exact same result. The workers get
+    the 256-byte tables once, when the pool starts, and work directly on shared
+    memory segments, the payload is never pickled.
+    """
+
+    def __init__(self, sme: SME256BF, workers: int = None) -> None:
+        """
+        Initialize the worker pool for a derived key.
+
+        Args:
+            sme (SME256BF): The derived key to use.
+            workers (int): Number of worker processes (default the number of CPUs).
+        """
+        self.sme = sme
+        self.workers = workers or cpu_count()
+        # Workers must share the tracker of this process, otherwise each one reports the segments it attaches as leaked
+        resource_tracker.ensure_running()
+        self.pool = Pool(self.workers, initializer=_init_worker, initargs=(sme.table, sme.inverse))
+
+    def close(self) -> None:
+        """ Stops the worker processes. """
+        self.pool.close()
+        self.pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def shards(self, length: int) -> list:
+        """
+        Splits a buffer length in one contiguous shard per worker.
+
+        Args:
+            length (int): The length of the buffer.
+
+        Returns:
+            list: The (start, end) tuples of every shard.
+        """
+        count = max(1, min(self.workers, length // MIN_SHARD_SIZE))
+        size = -(-length // count)  # Ceiling division so the last shard is the shortest
+        return [(start, min(start + size, length)) for start in range(0, length, size)]
+
+    def process_shared(self, segment: SharedMemory, mode: str, length: int = None) -> int:
+        """
+        Encrypts or decrypts a shared memory segment in place using the worker pool.
+
+        Args:
+            segment (SharedMemory): The segment holding the data.
+            mode (str): Either 'encrypt' or 'decrypt'.
+            length (int): Number of bytes to process (default the whole segment).
+
+        Returns:
+            int: The number of bytes processed.
+        """
+        if mode not in ('encrypt', 'decrypt'):
+            raise ValueError(f"unknown mode: {mode!r}, expected 'encrypt' or 'decrypt'")
+        if length is None:
+            length = segment.size
+
+        if length < MIN_SHARD_SIZE:  # Not worth a round trip to the pool
+            view = segment.buf[:length]
+            self.sme.translate_into(view, view, self.sme.table if mode == 'encrypt' else self.sme.inverse, mode)
+            view.release()
+            return length
+
+        tasks = [(segment.name, start, end, mode) for start, end in self.shards(length)]
+        return sum(self.pool.starmap(_translate_shard, tasks))
+
+    def encrypt_shared(self, segment: SharedMemory, length: int = None) -> int:
+        """
+        Encrypts a shared memory segment in place.
+
+        Args:
+            segment (SharedMemory): The segment holding the plaintext.
+            length (int): Number of bytes to encrypt (default the whole segment).
+
+        Returns:
+            int: The number of bytes encrypted.
+        """
+        return self.process_shared(segment, 'encrypt', length)
+
+    def decrypt_shared(self, segment: SharedMemory, length: int = None) -> int:
+        """
+        Decrypts a shared memory segment in place.
+
+        Args:
+            segment (SharedMemory): The segment holding the ciphertext.
+            length (int): Number of bytes to decrypt (default the whole segment).
+
+        Returns:
+            int: The number of bytes decrypted.
+        """
+        return self.process_shared(segment, 'decrypt', length)
+
+    def process(self, data, mode: str) -> bytes:
+        """
+        Copies a buffer into a temporary shared memory segment and processes it.
+
+        Args:
+            data: Any bytes-like object.
+            mode (str): Either 'encrypt' or 'decrypt'.
+
+        Returns:
+            bytes: The processed data.
+        """
+        length = len(data)
+        if length == 0:
+            return b''
+
+        segment = SharedMemory(create=True, size=length)
+        try:
+            segment.buf[:length] = data
+            self.process_shared(segment, mode, length)
+            return bytes(segment.buf[:length])
+        finally:
+            segment.close()
+            segment.unlink()
+
+    def encrypt(self, plaintext: bytes | str) -> bytes:
+        """
+        Encrypts the provided plaintext on several cores.
+
+        Args:
+            plaintext (bytes | str): The plaintext to encrypt.
+
+        Returns:
+            bytes: The resulting ciphertext, identical to SME256BF.encrypt.
+        """
+        if isinstance(plaintext, str):
+            plaintext = plaintext.encode()  # Ensure plaintext is bytes
+        return self.process(plaintext, 'encrypt')
+
+    def decrypt(self, ciphertext: bytes | str) -> bytes:
+        """
+        Decrypts the provided ciphertext on several cores.
+
+        Args:
+            ciphertext (bytes | str): The ciphertext to decrypt.
+
+        Returns:
+            bytes: The resulting plaintext, identical to SME256BF.decrypt.
+        """
+        if isinstance(ciphertext, str):
+            ciphertext = ciphertext.encode()  # Ensure ciphertext is bytes
+        return self.process(ciphertext, 'decrypt')
+
+
+def scaling_benchmark(size: int = 64 << 20, max_workers: int = None, rounds: int = 3) -> list:
+    """
+    Measures the encryption throughput of a shared memory buffer for 1..max_workers workers.
+
+    Args:
+        size (int): Size of the buffer in bytes (default 64 MiB).
+        max_workers (int): Highest number of workers to test (default the number of CPUs).
+        rounds (int): Repetitions per worker count, the best one is kept (default 3).
+
+    Returns:
+        list: The (workers, bytes per second) tuples measured.
+    """
+    sme = SME256BF(password=urandom(32))
+    segment = SharedMemory(create=True, size=size)
+    results = []
+
+    try:
+        segment.buf[:size] = urandom(size)
+        start_time = default_timer()
+        sme.encrypt_inplace(segment.buf)
+        single = size / (default_timer() - start_time)
+        print(f'In process: {single / 1e6:10.2f} MB/s')
+
+        for workers in range(1, (max_workers or cpu_count()) + 1):
+            with ParallelSME256BF(sme, workers) as parallel:
+                best = min(_timed(parallel.encrypt_shared, segment) for _ in range(rounds))
+            results.append((workers, size / best))
+            print(f'{workers:3d} worker(s): {size / best / 1e6:10.2f} MB/s  (x{size / best / single:.2f})')
+    finally:
+        segment.close()
+        segment.unlink()
+
+    return results
+
+
+def packed_benchmark(count: int = 200, size: int = 64, workers: int = None, rounds: int = 5) -> dict:
+    """
+    Measures SME256dBF batches of small messages: in process, a new pool per call and the kept pool.
+
+    Args:
+        count (int): Number of messages per batch (default 200).
+        size (int): Size of every message in bytes (default 64).
+        workers (int): Number of worker processes (default the number of CPUs).
+        rounds (int): Repetitions per variant, the best one is kept (default 5).
+
+    Returns:
+        dict: The best seconds per batch of every variant.
+    """
+    from SME import pack_messages  # Only needed by this benchmark
+
+    sme = SME256dBF(password=urandom(32))
+    buffer, offsets = pack_messages([urandom(size) for _ in range(count)])
+    workers = workers or cpu_count()
+
+    def fresh_pool():
+        with Pool(workers) as pool:
+            dependent_packed(sme, buffer, offsets, 'encrypt', workers, pool)
+
+    resource_tracker.ensure_running()
+    packed_pool(workers)  # Started once, outside of the measures
+    variants = {
+        'in process': lambda: sme.encrypt_packed(buffer, offsets),
+        'new pool per call': fresh_pool,
+        'kept pool': lambda: dependent_packed(sme, buffer, offsets, 'encrypt', workers),
+    }
+    results = {}
+    for name, function in variants.items():
+        results[name] = min(_timed(function) for _ in range(rounds))
+        print(f'{count} x {size} B, {name:>17}: {results[name] * 1e3:8.2f} ms/batch')
+    return results
+
+
+def _timed(function, *args) -> float:
+    """ Returns the wall time of a single call. """
+    start_time = default_timer()
+    function(*args)
+    return default_timer() - start_time
+
+
+if __name__ == '__main__':
+    scaling_benchmark(max_workers=int(sys.argv[1]) if len(sys.argv) > 1 else None)
+    packed_benchmark(workers=int(sys.argv[1]) if len(sys.argv) > 1 else None)
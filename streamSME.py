@@ -0,0 +1,875 @@
+#Copyright 2025 yo525
+#SPDX-License-Identifier: Apache-2.0
+
+#Import necessary modules
+from SME import SME256BF, SME256dBF, CHUNK_SIZE, is_dependent, MetricsRegistry, enable_metrics
+
+from argparse import ArgumentParser
+from contextlib import nullcontext
+from hashlib import blake2b
+from io import RawIOBase, BufferedReader, BufferedWriter, BufferedRandom, DEFAULT_BUFFER_SIZE, SEEK_SET, SEEK_CUR, SEEK_END
+from mmap import mmap, ACCESS_READ
+from os import fstat, PathLike
+from struct import Struct, error as StructError
+from timeit import default_timer
+import sys
+
+# Buffer size of the command line tool, large reads amortize the per-call overhead of pipes
+CLI_CHUNK_SIZE = 1 << 20
+# Default distance between two SME256dBF checkpoints: a 0.4% index and under a second of dBF work per seek
+INDEX_INTERVAL = 1 << 16
+
+
+class PipelineStats:
+    """
+    Keeps the amount of bytes processed by a pipeline run and the time it took.
+    """
+
+    def __init__(self, processed: int = 0, elapsed: float = 0.0) -> None:
+        """
+        Initialize the statistics of a pipeline run.
+
+        Args:
+            processed (int): Number of bytes processed (default 0).
+            elapsed (float): Wall time in seconds (default 0.0).
+        """
+        self.processed = processed
+        self.elapsed = elapsed
+
+    @property
+    def throughput(self) -> float:
+        """ Returns the throughput of the run in bytes per second. """
+        return self.processed / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        return f'{self.processed} bytes in {self.elapsed:.3f}s ({self.throughput / 1e6:.2f} MB/s)'
+
+
+def _transforms(sme: SME256BF | SME256dBF, mode: str) -> tuple:
+    """
+    Selects the in-place and the buffer-to-buffer transformation for a mode.
+
+    SME256dBF keys, full or compact, go through an incremental context, so the
+    evolving matrix is carried from one chunk to the next.
+
+    Args:
+        sme (SME256BF | SME256dBF): The key used to process the data.
+        mode (str): Either 'encrypt' or 'decrypt'.
+
+    Returns:
+        tuple: The (inplace, into) transformations.
+    """
+    if mode not in ('encrypt', 'decrypt'):
+        raise ValueError(f"unknown mode: {mode!r}, expected 'encrypt' or 'decrypt'")
+    if is_dependent(sme):
+        context = sme.encryptor() if mode == 'encrypt' else sme.decryptor()
+        return (lambda buffer: context.update_into(buffer, buffer)), context.update_into
+    if mode == 'encrypt':
+        return sme.encrypt_inplace, sme.encrypt_into
+    return sme.decrypt_inplace, sme.decrypt_into
+
+
+def _check_chunk_size(chunk_size: int) -> None:
+    """
+    Rejects buffer sizes that would make a pipeline end before reading anything.
+
+    Args:
+        chunk_size (int): Size in bytes of the buffer of a pipeline.
+    """
+    if chunk_size <= 0:
+        raise ValueError(f'the chunk size must be positive, got {chunk_size}')
+
+
+def process_stream(sme: SME256BF | SME256dBF, mode: str, reader, writer, chunk_size: int = CHUNK_SIZE) -> PipelineStats:
+    """
+    Encrypts or decrypts everything readable from a binary file object into another one.
+
+    A single buffer of chunk_size bytes is filled with readinto, transformed in place
+    and written out, so memory usage does not depend on the size of the data.
+
+    Args:
+        sme (SME256BF | SME256dBF): The key used to process the data.
+        mode (str): Either 'encrypt' or 'decrypt'.
+        reader: A binary file object supporting readinto.
+        writer: A binary file object supporting write.
+        chunk_size (int): Size in bytes of the reused buffer (default CHUNK_SIZE).
+
+    Returns:
+        PipelineStats: Bytes processed and time spent.
+    """
+    _check_chunk_size(chunk_size)
+    inplace, _ = _transforms(sme, mode)
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    stats = PipelineStats()
+    start_time = default_timer()
+
+    while True:
+        read = reader.readinto(buffer)
+        if not read:
+            break
+        inplace(view[:read])  # Transform the chunk without allocating a new one
+        writer.write(view[:read])
+        stats.processed += read
+
+    stats.elapsed = default_timer() - start_time
+    return stats
+
+
+def process_mapped(sme: SME256BF | SME256dBF, mode: str, reader, writer, chunk_size: int = CHUNK_SIZE) -> PipelineStats:
+    """
+    Encrypts or decrypts a file through a read-only memory map of it.
+
+    The file is never loaded as a whole: the pages of the map are read by the
+    operating system on demand, one chunk at a time, which also works for files
+    larger than the available RAM.
+
+    Args:
+        sme (SME256BF | SME256dBF): The key used to process the data.
+        mode (str): Either 'encrypt' or 'decrypt'.
+        reader: A binary file object backed by a real file descriptor.
+        writer: A binary file object supporting write.
+        chunk_size (int): Size in bytes of the reused output buffer (default CHUNK_SIZE).
+
+    Returns:
+        PipelineStats: Bytes processed and time spent.
+    """
+    _check_chunk_size(chunk_size)
+    _, into = _transforms(sme, mode)
+    size = fstat(reader.fileno()).st_size
+    if size == 0:  # Empty files can not be mapped
+        return process_stream(sme, mode, reader, writer, chunk_size)
+
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    stats = PipelineStats()
+    start_time = default_timer()
+
+    with mmap(reader.fileno(), 0, access=ACCESS_READ) as mapped:
+        source = memoryview(mapped)
+        try:
+            for start in range(0, size, chunk_size):
+                written = into(source[start:start + chunk_size], view)
+                writer.write(view[:written])
+                stats.processed += written
+        finally:
+            source.release()  # The map can not be closed while a view is exported
+
+    stats.elapsed = default_timer() - start_time
+    return stats
+
+
+def process_file(sme: SME256BF | SME256dBF, mode: str, source: str, destination: str, chunk_size: int = CHUNK_SIZE, use_mmap: bool = False) -> PipelineStats:
+    """
+    Encrypts or decrypts a file into another file in bounded memory.
+
+    Args:
+        sme (SME256BF | SME256dBF): The key used to process the data.
+        mode (str): Either 'encrypt' or 'decrypt'.
+        source (str): Path of the file to read.
+        destination (str): Path of the file to write.
+        chunk_size (int): Size in bytes of the reused buffer (default CHUNK_SIZE).
+        use_mmap (bool): Read the source through a memory map instead of readinto (default False).
+
+    Returns:
+        PipelineStats: Bytes processed and time spent.
+    """
+    _check_chunk_size(chunk_size)
+    with open(source, 'rb', buffering=0) as reader, open(destination, 'wb') as writer:
+        if use_mmap:
+            return process_mapped(sme, mode, reader, writer, chunk_size)
+        return process_stream(sme, mode, reader, writer, chunk_size)
+
+
+def encrypt_file(sme: SME256BF | SME256dBF, source: str, destination: str, chunk_size: int = CHUNK_SIZE, use_mmap: bool = False) -> PipelineStats:
+    """
+    Encrypts a file into another file in bounded memory.
+
+    Args:
+        sme (SME256BF | SME256dBF): The key used to encrypt.
+        source (str): Path of the plaintext file.
+        destination (str): Path of the ciphertext file.
+        chunk_size (int): Size in bytes of the reused buffer (default CHUNK_SIZE).
+        use_mmap (bool): Read the source through a memory map (default False).
+
+    Returns:
+        PipelineStats: Bytes processed and time spent.
+    """
+    return process_file(sme, 'encrypt', source, destination, chunk_size, use_mmap)
+
+
+def decrypt_file(sme: SME256BF | SME256dBF, source: str, destination: str, chunk_size: int = CHUNK_SIZE, use_mmap: bool = False) -> PipelineStats:
+    """
+    Decrypts a file into another file in bounded memory.
+
+    Args:
+        sme (SME256BF | SME256dBF): The key used to decrypt.
+        source (str): Path of the ciphertext file.
+        destination (str): Path of the plaintext file.
+        chunk_size (int): Size in bytes of the reused buffer (default CHUNK_SIZE).
+        use_mmap (bool): Read the source through a memory map (default False).
+
+    Returns:
+        PipelineStats: Bytes processed and time spent.
+    """
+    return process_file(sme, 'decrypt', source, destination, chunk_size, use_mmap)
+
+
+class CheckpointIndex:
+    """
+    Sidecar index of SME256dBF states, written every `interval` bytes of a stream.
+
+    A dBF byte can only be decrypted with the matrix left by every previous byte.
+    The index keeps that matrix at each multiple of the interval, so a byte range
+    is decrypted from the nearest checkpoint before it instead of from byte 0.
+    Every checkpoint takes 256 bytes: the index costs 256 / interval of the data
+    and a seek decrypts at most interval - 1 extra bytes. The matrices are key
+    material, they are stored translated by the SME256BF table of the key, and a
+    fingerprint of the key detects an index used with the wrong key.
+    """
+
+    MAGIC = b'SMEDIDX1'
+    HEADER = Struct('<8s8sIQI')  # magic, key fingerprint, interval, stream length, checkpoint count
+
+    def __init__(self, sme: SME256dBF, interval: int = INDEX_INTERVAL) -> None:
+        """
+        Initialize an empty index.
+
+        Args:
+            sme (SME256dBF): The key of the stream.
+            interval (int): Bytes between two checkpoints (default INDEX_INTERVAL).
+        """
+        if interval <= 0:
+            raise ValueError('the checkpoint interval must be positive')
+        self.sme = sme
+        self.interval = interval
+        self.length = 0
+        self.checkpoints = []  # checkpoints[k] is the stored state at byte (k + 1) * interval
+
+    @staticmethod
+    def fingerprint(sme: SME256dBF) -> bytes:
+        """ Returns the 8-byte identifier of a key stored in the index header. """
+        return blake2b(sme.table, digest_size=8, person=b'SMEDIDX1').digest()
+
+    def add(self, state: bytes) -> None:
+        """
+        Appends the checkpoint of the next interval boundary.
+
+        Args:
+            state (bytes): The 256-byte matrix, see DependentByteFlowContext.state.
+        """
+        self.checkpoints.append(state.translate(self.sme.table))
+
+    def nearest(self, offset: int) -> tuple:
+        """
+        Finds the last checkpoint at or before an offset.
+
+        Args:
+            offset (int): Position in the stream.
+
+        Returns:
+            tuple: (position, matrix), matrix is None when the stream has to start from the key.
+        """
+        k = min(offset // self.interval, len(self.checkpoints))
+        if k == 0:
+            return 0, None
+        return k * self.interval, self.checkpoints[k - 1].translate(self.sme.inverse)
+
+    def size(self) -> int:
+        """ Returns the size in bytes of the index file. """
+        return self.HEADER.size + 256 * len(self.checkpoints)
+
+    def dump(self, path: str) -> None:
+        """
+        Writes the index to a file.
+
+        Args:
+            path (str): Destination file.
+        """
+        with open(path, 'wb') as file:
+            file.write(self.HEADER.pack(self.MAGIC, self.fingerprint(self.sme), self.interval, self.length, len(self.checkpoints)))
+            for checkpoint in self.checkpoints:
+                file.write(checkpoint)
+
+    @classmethod
+    def load(cls, sme: SME256dBF, path: str) -> 'CheckpointIndex':
+        """
+        Reads an index written by dump().
+
+        Args:
+            sme (SME256dBF): The key of the stream.
+            path (str): Source file.
+
+        Returns:
+            CheckpointIndex: The loaded index.
+
+        Raises:
+            ValueError: If the file is not an index, is truncated or belongs to another key.
+        """
+        with open(path, 'rb') as file:
+            data = file.read()
+        try:
+            magic, fingerprint, interval, length, count = cls.HEADER.unpack_from(data, 0)
+        except StructError:
+            magic = None
+        if magic != cls.MAGIC or len(data) != cls.HEADER.size + 256 * count or interval <= 0:
+            print("Error30: Checkpoint index is corrupted or belongs to another key.")
+            raise ValueError("checkpoint index is corrupted")
+        if fingerprint != cls.fingerprint(sme):
+            print("Error30: Checkpoint index is corrupted or belongs to another key.")
+            raise ValueError("checkpoint index belongs to another key")
+
+        index = cls(sme, interval)
+        index.length = length
+        index.checkpoints = [data[start:start + 256] for start in range(cls.HEADER.size, len(data), 256)]
+        return index
+
+
+def process_stream_indexed(sme: SME256dBF, mode: str, reader, writer, index: CheckpointIndex, chunk_size: int = CHUNK_SIZE) -> PipelineStats:
+    """
+    Encrypts or decrypts a SME256dBF stream, recording a checkpoint every index.interval bytes.
+
+    Encrypting and decrypting go through the same states, so the index can be written
+    while encrypting or rebuilt later from the ciphertext (with writer None).
+
+    Args:
+        sme (SME256dBF): The key used to process the data.
+        mode (str): Either 'encrypt' or 'decrypt'.
+        reader: A binary file object supporting readinto.
+        writer: A binary file object supporting write, or None to only build the index.
+        index (CheckpointIndex): The empty index to fill.
+        chunk_size (int): Size in bytes of the reused buffer (default CHUNK_SIZE).
+
+    Returns:
+        PipelineStats: Bytes processed and time spent.
+    """
+    _check_chunk_size(chunk_size)
+    context = sme.encryptor() if mode == 'encrypt' else sme.decryptor()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    stats = PipelineStats()
+    start_time = default_timer()
+
+    while True:
+        read = reader.readinto(buffer)
+        if not read:
+            break
+        start = 0
+        while start < read:  # Cut the chunk at every checkpoint boundary
+            end = min(read, start + index.interval - context.processed % index.interval)
+            context.update_into(view[start:end], view[start:end])
+            if context.processed % index.interval == 0:
+                index.add(context.state())
+            start = end
+        if writer is not None:
+            writer.write(view[:read])
+        stats.processed += read
+
+    index.length = stats.processed
+    stats.elapsed = default_timer() - start_time
+    return stats
+
+
+def encrypt_file_indexed(sme: SME256dBF, source: str, destination: str, index_path: str = None, interval: int = INDEX_INTERVAL, chunk_size: int = CHUNK_SIZE) -> CheckpointIndex:
+    """
+    Encrypts a file with SME256dBF and writes its checkpoint index next to it.
+
+    Args:
+        sme (SME256dBF): The key used to encrypt.
+        source (str): Path of the plaintext file.
+        destination (str): Path of the ciphertext file.
+        index_path (str): Path of the index (default destination + '.idx').
+        interval (int): Bytes between two checkpoints, trades index size for seek time (default INDEX_INTERVAL).
+        chunk_size (int): Size in bytes of the reused buffer (default CHUNK_SIZE).
+
+    Returns:
+        CheckpointIndex: The written index.
+    """
+    _check_chunk_size(chunk_size)
+    index = CheckpointIndex(sme, interval)
+    with open(source, 'rb', buffering=0) as reader, open(destination, 'wb') as writer:
+        process_stream_indexed(sme, 'encrypt', reader, writer, index, chunk_size)
+    index.dump(index_path or destination + '.idx')
+    return index
+
+
+def build_index(sme: SME256dBF, source: str, index_path: str = None, interval: int = INDEX_INTERVAL, chunk_size: int = CHUNK_SIZE) -> CheckpointIndex:
+    """
+    Builds the checkpoint index of an existing SME256dBF ciphertext file.
+
+    Args:
+        sme (SME256dBF): The key of the file.
+        source (str): Path of the ciphertext file.
+        index_path (str): Path of the index (default source + '.idx').
+        interval (int): Bytes between two checkpoints (default INDEX_INTERVAL).
+        chunk_size (int): Size in bytes of the reused buffer (default CHUNK_SIZE).
+
+    Returns:
+        CheckpointIndex: The written index.
+    """
+    index = CheckpointIndex(sme, interval)
+    with open(source, 'rb', buffering=0) as reader:
+        process_stream_indexed(sme, 'decrypt', reader, None, index, chunk_size)
+    index.dump(index_path or source + '.idx')
+    return index
+
+
+def decrypt_range(sme: SME256BF | SME256dBF, reader, offset: int, length: int, index: CheckpointIndex = None, chunk_size: int = CHUNK_SIZE) -> bytes:
+    """
+    Decrypts length bytes of a ciphertext starting at offset.
+
+    SME256BF bytes are independent and are decrypted in place. SME256dBF resumes
+    from the nearest checkpoint of the index before offset (from the start of the
+    file without an index) and decrypts the gap up to offset without keeping it.
+
+    Args:
+        sme (SME256BF | SME256dBF): The key of the ciphertext.
+        reader: A seekable binary file object holding the ciphertext.
+        offset (int): First byte to decrypt.
+        length (int): Number of bytes to decrypt, fewer are returned at the end of the file.
+        index (CheckpointIndex): Checkpoints of the ciphertext, SME256dBF only (default None).
+        chunk_size (int): Size in bytes of the reused buffer for the gap (default CHUNK_SIZE).
+
+    Returns:
+        bytes: The plaintext of the range.
+    """
+    _check_chunk_size(chunk_size)
+    if not is_dependent(sme):
+        reader.seek(offset)
+        return sme.decrypt(reader.read(length))
+
+    context = _decryptor_at(sme, reader, offset, index, memoryview(bytearray(chunk_size)))
+    return context.update(reader.read(length)) if context is not None else b''
+
+
+def process_range(sme: SME256BF | SME256dBF, reader, writer, offset: int, length: int = None, index: CheckpointIndex = None, chunk_size: int = CHUNK_SIZE) -> PipelineStats:
+    """
+    Decrypts a range of a ciphertext into a binary file object, one reused buffer at a time.
+
+    Same positioning as decrypt_range, but the range is streamed through a single
+    buffer of chunk_size bytes instead of being returned, so memory usage does not
+    depend on the length of the range.
+
+    Args:
+        sme (SME256BF | SME256dBF): The key of the ciphertext.
+        reader: A seekable binary file object holding the ciphertext.
+        writer: A binary file object supporting write.
+        offset (int): First byte to decrypt.
+        length (int): Number of bytes to decrypt (default None, up to the end of the file).
+        index (CheckpointIndex): Checkpoints of the ciphertext, SME256dBF only (default None).
+        chunk_size (int): Size in bytes of the reused buffer (default CHUNK_SIZE).
+
+    Returns:
+        PipelineStats: Bytes written and time spent, the gap included.
+    """
+    _check_chunk_size(chunk_size)
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    stats = PipelineStats()
+    start_time = default_timer()
+
+    if is_dependent(sme):
+        context = _decryptor_at(sme, reader, offset, index, view)
+        inplace = (lambda chunk: context.update_into(chunk, chunk)) if context is not None else None
+    else:
+        reader.seek(offset)
+        inplace = sme.decrypt_inplace
+
+    remaining = length
+    while inplace is not None and (remaining is None or remaining > 0):
+        read = reader.readinto(view[:chunk_size if remaining is None else min(chunk_size, remaining)])
+        if not read:
+            break
+        inplace(view[:read])
+        writer.write(view[:read])
+        stats.processed += read
+        if remaining is not None:
+            remaining -= read
+
+    stats.elapsed = default_timer() - start_time
+    return stats
+
+
+def _decryptor_at(sme: SME256dBF, reader, offset: int, index: CheckpointIndex, view: memoryview):
+    """
+    Brings a SME256dBF decryption context and the reader to offset.
+
+    Resumes from the nearest checkpoint before offset (from the start of the file
+    without an index) and decrypts the gap in view without keeping it.
+
+    Returns:
+        DependentByteFlowContext: The context at offset, None if the file ends before it.
+    """
+    position, matrix = index.nearest(offset) if index is not None else (0, None)
+    context = sme.decryptor(matrix, position)
+    reader.seek(position)
+    while position < offset:  # Decrypt and drop the gap to bring the state to offset
+        read = reader.readinto(view[:min(len(view), offset - position)])
+        if not read:
+            return None
+        context.update_into(view[:read], view[:read])
+        position += read
+    return context
+
+
+class EncryptedFile(RawIOBase):
+    """
+    Binary file object over a SME256BF ciphertext, holding the plaintext view of it.
+
+    SME256BF bytes are independent, so every read or write only translates the bytes
+    it touches, at any offset. The object implements io.RawIOBase and can be handed
+    to any code expecting a binary file; open_encrypted wraps it in the usual
+    buffered reader/writer. With use_mmap, a read-only file is read through a memory
+    map and decrypted straight into the caller buffer, without a read system call.
+    """
+
+    MODES = ('rb', 'r+b', 'wb', 'w+b')
+
+    def __init__(self, sme: SME256BF, file, mode: str = 'rb', use_mmap: bool = False) -> None:
+        """
+        Opens an encrypted file.
+
+        Args:
+            sme (SME256BF): The key of the file.
+            file: A path, or a seekable binary file object left open by close().
+            mode (str): One of 'rb', 'r+b', 'wb' or 'w+b' (default 'rb').
+            use_mmap (bool): Read through a memory map, 'rb' only (default False).
+
+        Raises:
+            ValueError: If the mode is not supported, use_mmap is used to write or the key is a dBF key.
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"mode must be one of {', '.join(self.MODES)}")
+        if use_mmap and mode != 'rb':
+            raise ValueError("use_mmap is only supported in 'rb' mode")
+        if is_dependent(sme):
+            raise ValueError("random access needs a SME256BF key, SME256dBF bytes depend on all the previous ones")
+        super().__init__()
+        self.sme = sme
+        self.mode = mode
+        self._owned = isinstance(file, (str, bytes, PathLike))
+        self._file = open(file, mode, buffering=0) if self._owned else file
+        self._position = 0
+        self._map = None
+        if use_mmap:
+            size = fstat(self._file.fileno()).st_size
+            if size:  # An empty file cannot be mapped, every read returns 0 bytes anyway
+                self._map = mmap(self._file.fileno(), 0, access=ACCESS_READ)
+
+    @property
+    def name(self):
+        """ Returns the name of the underlying file. """
+        return getattr(self._file, 'name', None)
+
+    def readable(self) -> bool:
+        return self.mode != 'wb'
+
+    def writable(self) -> bool:
+        return self.mode != 'rb'
+
+    def seekable(self) -> bool:
+        return True
+
+    def fileno(self) -> int:
+        return self._file.fileno()
+
+    def size(self) -> int:
+        """ Returns the size of the file, plaintext and ciphertext have the same length. """
+        if self._map is not None:
+            return len(self._map)
+        return self._file.seek(0, SEEK_END)
+
+    def tell(self) -> int:
+        self._checkClosed()
+        return self._position
+
+    def seek(self, offset: int, whence: int = SEEK_SET) -> int:
+        """
+        Moves the position, nothing is read or decrypted.
+
+        Args:
+            offset (int): The offset, relative to whence.
+            whence (int): SEEK_SET, SEEK_CUR or SEEK_END (default SEEK_SET).
+
+        Returns:
+            int: The new absolute position.
+        """
+        self._checkClosed()
+        if whence == SEEK_CUR:
+            offset += self._position
+        elif whence == SEEK_END:
+            offset += self.size()
+        elif whence != SEEK_SET:
+            raise ValueError(f'invalid whence ({whence})')
+        if offset < 0:
+            raise ValueError(f'negative seek position {offset}')
+        self._position = offset
+        return offset
+
+    def readinto(self, buffer) -> int:
+        """
+        Reads and decrypts bytes at the current position into a writable buffer.
+
+        Args:
+            buffer: The writable buffer to fill.
+
+        Returns:
+            int: The number of bytes read, 0 at the end of the file.
+        """
+        self._checkClosed()
+        self._checkReadable()
+        view = memoryview(buffer).cast('B')
+        if self._map is not None:
+            read = max(0, min(len(view), len(self._map) - self._position))
+            self.sme.decrypt_into(memoryview(self._map)[self._position:self._position + read], view[:read])
+        else:
+            self._file.seek(self._position)
+            read = self._file.readinto(view) or 0
+            self.sme.decrypt_inplace(view[:read])
+        self._position += read
+        return read
+
+    def write(self, data) -> int:
+        """
+        Encrypts and writes bytes at the current position.
+
+        Writing past the end of the file fills the gap with zeros, as a plain file does.
+
+        Args:
+            data: The plaintext (any bytes-like object).
+
+        Returns:
+            int: The number of bytes written.
+        """
+        self._checkClosed()
+        self._checkWritable()
+        view = memoryview(data).cast('B')
+        end = self._file.seek(0, SEEK_END)
+        while end < self._position:  # A hole would read as ciphertext zeros, write encrypted zeros instead
+            gap = min(CHUNK_SIZE, self._position - end)
+            self._file.write(bytes(gap).translate(self.sme.table))
+            end += gap
+        self._file.seek(self._position)
+        for start in range(0, len(view), CHUNK_SIZE):  # Bounded temporary memory for large writes
+            self._file.write(view[start:start + CHUNK_SIZE].tobytes().translate(self.sme.table))
+        self._position += len(view)
+        return len(view)
+
+    def truncate(self, size: int = None) -> int:
+        """
+        Resizes the file, to the current position by default.
+
+        Args:
+            size (int): The new size (default the current position).
+
+        Returns:
+            int: The new size.
+        """
+        self._checkClosed()
+        self._checkWritable()
+        return self._file.truncate(self._position if size is None else size)
+
+    def flush(self) -> None:
+        if not self.closed and self.writable():
+            self._file.flush()
+
+    def close(self) -> None:
+        """ Unmaps the file and closes it when it was opened from a path. """
+        if self.closed:
+            return
+        try:
+            super().close()
+        finally:
+            if self._map is not None:
+                self._map.close()
+            if self._owned:
+                self._file.close()
+
+
+def open_encrypted(sme: SME256BF, file, mode: str = 'rb', buffering: int = -1, use_mmap: bool = False):
+    """
+    Opens a SME256BF ciphertext as a plaintext binary file, like the built-in open().
+
+    Args:
+        sme (SME256BF): The key of the file.
+        file: A path, or a seekable binary file object.
+        mode (str): One of 'rb', 'r+b', 'wb' or 'w+b' (default 'rb').
+        buffering (int): 0 returns the unbuffered EncryptedFile, otherwise the buffer
+            size of the wrapper, -1 for io.DEFAULT_BUFFER_SIZE (default -1).
+        use_mmap (bool): Read through a memory map, 'rb' only (default False).
+
+    Returns:
+        EncryptedFile | BufferedReader | BufferedWriter | BufferedRandom: The file object.
+    """
+    raw = EncryptedFile(sme, file, mode, use_mmap)
+    if buffering == 0:
+        return raw
+    size = DEFAULT_BUFFER_SIZE if buffering < 0 else buffering
+    if mode == 'rb':
+        return BufferedReader(raw, size)
+    if mode == 'wb':
+        return BufferedWriter(raw, size)
+    return BufferedRandom(raw, size)
+
+
+def process_stream_parallel(sme: SME256BF, mode: str, reader, writer, chunk_size: int = CLI_CHUNK_SIZE, workers: int = None) -> PipelineStats:
+    """
+    Encrypts or decrypts a stream with SME256BF on several cores.
+
+    Each chunk is read straight into a shared memory segment, translated in place
+    by a ParallelSME256BF pool and written out from the same segment.
+
+    Args:
+        sme (SME256BF): The key used to process the data.
+        mode (str): Either 'encrypt' or 'decrypt'.
+        reader: A binary file object supporting readinto.
+        writer: A binary file object supporting write.
+        chunk_size (int): Size in bytes of the shared buffer (default CLI_CHUNK_SIZE).
+        workers (int): Number of worker processes (default the number of CPUs).
+
+    Returns:
+        PipelineStats: Bytes processed and time spent.
+    """
+    from parallelSME import ParallelSME256BF  # Imported here, starting a pool is only needed by this mode
+    from multiprocessing.shared_memory import SharedMemory
+
+    _check_chunk_size(chunk_size)
+    stats = PipelineStats()
+    start_time = default_timer()
+    with ParallelSME256BF(sme, workers) as parallel:
+        segment = SharedMemory(create=True, size=chunk_size)
+        try:
+            while True:
+                read = _fill(reader, segment.buf)
+                if not read:
+                    break
+                parallel.process_shared(segment, mode, read)
+                writer.write(segment.buf[:read])
+                stats.processed += read
+        finally:
+            segment.close()
+            segment.unlink()
+
+    stats.elapsed = default_timer() - start_time
+    return stats
+
+
+def _fill(reader, view) -> int:
+    """
+    Reads into a buffer until it is full or the stream ends, pipes return short reads.
+
+    Returns:
+        int: The number of bytes read.
+    """
+    filled = 0
+    while filled < len(view):
+        read = reader.readinto(view[filled:])
+        if not read:
+            break
+        filled += read
+    return filled
+
+
+def _open(path: str, mode: str, standard):
+    """ Opens a binary file, '-' selects the binary buffer of a standard stream instead. """
+    if path == '-':
+        return nullcontext(standard.buffer)
+    return open(path, mode, buffering=0) if mode == 'rb' else open(path, mode)
+
+
+def main(argv: list = None) -> int:
+    """
+    Command line entry point: python -m streamSME {encrypt,decrypt} [source] [destination]
+
+    Source and destination default to stdin and stdout, so the command can sit in a
+    shell pipeline.
+
+    Args:
+        argv (list): Arguments to parse (default sys.argv[1:]).
+
+    Returns:
+        int: The exit status.
+    """
+    parser = ArgumentParser(prog='python -m streamSME', description='Encrypt or decrypt files or pipes with SME256BF or SME256dBF in bounded memory.')
+    parser.add_argument('mode', choices=['encrypt', 'decrypt'])
+    parser.add_argument('source', nargs='?', default='-', help="file to read, '-' for stdin (default)")
+    parser.add_argument('destination', nargs='?', default='-', help="file to write, '-' for stdout (default)")
+    parser.add_argument('-a', '--algorithm', choices=['bf', 'dbf'], default='bf', help='SME256BF or SME256dBF (default bf)')
+    password = parser.add_mutually_exclusive_group(required=True)
+    password.add_argument('-p', '--password', help='password as text (encoded as UTF-8)')
+    password.add_argument('--password-hex', help='password as hexadecimal bytes')
+    password.add_argument('--password-file', help='read the password bytes from a file')
+    password.add_argument('--key-id', help='load the derived key from --keystore instead of a password')
+    parser.add_argument('--keystore', help='keystore file used with --key-id')
+    parser.add_argument('--chunk-size', type=int, default=CLI_CHUNK_SIZE, help=f'buffer size in bytes (default {CLI_CHUNK_SIZE})')
+    parser.add_argument('--mmap', action='store_true', help='read the source through a memory map')
+    parser.add_argument('-w', '--workers', type=int, default=0, help='worker processes for bf, 0 runs in this process (default 0)')
+    parser.add_argument('--stats', action='store_true', help='report key derivation time and throughput on stderr')
+    parser.add_argument('--metrics', help='write the metrics of the run as JSON to this file')
+    parser.add_argument('--index', help='dbf checkpoint index: written by a full pass, read by --offset')
+    parser.add_argument('--index-interval', type=int, default=INDEX_INTERVAL, help=f'bytes between two checkpoints (default {INDEX_INTERVAL})')
+    parser.add_argument('--offset', type=int, help='decrypt only from this byte of a seekable source')
+    parser.add_argument('--length', type=int, help='bytes to decrypt with --offset (default up to the end)')
+    args = parser.parse_intermixed_args(argv)  # Files may follow the options
+
+    if args.chunk_size <= 0:
+        parser.error('--chunk-size must be a positive number of bytes')
+    if args.index_interval <= 0:
+        parser.error('--index-interval must be a positive number of bytes')
+    if args.workers and args.algorithm == 'dbf':
+        parser.error('--workers is only supported by the bf algorithm, every dBF byte depends on the previous ones')
+    if args.key_id is not None and args.keystore is None:
+        parser.error('--key-id needs --keystore')
+    if args.index and args.algorithm != 'dbf':
+        parser.error('--index is only used by the dbf algorithm, bf bytes are decrypted in place')
+    if (args.offset is not None or args.length is not None) and (args.mode != 'decrypt' or args.source == '-'):
+        parser.error('--offset and --length decrypt a range of a source file')
+    if args.workers and args.offset is not None:
+        parser.error('--workers cannot be combined with --offset')
+
+    cls = SME256dBF if args.algorithm == 'dbf' else SME256BF
+    metrics = enable_metrics(MetricsRegistry()) if args.metrics else None
+    start_time = default_timer()
+    if args.key_id is not None:
+        from keystoreSME import KeyStore
+        with KeyStore(args.keystore) as store:
+            sme = cls.from_table(*store.tables(args.key_id), verify=False)
+    else:
+        if args.password is not None:
+            key = args.password.encode()
+        elif args.password_hex is not None:
+            key = bytes.fromhex(args.password_hex)
+        else:
+            with open(args.password_file, 'rb') as file:
+                key = file.read()
+        if len(key) < 16:  # The warning of SME256 goes to stdout, which may be the output
+            print('WARNING: Password too short, recommend the use of a longer password', file=sys.stderr)
+        sme = cls(password=key, warnings=False)
+    derivation = default_timer() - start_time
+
+    with _open(args.source, 'rb', sys.stdin) as reader, _open(args.destination, 'wb', sys.stdout) as writer:
+        if args.offset is not None or args.length is not None:
+            index = CheckpointIndex.load(sme, args.index) if args.index else None
+            stats = process_range(sme, reader, writer, args.offset or 0, args.length, index, args.chunk_size)
+        elif args.index:
+            index = CheckpointIndex(sme, args.index_interval)
+            stats = process_stream_indexed(sme, args.mode, reader, writer, index, args.chunk_size)
+            index.dump(args.index)
+        elif args.workers:
+            stats = process_stream_parallel(sme, args.mode, reader, writer, args.chunk_size, args.workers)
+        elif args.mmap:
+            stats = process_mapped(sme, args.mode, reader, writer, args.chunk_size)
+        else:
+            stats = process_stream(sme, args.mode, reader, writer, args.chunk_size)
+        writer.flush()
+
+    if args.stats:
+        print(f'Key {"loading" if args.key_id is not None else "derivation"}: {derivation * 1e3:.3f} ms', file=sys.stderr)
+        print(f'{args.mode.capitalize()}ed {stats}', file=sys.stderr)
+    if metrics is not None:
+        metrics.dump(args.metrics)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
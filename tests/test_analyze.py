@@ -0,0 +1,37 @@
+#Copyright 2025 yo525
+#SPDX-License-Identifier: Apache-2.0
+
+import unittest
+
+from SME import SME256
+from analyzeSME import analyze_matrix
+
+
+class AnalyzeMatrixTest(unittest.TestCase):
+
+    def test_derived_matrix_is_a_permutation(self):
+        result = analyze_matrix(SME256(b'analyze test password', warnings=False).matrix)
+        self.assertTrue(result['valid'])
+        self.assertEqual((result['repeated'], result['missing'], result['out_of_range']), ({}, [], []))
+        self.assertEqual(sum(result['cycles']), 256)
+
+    def test_out_of_range_values_are_reported(self):
+        matrix = list(range(0, 256))
+        matrix[3], matrix[4], matrix[5] = -1, 256, 1.5  # -1 used to count as 255
+        result = analyze_matrix(matrix)
+        self.assertFalse(result['valid'])
+        self.assertEqual(result['out_of_range'], [(3, -1), (4, 256), (5, 1.5)])
+        self.assertEqual(result['missing'], [3, 4, 5])
+        self.assertEqual(result['repeated'], {})
+        self.assertNotIn('cycles', result)
+
+    def test_repeated_values_are_reported(self):
+        matrix = list(range(0, 256))
+        matrix[0] = 1
+        result = analyze_matrix(matrix)
+        self.assertFalse(result['valid'])
+        self.assertEqual((result['repeated'], result['missing']), ({1: 2}, [0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+#Copyright 2025 yo525
+#SPDX-License-Identifier: Apache-2.0
+
+import types
+import unittest
+
+import SME
+
+
+class PublicApiTest(unittest.TestCase):
+
+    def test_star_import_exports_the_public_api_only(self):
+        namespace = {}
+        exec('from SME import *', namespace)
+        exported = set(namespace) - {'__builtins__'}
+        self.assertEqual(exported, set(SME.__all__))
+        for name in ('time', 'perf_counter', 'np', 'json', 'Lock', 'urandom'):
+            self.assertNotIn(name, exported)
+
+    def test_every_public_name_is_listed(self):
+        public = {
+            name for name, value in vars(SME).items()
+            if not name.startswith('_') and not isinstance(value, types.ModuleType)
+            and getattr(value, '__module__', 'SME') == 'SME'
+        }
+        self.assertEqual(public - set(SME.__all__), set())
+
+
+if __name__ == '__main__':
+    unittest.main()
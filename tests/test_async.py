@@ -0,0 +1,183 @@
+#Copyright 2025 yo525
+#SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import os
+import socket
+import threading
+import unittest
+
+from SME import SME256BF, SME256dBF
+from asyncSME import OFFLOAD_THRESHOLD, EncryptedProtocol, wrap_streams
+
+PASSWORD = b'async test password'
+
+
+def pieces():
+    """ Small inline pieces mixed with pieces big enough to be offloaded. """
+    sizes = (1, 100, OFFLOAD_THRESHOLD + 3, 7, OFFLOAD_THRESHOLD * 2, 0, 500, OFFLOAD_THRESHOLD)
+    return [os.urandom(size) for size in sizes]
+
+
+class _Collector(asyncio.Protocol):
+    """ Application protocol that keeps what it receives and how the connection ended. """
+
+    def __init__(self):
+        self.received = bytearray()
+        self.eof = False
+        self.done = asyncio.get_running_loop().create_future()
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        self.assertOpen()
+        self.received += data
+
+    def eof_received(self):
+        self.assertOpen()
+        self.eof = True
+        return False
+
+    def connection_lost(self, exc):
+        if not self.done.done():
+            self.done.set_result(exc)
+
+    def assertOpen(self):
+        if self.done.done():
+            raise AssertionError('data delivered after connection_lost')
+
+
+class AsyncStreamTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.keys = (SME256BF(PASSWORD, warnings=False), SME256dBF(PASSWORD, warnings=False))
+        self.left, self.right = socket.socketpair()
+
+    async def asyncTearDown(self):
+        self.left.close()
+        self.right.close()
+
+    async def test_stream_wrappers_round_trip(self):
+        for sme in self.keys:
+            with self.subTest(key=type(sme).__name__):
+                left, right = socket.socketpair()
+                reader, writer = wrap_streams(*await asyncio.open_connection(sock=left), sme)
+                raw_reader, raw_writer = await asyncio.open_connection(sock=right)
+                peer_reader, peer_writer = wrap_streams(raw_reader, raw_writer, sme)
+                data = pieces()
+                for k, piece in enumerate(data):
+                    if k % 2:
+                        await writer.send(piece)
+                    else:
+                        writer.write(piece)
+                writer.write_eof()
+                await writer.drain()
+                received = bytearray()
+                async for piece in peer_reader:
+                    received += piece
+                self.assertEqual(bytes(received), b''.join(data))
+                self.assertTrue(peer_reader.at_eof())
+                # The other direction keeps its own state
+                peer_writer.write(b'reply')
+                await peer_writer.drain()
+                self.assertEqual(await reader.readexactly(5), b'reply')
+                peer_writer.close()
+                with self.assertRaises(asyncio.IncompleteReadError):
+                    await reader.readexactly(1)
+                writer.close()
+                await writer.wait_closed()
+                await peer_writer.wait_closed()
+
+    async def test_protocol_encrypts_in_order(self):
+        loop = asyncio.get_running_loop()
+        for sme in self.keys:
+            with self.subTest(key=type(sme).__name__):
+                left, right = socket.socketpair()
+                application = _Collector()
+                await loop.create_connection(lambda: EncryptedProtocol(application, sme), sock=left)
+                reader, writer = await asyncio.open_connection(sock=right)
+                data = pieces()
+                for piece in data:
+                    application.transport.write(piece)
+                application.transport.write_eof()  # Deferred until the offloaded pieces are written
+                ciphertext = await reader.read()
+                self.assertEqual(ciphertext, sme.encrypt(b''.join(data)))
+                writer.close()
+                self.assertIsNone(await application.done)
+                await writer.wait_closed()
+
+    async def test_protocol_decrypts_in_order_then_eof(self):
+        loop = asyncio.get_running_loop()
+        for sme in self.keys:
+            with self.subTest(key=type(sme).__name__):
+                left, right = socket.socketpair()
+                application = _Collector()
+                await loop.create_connection(lambda: EncryptedProtocol(application, sme), sock=left)
+                reader, writer = await asyncio.open_connection(sock=right)
+                data = pieces()
+                ciphertext = sme.encrypt(b''.join(data))
+                offset = 0
+                for piece in data:
+                    writer.write(ciphertext[offset:offset + len(piece)])
+                    offset += len(piece)
+                    await writer.drain()
+                writer.write_eof()
+                self.assertIsNone(await application.done)
+                self.assertEqual(bytes(application.received), b''.join(data))
+                self.assertTrue(application.eof)
+                writer.close()
+                await writer.wait_closed()
+
+    async def test_protocol_reports_failed_pieces(self):
+        loop = asyncio.get_running_loop()
+        application = _Collector()
+        _, adapter = await loop.create_connection(lambda: EncryptedProtocol(application, self.keys[1]), sock=self.left)
+        reader, writer = await asyncio.open_connection(sock=self.right)
+
+        def fail(data):
+            raise ValueError('broken piece')
+
+        adapter.incoming.transformer.transform = fail
+        adapter.incoming.transformer.offloaded = lambda data: True  # Fail in the queued task, not inline
+        writer.write(os.urandom(OFFLOAD_THRESHOLD))
+        await writer.drain()
+        exc = await asyncio.wait_for(application.done, 10)
+        self.assertIsInstance(exc, ValueError)
+        self.assertEqual(application.received, b'')
+        with self.assertRaises(ValueError):
+            adapter.incoming.submit(b'more')
+        writer.close()
+
+    async def test_deferred_connection_lost_gets_the_failure(self):
+        loop = asyncio.get_running_loop()
+        application = _Collector()
+        _, adapter = await loop.create_connection(lambda: EncryptedProtocol(application, self.keys[1]), sock=self.left)
+        reader, writer = await asyncio.open_connection(sock=self.right)
+        release = threading.Event()
+
+        def fail(data):
+            release.wait(10)
+            raise ValueError('broken piece')
+
+        adapter.incoming.transformer.transform = fail
+        adapter.incoming.transformer.offloaded = lambda data: True
+        writer.write(os.urandom(OFFLOAD_THRESHOLD))
+        await writer.drain()
+        while not adapter.incoming.busy:
+            await asyncio.sleep(0.01)
+        application.transport.abort()  # The socket goes away while the piece is in flight
+        for _ in range(1000):
+            if adapter._lost_pending is not None:
+                break
+            await asyncio.sleep(0.01)
+        self.assertIsNotNone(adapter._lost_pending)  # connection_lost waits for the piece in flight
+        release.set()
+        exc = await asyncio.wait_for(application.done, 10)
+        self.assertIsInstance(exc, ValueError)
+        self.assertEqual(application.received, b'')
+        writer.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+#Copyright 2025 yo525
+#SPDX-License-Identifier: Apache-2.0
+
+import unittest
+
+import SME
+from SME import SME256, SME256dBF, DependentByteFlow, KeyScheduleBackend, ScheduleProfiler, available_backends, get_backend, register_backend, set_backend
+from verifySME import check_backends
+
+SEED = 525
+COUNT = 20
+
+
+class BackendTest(unittest.TestCase):
+
+    def setUp(self):
+        self.selected = SME256.backend
+
+    def tearDown(self):
+        SME256.backend = self.selected
+
+    def test_every_backend_matches_the_reference(self):
+        names = [name for name in available_backends() if not name.endswith('+verify')]
+        self.assertIn('python', names)
+        for name in names:
+            with self.subTest(backend=name):
+                check_backends(COUNT, SEED, [name])
+
+    def test_every_verified_backend_matches_the_reference(self):
+        for name in [name for name in available_backends() if not name.endswith('+verify')]:
+            with self.subTest(backend=name):
+                verified = set_backend(name, verify=True)
+                self.assertEqual(verified, name + '+verify')
+                self.assertEqual(SME256.backend, verified)
+                before = get_backend(verified).checked
+                check_backends(COUNT, SEED, [verified])
+                self.assertGreater(get_backend(verified).checked, before)
+
+    def test_dbf_runs_the_bytes_engine_whatever_the_backend(self):
+        sme = SME256dBF(b'engine test password', warnings=False)
+        expected = sme.encrypt(b'payload' * 50)
+        for name in ('python', 'numpy'):
+            if name not in available_backends():
+                continue
+            with self.subTest(backend=name):
+                set_backend(name)
+                self.assertEqual(DependentByteFlow(sme.table).backend, 'python')
+                self.assertEqual(sme.encrypt(b'payload' * 50), expected)
+                self.assertEqual(sme.decrypt(expected), b'payload' * 50)
+
+    def test_profiled_derivation_runs_the_selected_backend(self):
+        password = b'profiled backend password'
+        expected = SME256(password, warnings=False, cache=False).matrix
+        message = SME256dBF(password, warnings=False).encrypt(b'profiled payload')
+        names = [name for name in available_backends() if name != 'reference' and not name.endswith('+verify')]
+        for name in names + [set_backend(name, verify=True) for name in names]:
+            with self.subTest(backend=name):
+                SME256.backend = name
+                before = get_backend(name).checked if name.endswith('+verify') else None
+                with ScheduleProfiler() as profiler:
+                    self.assertEqual(SME256(password, warnings=False, cache=False).matrix, expected)
+                    self.assertEqual(SME256dBF(password, warnings=False, cache=False).encrypt(b'profiled payload'), message)
+                self.assertGreater(profiler.counters['steps'], len(password))
+                if before is not None:
+                    self.assertGreater(get_backend(name).checked, before)
+
+    def test_backends_without_profiled_path_are_rejected(self):
+        register_backend(KeyScheduleBackend('untabled', get_backend('python').derive))
+        try:
+            for name in ('reference', 'untabled'):
+                with self.subTest(backend=name):
+                    SME256.backend = name
+                    with ScheduleProfiler(), self.assertRaises(ValueError):
+                        SME256(b'profiled backend password', warnings=False, cache=False)
+        finally:
+            SME._backends.pop('untabled', None)
+
+    def test_verify_rejects_a_wrong_backend(self):
+        python = get_backend('python')
+
+        def derive(matrix, values):
+            matrix = list(python.derive(matrix, values))
+            matrix[0], matrix[1] = matrix[1], matrix[0]
+            return matrix
+
+        register_backend(KeyScheduleBackend('broken', derive))
+        try:
+            with self.assertRaises(AssertionError):
+                check_backends(COUNT, SEED, ['broken'])
+            with self.assertRaises(RuntimeError):
+                check_backends(COUNT, SEED, [set_backend('broken', verify=True)])
+        finally:
+            SME._backends.pop('broken', None)
+            SME._backends.pop('broken+verify', None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+#Copyright 2025 yo525
+#SPDX-License-Identifier: Apache-2.0
+
+import io
+import os
+import pickle
+import tempfile
+import unittest
+
+from SME import SME256BF, SME256dBF, SME256BFKey, SME256dBFKey
+from keystoreSME import KeyStore, build_keystore
+from streamSME import EncryptedFile, CheckpointIndex, decrypt_range, process_stream, process_stream_indexed
+
+PASSWORD = b'compact key test password'
+
+
+class CompactKeyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.payload = os.urandom(5000)
+
+    def test_same_tables_and_output_as_full_keys(self):
+        for full, compact in ((SME256BF, SME256BFKey), (SME256dBF, SME256dBFKey)):
+            sme, key = full(PASSWORD, warnings=False), compact.from_password(PASSWORD)
+            self.assertEqual((key.table, key.inverse), (sme.table, sme.inverse))
+            self.assertEqual(key.encrypt(self.payload), sme.encrypt(self.payload))
+            self.assertEqual(key.decrypt(sme.encrypt(self.payload)), self.payload)
+
+    def test_pickle_keeps_only_the_table(self):
+        key = SME256dBFKey.from_password(PASSWORD)
+        data = pickle.dumps(key)
+        self.assertLess(len(data), 400)
+        self.assertEqual(pickle.loads(data), key)
+        self.assertFalse(hasattr(key, '__dict__'))
+
+    def test_chunked_round_trip(self):
+        for compact in (SME256BFKey, SME256dBFKey):
+            key = compact.from_password(PASSWORD)
+            with self.subTest(key=compact.__name__):
+                ciphertext = io.BytesIO()
+                process_stream(key, 'encrypt', io.BytesIO(self.payload), ciphertext, chunk_size=777)
+                self.assertEqual(ciphertext.getvalue(), key.encrypt(self.payload))
+                plaintext = io.BytesIO()
+                process_stream(key, 'decrypt', io.BytesIO(ciphertext.getvalue()), plaintext, chunk_size=500)
+                self.assertEqual(plaintext.getvalue(), self.payload)
+
+    def test_decrypt_range(self):
+        bf, dbf = SME256BFKey.from_password(PASSWORD), SME256dBFKey.from_password(PASSWORD)
+        self.assertEqual(decrypt_range(bf, io.BytesIO(bf.encrypt(self.payload)), 1000, 100), self.payload[1000:1100])
+        index = CheckpointIndex(dbf, 1024)
+        process_stream_indexed(dbf, 'encrypt', io.BytesIO(self.payload), None, index)
+        ciphertext = io.BytesIO(dbf.encrypt(self.payload))
+        self.assertEqual(decrypt_range(dbf, ciphertext, 3000, 100, index), self.payload[3000:3100])
+
+    def test_encrypted_file_rejects_dbf_keys(self):
+        with self.assertRaises(ValueError):
+            EncryptedFile(SME256dBFKey.from_password(PASSWORD), io.BytesIO())
+
+    def test_keystore_compact_keys(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'keys.smk')
+            build_keystore(path, {'tenant': PASSWORD}, workers=1)
+            with KeyStore(path) as store:
+                key = store.dbf('tenant', compact=True)
+                output = io.BytesIO()
+                process_stream(key, 'encrypt', io.BytesIO(self.payload), output, chunk_size=1000)
+                self.assertEqual(output.getvalue(), SME256dBF(PASSWORD, warnings=False).encrypt(self.payload))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+#Copyright 2025 yo525
+#SPDX-License-Identifier: Apache-2.0
+
+import os
+import random
+import unittest
+
+from SME import SME256dBF, DependentByteFlowContext
+
+PASSWORD = b'dbf context test password'
+
+
+def split(data: bytes, seed: int) -> list:
+    """ Cuts data in pieces of random sizes, empty ones included. """
+    rng, pieces, position = random.Random(seed), [], 0
+    while position < len(data):
+        size = rng.choice((0, 1, 2, 7, 64, 255, 1000))
+        pieces.append(data[position:position + size])
+        position += size
+    return pieces
+
+
+class DependentByteFlowContextTest(unittest.TestCase):
+    """ Incremental contexts give the bytes of one encrypt/decrypt call. """
+
+    def setUp(self):
+        self.sme = SME256dBF(PASSWORD, warnings=False)
+        self.payload = os.urandom(3000)
+        self.ciphertext = self.sme.encrypt(self.payload)
+
+    def test_pieces_match_one_shot_calls(self):
+        for seed in range(3):
+            with self.subTest(seed=seed):
+                encryptor, decryptor = self.sme.encryptor(), self.sme.decryptor()
+                pieces = split(self.payload, seed)
+                ciphertext = b''.join(encryptor.update(piece) for piece in pieces) + encryptor.finalize()
+                self.assertEqual(ciphertext, self.ciphertext)
+                plaintext = b''.join(decryptor.update(piece) for piece in split(ciphertext, seed + 10)) + decryptor.finalize()
+                self.assertEqual(plaintext, self.payload)
+                self.assertEqual((encryptor.processed, decryptor.processed), (len(self.payload), len(self.payload)))
+
+    def test_update_into_and_text(self):
+        context, out = self.sme.encryptor(), bytearray(len(self.payload))
+        view = memoryview(out)
+        self.assertEqual(context.update_into(self.payload[:1000], view[:1000]), 1000)
+        self.assertEqual(context.update_into(bytearray(self.payload[1000:]), view[1000:]), 2000)
+        self.assertEqual(bytes(out), self.ciphertext)
+        self.assertEqual(self.sme.encryptor().update('text'), self.sme.encrypt(b'text'))
+
+    def test_fork_after_a_shared_header(self):
+        header, bodies = self.payload[:100], (self.payload[100:700], os.urandom(50))
+        context = self.sme.encryptor()
+        prefix = context.update(header)
+        forks = [context.fork() for _ in bodies]
+        for fork, body in zip(forks, bodies):
+            self.assertEqual(prefix + fork.update(body), self.sme.encrypt(header + body))
+            self.assertEqual(fork.processed, len(header) + len(body))
+        self.assertEqual(prefix + context.update(self.payload[100:]), self.ciphertext)  # The forks did not move it
+
+    def test_resume_from_a_state(self):
+        for mode, source, expected in (('encrypt', self.payload, self.ciphertext), ('decrypt', self.ciphertext, self.payload)):
+            with self.subTest(mode=mode):
+                context = DependentByteFlowContext(self.sme, mode)
+                head = context.update(source[:1234])
+                resumed = DependentByteFlowContext(self.sme, mode, context.state(), context.processed)
+                self.assertEqual(head + resumed.update(source[1234:]), expected)
+                self.assertEqual(resumed.processed, len(source))
+
+    def test_finalized_contexts_are_closed(self):
+        context = self.sme.encryptor()
+        context.update(b'abc')
+        self.assertEqual(context.finalize(), b'')
+        for call in (lambda: context.update(b'late'), lambda: context.update_into(b'late', bytearray(4)), context.fork):
+            with self.assertRaises(ValueError):
+                call()
+        with self.assertRaises(ValueError):
+            DependentByteFlowContext(self.sme, 'sign')
+
+
+if __name__ == '__main__':
+    unittest.main()
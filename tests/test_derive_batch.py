@@ -0,0 +1,55 @@
+#Copyright 2025 yo525
+#SPDX-License-Identifier: Apache-2.0
+
+import os
+import unittest
+
+import SME
+from SME import SME256, SME256BF, SME256dBF, available_backends, derive_matrices, get_backend, numpy_schedule_tables
+
+# Mixed lengths, the batch engine drops the short ones out step by step
+PASSWORDS = [b'', b'x', os.urandom(7), os.urandom(64), os.urandom(16), b'x', bytearray(os.urandom(33)), memoryview(os.urandom(5))]
+
+
+def single(password) -> bytes:
+    """ Matrix of the single-key path, with no cache involved. """
+    return bytes(SME256(bytes(password), warnings=False, cache=False).matrix)
+
+
+class DeriveBatchTest(unittest.TestCase):
+    """ Batched key derivation gives the matrices of one key schedule per password. """
+
+    def setUp(self):
+        self.expected = [single(password) for password in PASSWORDS]
+
+    def test_every_backend_matches_the_single_key_path(self):
+        for name in [name for name in available_backends() if not name.endswith('+verify')]:
+            with self.subTest(backend=name):
+                self.assertEqual(derive_matrices(PASSWORDS, name), self.expected)
+                self.assertEqual(get_backend(name).derive_batch(PASSWORDS), self.expected)
+        self.assertEqual(derive_matrices([]), [])
+        with self.assertRaises(TypeError):
+            derive_matrices([b'valid', 'not bytes'])
+
+    @unittest.skipIf(SME.np is None, 'NumPy is not installed')
+    def test_numpy_batch_from_any_starting_matrices(self):
+        np = SME.np
+        starts = [single(os.urandom(8)) for _ in PASSWORDS]
+        result = numpy_schedule_tables().derive_batch(np.frombuffer(b''.join(starts), dtype=np.uint8).reshape(-1, 256), PASSWORDS)
+        for start, password, row in zip(starts, PASSWORDS, result):
+            self.assertEqual(row.tobytes(), bytes(get_backend('python').derive(start, password)))
+
+    def test_from_passwords_matches_the_constructor(self):
+        passwords = [bytes(password) for password in PASSWORDS if len(password)]
+        for cls in (SME256BF, SME256dBF):
+            for cache in (False, True):
+                with self.subTest(key=cls.__name__, cache=cache):
+                    for password, sme in zip(passwords, cls.from_passwords(passwords, cache=cache)):
+                        expected = cls(password, warnings=False, cache=False)
+                        self.assertEqual(sme.password, password)
+                        self.assertEqual((sme.table, sme.inverse), (expected.table, expected.inverse))
+                        self.assertEqual(sme.encrypt(b'payload'), expected.encrypt(b'payload'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+#Copyright 2025 yo525
+#SPDX-License-Identifier: Apache-2.0
+
+import io
+import os
+import tempfile
+import unittest
+
+from SME import CHUNK_SIZE, SME256BF, SME256dBF
+from streamSME import EncryptedFile, open_encrypted
+
+PASSWORD = b'encrypted file test password'
+
+
+class EncryptedFileTest(unittest.TestCase):
+    """ Random access reads and writes give the bytes of one whole-file encrypt/decrypt. """
+
+    def setUp(self):
+        self.sme = SME256BF(PASSWORD, warnings=False)
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'data.sme')
+        self.payload = os.urandom(3 * CHUNK_SIZE + 100)
+        with open(self.path, 'wb') as file:
+            file.write(self.sme.encrypt(self.payload))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def ciphertext(self) -> bytes:
+        with open(self.path, 'rb') as file:
+            return file.read()
+
+    def test_random_reads(self):
+        for use_mmap in (False, True):
+            for buffering in (0, -1, 7):
+                with self.subTest(use_mmap=use_mmap, buffering=buffering):
+                    with open_encrypted(self.sme, self.path, 'rb', buffering, use_mmap) as file:
+                        for offset, size in ((0, 10), (CHUNK_SIZE - 3, 9), (len(self.payload) - 5, 50), (len(self.payload) + 10, 5)):
+                            file.seek(offset)
+                            self.assertEqual(file.read(size), self.payload[offset:offset + size])
+                        file.seek(-100, io.SEEK_END)
+                        self.assertEqual(file.read(), self.payload[-100:])
+                        file.seek(0)
+                        self.assertEqual(file.read(), self.payload)
+
+    def test_mmap_reads_into_caller_buffers(self):
+        with EncryptedFile(self.sme, self.path, 'rb', use_mmap=True) as file:
+            buffer = bytearray(CHUNK_SIZE + 1)
+            file.seek(123)
+            self.assertEqual(file.readinto(buffer), len(buffer))
+            self.assertEqual(bytes(buffer), self.payload[123:123 + len(buffer)])
+            self.assertEqual(file.size(), len(self.payload))
+        empty = os.path.join(self.directory.name, 'empty.sme')
+        open(empty, 'wb').close()
+        with EncryptedFile(self.sme, empty, 'rb', use_mmap=True) as file:  # Nothing to map
+            self.assertEqual(file.read(), b'')
+
+    def test_update_in_place(self):
+        expected = bytearray(self.payload)
+        with open_encrypted(self.sme, self.path, 'r+b') as file:
+            for offset, data in ((5, b'hello'), (CHUNK_SIZE - 2, os.urandom(CHUNK_SIZE + 4)), (len(self.payload) - 3, b'tail grows')):
+                file.seek(offset)
+                file.write(data)
+                expected[offset:offset + len(data)] = data
+            file.seek(5)
+            self.assertEqual(file.read(5), b'hello')  # Reads see the buffered writes
+        self.assertEqual(self.ciphertext(), self.sme.encrypt(bytes(expected)))
+
+    def test_writes_past_the_end_fill_the_hole_with_zeros(self):
+        for mode in ('r+b', 'w+b', 'wb'):
+            with self.subTest(mode=mode):
+                start = b'' if mode != 'r+b' else self.payload
+                gap = 2 * CHUNK_SIZE + 17  # Longer than one fill chunk
+                with open_encrypted(self.sme, self.path, mode, buffering=0) as file:
+                    file.seek(len(start) + gap)
+                    self.assertEqual(file.write(b'after the hole'), 14)
+                expected = start + bytes(gap) + b'after the hole'
+                self.assertEqual(self.ciphertext(), self.sme.encrypt(expected))
+                with open(self.path, 'wb') as file:  # Back to the original file for the next mode
+                    file.write(self.sme.encrypt(self.payload))
+
+    def test_truncate(self):
+        with open_encrypted(self.sme, self.path, 'r+b', buffering=0) as file:
+            file.seek(1000)
+            self.assertEqual(file.truncate(), 1000)
+            self.assertEqual(file.size(), 1000)
+            file.seek(0)
+            self.assertEqual(file.read(), self.payload[:1000])
+
+    def test_caller_file_objects_stay_open(self):
+        buffer = io.BytesIO(self.sme.encrypt(self.payload))
+        with EncryptedFile(self.sme, buffer, 'r+b') as file:
+            file.seek(10)
+            file.write(b'abc')
+        self.assertFalse(buffer.closed)
+        self.assertEqual(self.sme.decrypt(buffer.getvalue())[10:13], b'abc')
+
+    def test_rejected_arguments(self):
+        for arguments in ((SME256dBF(PASSWORD, warnings=False), self.path, 'rb'), (self.sme, self.path, 'a'), (self.sme, self.path, 'r+b', True)):
+            with self.subTest(arguments=arguments[2:]):
+                with self.assertRaises(ValueError):
+                    EncryptedFile(*arguments)
+        with EncryptedFile(self.sme, self.path, 'rb') as file:
+            with self.assertRaises(io.UnsupportedOperation):
+                file.write(b'read only')
+
+
+if __name__ == '__main__':
+    unittest.main()
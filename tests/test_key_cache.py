@@ -0,0 +1,74 @@
+#Copyright 2025 yo525
+#SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import unittest
+
+import SME
+from SME import SME256, SME256BF, SME256dBF, KeyScheduleCache
+
+PASSWORDS = [b'key cache password %d' % k for k in range(4)]
+
+
+class KeyCacheTest(unittest.TestCase):
+    """ Keys created through the cache are the keys of a full key schedule. """
+
+    def setUp(self):
+        self.shared = SME.key_cache
+        SME.key_cache = self.cache = KeyScheduleCache(maxsize=2)
+
+    def tearDown(self):
+        SME.key_cache = self.shared
+
+    def test_cached_keys_match_uncached_keys(self):
+        for cls in (SME256BF, SME256dBF):
+            for password in PASSWORDS[:2]:
+                with self.subTest(key=cls.__name__, password=password):
+                    uncached = cls(password, warnings=False, cache=False)
+                    first, second = cls(password, warnings=False), cls(password, warnings=False)
+                    for sme in (first, second):
+                        self.assertEqual(sme.matrix, uncached.matrix)
+                        self.assertEqual((sme.table, sme.inverse), (uncached.table, uncached.inverse))
+                        self.assertEqual(sme.encrypt(b'payload'), uncached.encrypt(b'payload'))
+
+    def test_stats_count_hits_and_misses(self):
+        SME256(PASSWORDS[0], warnings=False)
+        SME256(PASSWORDS[0], warnings=False)
+        SME256(PASSWORDS[1], warnings=False)
+        SME256(PASSWORDS[2], warnings=False, cache=False)  # Bypasses the cache entirely
+        self.assertEqual(self.cache.stats(), {'hits': 1, 'misses': 2, 'evictions': 0, 'size': 2, 'maxsize': 2})
+
+    def test_least_recently_used_entry_is_evicted(self):
+        for password in PASSWORDS[:2]:
+            SME256(password, warnings=False)
+        SME256(PASSWORDS[0], warnings=False)  # PASSWORDS[1] is now the oldest
+        SME256(PASSWORDS[2], warnings=False)
+        self.assertEqual(self.cache.evictions, 1)
+        self.assertIsNotNone(self.cache.get(PASSWORDS[0]))
+        self.assertIsNone(self.cache.get(PASSWORDS[1]))
+        self.assertIsNotNone(self.cache.get(PASSWORDS[2]))
+
+        self.cache.resize(1)
+        self.assertEqual(self.cache.stats()['size'], 1)
+        self.assertEqual(self.cache.evictions, 2)
+        self.cache.resize(0)  # Disabled: nothing is stored or found
+        SME256(PASSWORDS[3], warnings=False)
+        self.assertIsNone(self.cache.get(PASSWORDS[3]))
+
+    def test_digest_is_salted_per_cache(self):
+        other = KeyScheduleCache()
+        digest = self.cache.digest(PASSWORDS[0])
+        self.assertEqual(len(digest), 32)
+        self.assertEqual(digest, self.cache.digest(bytearray(PASSWORDS[0])))
+        self.assertNotEqual(digest, other.digest(PASSWORDS[0]))
+        self.assertNotEqual(digest, hashlib.blake2b(PASSWORDS[0], digest_size=32).digest())
+        self.assertIsNone(self.cache.digest('not bytes'))
+
+        SME256(PASSWORDS[0], warnings=False)
+        self.assertEqual(list(self.cache._entries), [digest])  # Only the digest is kept, never the password
+        self.assertTrue(self.cache.invalidate(PASSWORDS[0]))
+        self.assertFalse(self.cache.invalidate(PASSWORDS[0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
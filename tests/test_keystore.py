@@ -0,0 +1,89 @@
+#Copyright 2025 yo525
+#SPDX-License-Identifier: Apache-2.0
+
+import os
+import stat
+import tempfile
+import unittest
+from unittest import mock
+
+from SME import SME256BF
+from keystoreSME import HEADER, MAX_KEY_ID, RECORD_SIZE, KeyStore, build_keystore, write_keystore
+
+PASSWORD = b'keystore test password'
+
+
+class KeyStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'keys.smk')
+        build_keystore(self.path, {'tenant-1': PASSWORD, 'tenant-2': PASSWORD[::-1]}, workers=1)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_keys_match_derived_keys(self):
+        with KeyStore(self.path, verify=True) as store:
+            self.assertEqual(store.keys(), ['tenant-1', 'tenant-2'])
+            self.assertEqual(store.tables('tenant-1'), (SME256BF(PASSWORD, warnings=False).table, SME256BF(PASSWORD, warnings=False).inverse))
+            with self.assertRaises(KeyError):
+                store.record('tenant-3')
+
+    def test_file_is_private(self):
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+
+    def test_rewrite_ignores_planted_temporary_files(self):
+        target = os.path.join(self.directory.name, 'target')
+        with open(target, 'wb') as file:
+            file.write(b'untouched')
+        os.symlink(target, self.path + '.tmp')  # The name the writer used to open
+        with KeyStore(self.path) as store:
+            records = {'tenant-1': store.record('tenant-1')}
+        self.assertEqual(write_keystore(self.path, records), 1)
+        with open(target, 'rb') as file:
+            self.assertEqual(file.read(), b'untouched')
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ['keys.smk', 'keys.smk.tmp', 'target'])
+
+    def test_failed_write_leaves_no_temporary_file(self):
+        with KeyStore(self.path) as store:
+            records = {'tenant-1': store.record('tenant-1')}
+        with mock.patch('keystoreSME.replace', side_effect=OSError('rename failed')), self.assertRaises(OSError):
+            write_keystore(self.path, records)
+        self.assertEqual(os.listdir(self.directory.name), ['keys.smk'])
+
+    def test_corrupted_record_is_rejected(self):
+        with open(self.path, 'r+b') as file:
+            file.seek(HEADER.size + 10)  # Inside the first record, the one of 'tenant-1'
+            byte = file.read(1)
+            file.seek(-1, os.SEEK_CUR)
+            file.write(bytes([byte[0] ^ 1]))
+        with KeyStore(self.path) as store:
+            with self.assertRaises(ValueError):
+                store.record('tenant-1')
+            self.assertEqual(store.verify(), ['tenant-1'])
+            self.assertEqual(len(store.record('tenant-2')), RECORD_SIZE)
+
+    def test_empty_and_truncated_files_are_rejected(self):
+        for content in (b'', b'SMEKEYS1'):
+            with self.subTest(size=len(content)):
+                with open(self.path, 'wb') as file:
+                    file.write(content)
+                with self.assertRaises(ValueError):
+                    KeyStore(self.path)
+
+    def test_long_key_id_is_rejected(self):
+        with KeyStore(self.path) as store:
+            record = store.record('tenant-1')
+        with self.assertRaises(ValueError):
+            write_keystore(self.path, {'x' * (MAX_KEY_ID + 1): record})
+        with KeyStore(self.path) as store:  # The previous file is left in place
+            self.assertEqual(len(store), 2)
+        write_keystore(self.path, {'x' * MAX_KEY_ID: record})
+        with KeyStore(self.path, verify=True) as store:
+            self.assertEqual(store.keys(), ['x' * MAX_KEY_ID])
+
+
+if __name__ == '__main__':
+    unittest.main()
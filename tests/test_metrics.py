@@ -0,0 +1,48 @@
+#Copyright 2025 yo525
+#SPDX-License-Identifier: Apache-2.0
+
+import unittest
+
+from SME import SME256BF, SME256dBF, MetricsRegistry
+
+PASSWORD = b'metrics test password'
+IDENTITY = bytes(range(0, 256))
+
+
+class MetricsTest(unittest.TestCase):
+
+    def test_operations_are_labelled_by_the_caller(self):
+        involution = SME256BF.from_table(IDENTITY, IDENTITY, verify=False)  # table == inverse
+        with MetricsRegistry() as metrics:
+            involution.encrypt_into(b'abc', bytearray(3))
+            involution.decrypt_into(b'abcd', bytearray(4))
+            involution.translate_into(b'xy', bytearray(2), involution.table)  # No operation, not recorded
+        operations = metrics.as_dict()['operations']
+        self.assertEqual(operations['encrypt/bf']['bytes'], 3)
+        self.assertEqual(operations['decrypt/bf']['bytes'], 4)
+        self.assertEqual(set(operations), {'encrypt/bf', 'decrypt/bf'})
+
+    def test_only_real_failures_are_counted(self):
+        sme = SME256dBF(PASSWORD, warnings=False)
+        with MetricsRegistry() as metrics:
+            sme.decrypt(sme.encrypt(b'payload'))
+            context = sme.encryptor()
+            context.finalize()
+            with self.assertRaises(ValueError):
+                context.update(b'late')
+        self.assertEqual(metrics.as_dict()['errors'], {'Error23': 1})
+
+    def test_failed_batches_are_not_recorded(self):
+        sme = SME256dBF(PASSWORD, warnings=False)
+        with MetricsRegistry() as metrics:
+            sme.encrypt_packed(b'abcdef', [0, 2, 6])
+            sme.backend = 'missing'  # Every message fails with Error31
+            with self.assertRaises(ValueError):
+                sme.encrypt_packed(b'abcdef', [0, 2, 6])
+        operations = metrics.as_dict()['operations']
+        self.assertEqual(operations['encrypt/dbf']['bytes'], 6)
+        self.assertEqual(operations['encrypt/dbf']['calls'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+#Copyright 2025 yo525
+#SPDX-License-Identifier: Apache-2.0
+
+import os
+import unittest
+from multiprocessing import Pool, resource_tracker
+
+import parallelSME
+from SME import SME256dBF, pack_messages, unpack_messages
+from parallelSME import close_packed_pool, dependent_packed, packed_pool
+
+PASSWORD = b'packed test password'
+
+
+class DependentPackedTest(unittest.TestCase):
+    """ Batches spread over processes give the bytes of one encrypt call per message. """
+
+    def setUp(self):
+        self.sme = SME256dBF(PASSWORD, warnings=False)
+        self.messages = [os.urandom(size) for size in (0, 1, 17, 64, 300, 5)]
+        self.buffer, self.offsets = pack_messages(self.messages)
+        self.expected = [self.sme.encrypt(message) for message in self.messages]
+
+    def tearDown(self):
+        close_packed_pool()
+
+    def test_pool_is_kept_between_calls(self):
+        ciphertexts = self.sme.encrypt_many(self.messages, workers=2)
+        pool = parallelSME._packed_pool
+        self.assertIsNotNone(pool)
+        self.assertEqual(ciphertexts, self.expected)
+        self.assertEqual(self.sme.decrypt_many(ciphertexts, workers=2), self.messages)
+        self.assertIs(parallelSME._packed_pool, pool)
+        self.assertIsNot(packed_pool(1), pool)  # Another size replaces it
+
+    def test_caller_pool_serves_every_key(self):
+        other = SME256dBF(PASSWORD[::-1], warnings=False)
+        resource_tracker.ensure_running()  # Before the workers start, so they share it
+        with Pool(2) as pool:
+            for sme in (self.sme, other):
+                with self.subTest(key=sme is other):
+                    result = dependent_packed(sme, self.buffer, self.offsets, 'encrypt', 2, pool)
+                    self.assertEqual(unpack_messages(result, self.offsets), [sme.encrypt(message) for message in self.messages])
+        self.assertIsNone(parallelSME._packed_pool)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+#Copyright 2025 yo525
+#SPDX-License-Identifier: Apache-2.0
+
+import os
+import unittest
+
+from SME import SME256, SME256BF, SME256dBF, PrefixScheduleCache
+
+BASE = b'prefix cache base password!!'  # 28 bytes, deepest shared checkpoint at 24 with interval 8
+SUFFIXES = [b'tenant-1', b'tenant-22', b'', b'x' * 19]
+
+
+def single(password: bytes) -> list:
+    """ Matrix of the single-key path, with no cache involved. """
+    return SME256(password, warnings=False, cache=False).matrix
+
+
+class PrefixCacheTest(unittest.TestCase):
+    """ Resumed key schedules give the matrices of a full key schedule. """
+
+    def test_resumed_derivation_matches_the_single_key_path(self):
+        cache = PrefixScheduleCache(interval=8)
+        for suffix in SUFFIXES:
+            with self.subTest(suffix=suffix):
+                self.assertEqual(list(cache.derive(BASE + suffix)), single(BASE + suffix))
+        stats = cache.stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], len(SUFFIXES) - 1)
+        # BASE + b'tena' checkpoint, then BASE + 24 bytes, then the end of BASE stored by the b'' suffix
+        self.assertEqual(stats['resumed_bytes'], 32 + 24 + 28)
+        self.assertEqual(list(cache.derive(b'')), single(b''))
+
+    def test_small_and_disabled_caches_still_derive(self):
+        for cache in (PrefixScheduleCache(maxsize=2, interval=3), PrefixScheduleCache(maxsize=0)):
+            with self.subTest(maxsize=cache.maxsize):
+                for _ in range(2):
+                    for suffix in SUFFIXES:
+                        self.assertEqual(list(cache.derive(BASE + suffix)), single(BASE + suffix))
+                self.assertLessEqual(cache.stats()['size'], cache.maxsize)
+
+    def test_from_prefix_cache_matches_the_constructor(self):
+        cache = PrefixScheduleCache()
+        for cls in (SME256BF, SME256dBF):
+            for suffix in SUFFIXES:
+                with self.subTest(key=cls.__name__, suffix=suffix):
+                    sme, expected = cls.from_prefix_cache(BASE + suffix, cache), cls(BASE + suffix, warnings=False, cache=False)
+                    self.assertEqual(sme.password, BASE + suffix)
+                    self.assertEqual((sme.table, sme.inverse), (expected.table, expected.inverse))
+                    self.assertEqual(sme.encrypt(b'payload'), expected.encrypt(b'payload'))
+
+
+class ExtendTest(unittest.TestCase):
+    """ A key extended by a suffix is the key of the whole password. """
+
+    def test_extend_matches_the_full_password(self):
+        payload = os.urandom(300)
+        for cls in (SME256BF, SME256dBF):
+            base = cls(BASE, warnings=False)
+            for suffix in SUFFIXES:
+                with self.subTest(key=cls.__name__, suffix=suffix):
+                    key, expected = base.fork(), cls(BASE + suffix, warnings=False, cache=False)
+                    key.extend(suffix)
+                    self.assertEqual(key.password, BASE + suffix)
+                    self.assertEqual(key.matrix, expected.matrix)
+                    self.assertEqual((key.table, key.inverse), (expected.table, expected.inverse))
+                    self.assertEqual(key.encrypt(payload), expected.encrypt(payload))
+                    self.assertEqual(key.decrypt(expected.encrypt(payload)), payload)
+            self.assertEqual(base.matrix, single(BASE))  # The forks did not touch it
+
+    def test_snapshot_restores_the_base_key(self):
+        key = SME256BF(BASE, warnings=False)
+        snapshot = key.snapshot()
+        ciphertext = key.encrypt(b'payload')
+        key.extend(b'tenant-1')
+        key.extend(b'-more')
+        self.assertEqual(key.matrix, single(BASE + b'tenant-1-more'))
+        key.restore(snapshot)
+        self.assertEqual(key.matrix, single(BASE))
+        self.assertEqual(key.encrypt(b'payload'), ciphertext)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+#Copyright 2025 yo525
+#SPDX-License-Identifier: Apache-2.0
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from SME import SME256BF, SME256dBF
+from streamSME import CheckpointIndex, decrypt_range, main, process_mapped, process_range, process_stream, process_stream_indexed
+
+PASSWORD = 'stream range test password'
+
+
+class _CountingReader(io.BytesIO):
+    """ Records the largest single read, to check the range is streamed. """
+
+    largest = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.largest = max(self.largest, len(data))
+        return data
+
+    def readinto(self, buffer):
+        read = super().readinto(buffer)
+        self.largest = max(self.largest, read)
+        return read
+
+
+class ProcessRangeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.payload = os.urandom(6000)
+        self.keys = (SME256BF(PASSWORD.encode(), warnings=False), SME256dBF(PASSWORD.encode(), warnings=False))
+
+    def test_ranges_are_streamed(self):
+        for sme in self.keys:
+            ciphertext = sme.encrypt(self.payload)
+            for offset, length in ((0, None), (1234, None), (1234, 100), (5990, 100), (7000, None), (0, 0)):
+                with self.subTest(key=type(sme).__name__, offset=offset, length=length):
+                    reader, writer = _CountingReader(ciphertext), io.BytesIO()
+                    stats = process_range(sme, reader, writer, offset, length, chunk_size=500)
+                    end = None if length is None else offset + length
+                    self.assertEqual(writer.getvalue(), self.payload[offset:end])
+                    self.assertEqual(stats.processed, len(self.payload[offset:end]))
+                    self.assertLessEqual(reader.largest, 500)
+
+    def test_dbf_range_resumes_from_the_index(self):
+        sme = self.keys[1]
+        ciphertext, index = io.BytesIO(), CheckpointIndex(sme, 1024)
+        process_stream_indexed(sme, 'encrypt', io.BytesIO(self.payload), ciphertext, index, 700)
+        writer = io.BytesIO()
+        process_range(sme, io.BytesIO(ciphertext.getvalue()), writer, 4100, None, index, 300)
+        self.assertEqual(writer.getvalue(), self.payload[4100:])
+
+    def test_pipelines_reject_empty_buffers(self):
+        sme = self.keys[1]
+        ciphertext = sme.encrypt(self.payload)
+        pipelines = {
+            'process_stream': lambda size: process_stream(sme, 'decrypt', io.BytesIO(ciphertext), io.BytesIO(), size),
+            'process_mapped': lambda size: process_mapped(sme, 'decrypt', io.BytesIO(ciphertext), io.BytesIO(), size),
+            'process_stream_indexed': lambda size: process_stream_indexed(sme, 'decrypt', io.BytesIO(ciphertext), None, CheckpointIndex(sme), size),
+            'decrypt_range': lambda size: decrypt_range(sme, io.BytesIO(ciphertext), 10, 10, None, size),
+            'process_range': lambda size: process_range(sme, io.BytesIO(ciphertext), io.BytesIO(), 10, None, None, size),
+        }
+        for name, pipeline in pipelines.items():
+            for size in (0, -1):
+                with self.subTest(pipeline=name, chunk_size=size):
+                    with self.assertRaises(ValueError):
+                        pipeline(size)
+
+    def test_command_line_offset_without_length(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source, destination = os.path.join(directory, 'data.sme'), os.path.join(directory, 'data.out')
+            for algorithm, sme in zip(('bf', 'dbf'), self.keys):
+                with self.subTest(algorithm=algorithm):
+                    with open(source, 'wb') as file:
+                        file.write(sme.encrypt(self.payload))
+                    argv = ['decrypt', source, destination, '-a', algorithm, '-p', PASSWORD, '--offset', '2500', '--chunk-size', '1024']
+                    self.assertEqual(main(argv), 0)
+                    with open(destination, 'rb') as file:
+                        self.assertEqual(file.read(), self.payload[2500:])
+
+    def test_command_line_rejects_non_positive_sizes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source, destination = os.path.join(directory, 'data.sme'), os.path.join(directory, 'data.out')
+            with open(source, 'wb') as file:
+                file.write(self.keys[0].encrypt(self.payload))
+            for option in ('--chunk-size', '--index-interval'):
+                for value in ('0', '-1'):
+                    with self.subTest(option=option, value=value):
+                        with self.assertRaises(SystemExit) as raised, contextlib.redirect_stderr(io.StringIO()):
+                            main(['decrypt', source, destination, '-p', PASSWORD, option, value])
+                        self.assertEqual(raised.exception.code, 2)
+                        self.assertFalse(os.path.exists(destination))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+#Copyright 2025 yo525
+#SPDX-License-Identifier: Apache-2.0
+
+import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+from SME import SME256, SME256BF, SME256dBF
+
+PASSWORD = b'thread test password'
+THREADS = 8
+ROUNDS = 20
+
+
+class SharedKeyThreadTest(unittest.TestCase):
+    """ One key of each class is shared by every thread without any lock. """
+
+    def setUp(self):
+        self.bf = SME256BF(PASSWORD, warnings=False)
+        self.dbf = SME256dBF(PASSWORD, warnings=False)
+        self.payloads = [os.urandom(size) for size in (0, 1, 255, 256, 1000, 4096)]
+        # Single-threaded reference
+        self.bf_expected = [self.bf.encrypt(payload) for payload in self.payloads]
+        self.dbf_expected = [self.dbf.encrypt(payload[:1000]) for payload in self.payloads]
+        self.passwords = [os.urandom(16) for _ in range(ROUNDS)]
+        self.matrices = [bytes(SME256(password, warnings=False, cache=False).matrix) for password in self.passwords]
+
+    def run_threads(self, work, count):
+        barrier = Barrier(THREADS)
+
+        def worker(seed):
+            barrier.wait()  # Start every thread at the same time
+            return [work((seed + k) % count) for k in range(ROUNDS)]
+
+        with ThreadPoolExecutor(THREADS) as pool:
+            return [result for results in pool.map(worker, range(THREADS)) for result in results]
+
+    def test_shared_bf(self):
+        def work(k):
+            ciphertext = self.bf.encrypt(self.payloads[k])
+            return k, ciphertext, self.bf.decrypt(ciphertext)
+
+        for k, ciphertext, plaintext in self.run_threads(work, len(self.payloads)):
+            self.assertEqual(ciphertext, self.bf_expected[k])
+            self.assertEqual(plaintext, self.payloads[k])
+
+    def test_shared_dbf(self):
+        def work(k):
+            ciphertext = self.dbf.encrypt(self.payloads[k][:1000])
+            return k, ciphertext, self.dbf.decrypt(ciphertext)
+
+        for k, ciphertext, plaintext in self.run_threads(work, len(self.payloads)):
+            self.assertEqual(ciphertext, self.dbf_expected[k])
+            self.assertEqual(plaintext, self.payloads[k][:1000])
+
+    def test_concurrent_key_derivation(self):
+        def work(k):
+            return k, bytes(SME256(self.passwords[k], warnings=False, cache=False).matrix)
+
+        for k, matrix in self.run_threads(work, ROUNDS):
+            self.assertEqual(matrix, self.matrices[k])
+
+
+class RekeyTest(unittest.TestCase):
+    """ Re-keying an instance moves its own tables only. """
+
+    def test_calculate_table_from_values_rebuilds_the_tables(self):
+        sme, other = SME256BF(PASSWORD, warnings=False), SME256BF(PASSWORD, warnings=False)
+        sme.calculate_table_from_values(b' suffix')
+        expected = SME256BF(PASSWORD + b' suffix', warnings=False, cache=False)
+        self.assertEqual(sme.table, expected.table)
+        self.assertEqual(sme.inverse, expected.inverse)
+        self.assertEqual(sme.encrypt(b'payload'), expected.encrypt(b'payload'))
+        self.assertEqual(sme.decrypt(expected.encrypt(b'payload')), b'payload')
+        self.assertEqual(other.table, SME256BF(PASSWORD, warnings=False, cache=False).table)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+#Copyright 2025 yo525
+#SPDX-License-Identifier: Apache-2.0
+
+#Import necessary modules
+from SME import SME256BF, SME256dBF, available_backends, derive_matrices
+
+from argparse import ArgumentParser
+from random import Random
+from timeit import default_timer
+import sys
+
+def random_cases(count: int, seed: int = None, max_password: int = 64, max_payload: int = 64):
+    """
+    Yields reproducible random (password, payload) pairs.
+
+    The first cases cover the edges: empty and one-byte passwords and payloads.
+
+    Args:
+        count (int): Number of cases.
+        seed (int): Seed of the generator, the same seed gives the same cases (default None, random).
+        max_password (int): Longest password in bytes (default 64).
+        max_payload (int): Longest payload in bytes (default 64).
+    """
+    generator = Random(seed)
+    edges = [(b'', b''), (b'\x00', b'\x00'), (b'\xff' * 16, bytes(range(0, 256))[:max_payload])]
+    for k in range(0, count):
+        if k < len(edges):
+            yield edges[k]
+        else:
+            yield generator.randbytes(generator.randint(1, max_password)), generator.randbytes(generator.randint(1, max_payload))
+
+
+def _key(cls, password: bytes, backend: str):
+    """ Builds a key through the normal constructor, with the key schedule of one backend. """
+    sme = cls.__new__(cls)
+    sme.backend = backend  # Per instance, the class-wide selection is left alone
+    sme.__init__(password, warnings=False, cache=False)
+    return sme
+
+
+def verify_backends(cases, backends: list = None, reference: str = 'reference') -> list:
+    """
+    Runs every case through every backend and compares the results with the reference.
+
+    Every password is derived by the SME256BF and SME256dBF constructors and by the
+    batched derive_matrices of each backend, then the payload is encrypted and
+    decrypted: matrices and ciphertexts must be identical to the reference ones.
+
+    Args:
+        cases: Iterable of (password, payload) pairs, see random_cases.
+        backends (list): Backend names to check (default every registered backend).
+        reference (str): The backend the others are compared with (default 'reference').
+
+    Returns:
+        list: One (backend, check, password hex) tuple per mismatch, empty when every backend agrees.
+    """
+    backends = [name for name in (backends or available_backends()) if name != reference]
+    cases = list(cases)
+    passwords = [password for password, _ in cases]
+    expected = []  # (matrix, BF ciphertext, dBF ciphertext) of every case
+    for password, payload in cases:
+        bf, dbf = _key(SME256BF, password, reference), _key(SME256dBF, password, reference)
+        expected.append((bf.table, bf.encrypt(payload), dbf.encrypt(payload)))
+
+    mismatches = []
+    for name in backends:
+        for (password, payload), (matrix, bf_ciphertext, dbf_ciphertext), batch_matrix in zip(cases, expected, derive_matrices(passwords, name)):
+            checks = []
+            bf, dbf = _key(SME256BF, password, name), _key(SME256dBF, password, name)
+            checks.append(('matrix', bf.table == matrix and dbf.table == matrix))
+            checks.append(('batched matrix', batch_matrix == matrix))
+            checks.append(('bf', bf.encrypt(payload) == bf_ciphertext and bf.decrypt(bf_ciphertext) == payload))
+            checks.append(('dbf encrypt', dbf.encrypt(payload) == dbf_ciphertext))
+            checks.append(('dbf decrypt', dbf.decrypt(dbf_ciphertext) == payload))
+            mismatches.extend((name, check, password.hex()) for check, passed in checks if not passed)
+    return mismatches
+
+
+def check_backends(count: int = 50, seed: int = None, backends: list = None) -> None:
+    """
+    Differential test of the registered backends, for test suites and CI.
+
+    Args:
+        count (int): Number of random cases (default 50).
+        seed (int): Seed of the cases (default None, random).
+        backends (list): Backend names to check (default every registered backend).
+
+    Raises:
+        AssertionError: If a backend derives another matrix or produces another ciphertext.
+    """
+    mismatches = verify_backends(random_cases(count, seed), backends)
+    assert not mismatches, f'{len(mismatches)} mismatches, first: {mismatches[:5]}'
+
+
+def main(argv: list = None) -> int:
+    """
+    Command line entry point: python -m verifySME [--count N] [--seed S] [--backend NAME ...]
+
+    Args:
+        argv (list): Arguments to parse (default sys.argv[1:]).
+
+    Returns:
+        int: 1 if a backend does not match the reference, 0 otherwise.
+    """
+    parser = ArgumentParser(prog='python -m verifySME', description='Check that every key schedule backend derives the same keys and ciphertexts as the reference.')
+    parser.add_argument('-n', '--count', type=int, default=50, help='number of random passwords and payloads (default 50)')
+    parser.add_argument('-s', '--seed', type=int, default=None, help='seed of the random cases, printed when omitted')
+    parser.add_argument('-b', '--backend', action='append', help='backend to check, repeatable (default every registered backend)')
+    parser.add_argument('--max-payload', type=int, default=64, help='longest payload in bytes (default 64)')
+    args = parser.parse_args(argv)
+
+    seed = args.seed if args.seed is not None else Random().randrange(1 << 32)
+    start_time = default_timer()
+    mismatches = verify_backends(random_cases(args.count, seed, max_payload=args.max_payload), args.backend)
+    checked = ', '.join(name for name in (args.backend or available_backends()) if name != 'reference')
+    print(f'{args.count} cases (seed {seed}) checked against reference for: {checked} in {default_timer() - start_time:.2f}s')
+    for name, check, password in mismatches:
+        print(f'MISMATCH {name} {check}: password {password}')
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())